@@ -0,0 +1,139 @@
+"""Fixed-capacity audio storage addressed by absolute byte offsets."""
+
+
+class AudioRangeOverwrittenError(Exception):
+    """Raised when a requested audio range has already been overwritten in the ring buffer."""
+
+    def __init__(self, start_offset: int, end_offset: int, oldest_available_offset: int):
+        self.start_offset = start_offset
+        self.end_offset = end_offset
+        self.oldest_available_offset = oldest_available_offset
+        super().__init__(
+            f"Audio range [{start_offset}, {end_offset}) is no longer available: "
+            f"data before byte offset {oldest_available_offset} has been overwritten."
+        )
+
+
+class AudioRingBuffer:
+    """
+    Bounded ring buffer for raw PCM audio.
+
+    Offsets are absolute and monotonic: the first byte ever appended is offset 0 and
+    offsets keep growing for the whole session, even after old audio is overwritten.
+    This lets callers keep storing byte offsets (e.g. utterance start, last periodic
+    chunk end) exactly as they would with an ever-growing bytearray, while memory
+    stays fixed at `capacity_bytes`.
+
+    The buffer is not thread-safe on its own; callers guard it with
+    `globals.audio_buffer_lock`, like the bytearray it replaces.
+    """
+
+    def __init__(self, capacity_bytes: int, frame_width: int = 2):
+        if capacity_bytes <= 0:
+            raise ValueError("capacity_bytes must be positive")
+        if frame_width <= 0:
+            raise ValueError("frame_width must be positive")
+        # Keep the capacity frame-aligned so a wrap never splits a sample
+        capacity_bytes -= capacity_bytes % frame_width
+        if capacity_bytes == 0:
+            raise ValueError("capacity_bytes must hold at least one frame")
+        self.capacity_bytes = capacity_bytes
+        self.frame_width = frame_width
+        self._data = bytearray(capacity_bytes)
+        self._end_offset = 0
+
+    @property
+    def end_offset(self) -> int:
+        """Absolute offset one past the most recently written byte."""
+        return self._end_offset
+
+    @property
+    def oldest_offset(self) -> int:
+        """Absolute offset of the oldest byte still held in the buffer."""
+        return max(0, self._end_offset - self.capacity_bytes)
+
+    @property
+    def end_sample(self) -> int:
+        """Absolute number of frames written since the last clear."""
+        return self._end_offset // self.frame_width
+
+    def __len__(self) -> int:
+        """Number of bytes currently held (at most `capacity_bytes`)."""
+        return self._end_offset - self.oldest_offset
+
+    def clear(self):
+        """Drop all audio and restart absolute offsets at 0."""
+        self._end_offset = 0
+
+    def append(self, data: bytes):
+        """Append PCM bytes, overwriting the oldest audio once the buffer is full."""
+        data_len = len(data)
+        if data_len == 0:
+            return
+        view = memoryview(data)
+        if data_len > self.capacity_bytes:
+            # Only the newest `capacity_bytes` can survive this write
+            view = view[data_len - self.capacity_bytes:]
+        write_len = len(view)
+        write_pos = (self._end_offset + data_len - write_len) % self.capacity_bytes
+        first_part = min(write_len, self.capacity_bytes - write_pos)
+        self._data[write_pos:write_pos + first_part] = view[:first_part]
+        if first_part < write_len:
+            self._data[:write_len - first_part] = view[first_part:]
+        self._end_offset += data_len
+
+    def read_views(self, start_offset: int, end_offset: int | None = None) -> list[memoryview]:
+        """
+        Return zero-copy views over the audio in the absolute range [start_offset, end_offset).
+
+        The range comes back as one view, or two when it wraps around the end of
+        the storage. Views alias the ring buffer itself: consume them while holding
+        `globals.audio_buffer_lock`, before newer audio can overwrite the range.
+
+        Args:
+            start_offset: Absolute byte offset of the first byte to return.
+            end_offset: Absolute byte offset one past the last byte; defaults to `end_offset`.
+
+        Returns:
+            list[memoryview]: Views that, concatenated, hold the requested audio.
+
+        Raises:
+            AudioRangeOverwrittenError: If part of the range has already been overwritten.
+            ValueError: If the range is inverted or extends past the newest audio.
+        """
+        if end_offset is None:
+            end_offset = self._end_offset
+        if start_offset > end_offset:
+            raise ValueError(f"Invalid audio range: start {start_offset} > end {end_offset}")
+        if end_offset > self._end_offset:
+            raise ValueError(f"Audio range end {end_offset} is past the newest audio ({self._end_offset})")
+        oldest = self.oldest_offset
+        if start_offset < oldest:
+            raise AudioRangeOverwrittenError(start_offset, end_offset, oldest)
+        if start_offset == end_offset:
+            return []
+
+        storage = memoryview(self._data)
+        start_pos = start_offset % self.capacity_bytes
+        length = end_offset - start_offset
+        if start_pos + length <= self.capacity_bytes:
+            return [storage[start_pos:start_pos + length]]
+        first_part = self.capacity_bytes - start_pos
+        return [storage[start_pos:], storage[:length - first_part]]
+
+    def read(self, start_offset: int, end_offset: int | None = None) -> bytes:
+        """
+        Copy out the audio in the absolute range [start_offset, end_offset).
+
+        Args:
+            start_offset: Absolute byte offset of the first byte to return.
+            end_offset: Absolute byte offset one past the last byte; defaults to `end_offset`.
+
+        Returns:
+            bytes: The requested audio.
+
+        Raises:
+            AudioRangeOverwrittenError: If part of the range has already been overwritten.
+            ValueError: If the range is inverted or extends past the newest audio.
+        """
+        return b"".join(self.read_views(start_offset, end_offset))
@@ -1,24 +1,18 @@
 import json
+import time
+import queue
 import base64
-import io
-import wave
+from typing import List
 import pyaudio # For pyaudio.paContinue
 import websocket # For WebSocketConnectionClosedException type hint
 from elevenlabs import VoiceSettings
-import numpy as np # For audio data manipulation
 
 import config as config
 import globals as app_globals
-
-def _create_wav_in_memory(pcm_data: bytes, rate: int, channels: int, sample_width: int) -> bytes:
-    """Convert raw PCM data to WAV format in memory"""
-    with io.BytesIO() as wav_file_stream:
-        with wave.open(wav_file_stream, 'wb') as wf:
-            wf.setnchannels(channels)
-            wf.setsampwidth(sample_width)
-            wf.setframerate(rate)
-            wf.writeframes(pcm_data)
-        return wav_file_stream.getvalue()
+from wav_framing import frame_pcm_as_wav
+from transcript_stitcher import ScribeWord
+from tts_cache import make_tts_cache_key
+from pcm_converter import PcmConverter
 
 def validate_transcription(transcribed_text: str) -> bool:
     """
@@ -41,8 +35,65 @@ def validate_transcription(transcribed_text: str) -> bool:
         
     return True
 
+def _convert_with_scribe(audio_data: bytes):
+    """Send audio (WAV bytes, or raw PCM to be framed as WAV) to Scribe and return the raw response."""
+    wav_audio_data = audio_data
+    if bytes(audio_data[:4]) != b'RIFF': # Check if already WAV
+        wav_audio_data = frame_pcm_as_wav(
+            [audio_data],
+            rate=config.PYAUDIO_RATE,
+            channels=config.PYAUDIO_CHANNELS,
+            sample_width=config.PYAUDIO_SAMPLE_WIDTH
+        )
+
+    return config.elevenlabs_client.speech_to_text.convert(
+        file=wav_audio_data,
+        model_id=config.ELEVENLABS_SCRIBE_MODEL_ID,
+        tag_audio_events=False, # Assuming we don't need to tag audio events
+        language_code=config.SCRIBE_LANGUAGE_CODE
+    )
+
+def transcribe_words_with_scribe(audio_data: bytes, segment_start_s: float) -> List[ScribeWord] | None:
+    """
+    Transcribe audio with Scribe and keep its per-word timestamps.
+
+    Args:
+        audio_data: WAV bytes, or raw PCM to be framed as WAV.
+        segment_start_s: Absolute ring buffer time (seconds) of the first sample in `audio_data`.
+
+    Returns:
+        List[ScribeWord] | None: Recognized words on the absolute timeline, or None on error.
+    """
+    if not config.elevenlabs_client:
+        print("⚠️ [SCRIBE] ElevenLabs client not initialized. Skipping transcription.")
+        return None
+    if not audio_data:
+        return []
+
+    try:
+        response = _convert_with_scribe(audio_data)
+        if not (hasattr(response, 'words') and isinstance(response.words, list)):
+            print(f"⚠️ [SCRIBE] Response has no 'words' array; cannot stitch by timestamp.")
+            return None
+
+        timed_words = []
+        for word_obj in response.words:
+            if getattr(word_obj, 'type', None) != "word":
+                continue  # Spacing and audio events carry no speech
+            word_text = getattr(word_obj, 'text', None)
+            word_start = getattr(word_obj, 'start', None)
+            word_end = getattr(word_obj, 'end', None)
+            if not word_text or word_start is None or word_end is None or "\uFFFD" in word_text:
+                continue
+            timed_words.append(ScribeWord(word_text, segment_start_s + word_start, segment_start_s + word_end))
+        return timed_words
+
+    except Exception as e:
+        print(f"⚠️ [SCRIBE] Error during transcription: {e} (Type: {type(e).__name__})")
+        return None
+
 def transcribe_with_scribe(audio_data: bytes, is_final_segment: bool) -> str:
-    """Transcribe audio using ElevenLabs Scribe with word-level processing."""
+    """Transcribe audio (WAV bytes, or raw PCM to be framed as WAV) using ElevenLabs Scribe with word-level processing."""
     if not config.elevenlabs_client:
         print("⚠️ [SCRIBE] ElevenLabs client not initialized. Skipping transcription.")
         return "[Scribe Error: Client not initialized]"
@@ -50,21 +101,7 @@ def transcribe_with_scribe(audio_data: bytes, is_final_segment: bool) -> str:
         return ""
 
     try:
-        wav_audio_data = audio_data
-        if not audio_data.startswith(b'RIFF'): # Check if already WAV
-            wav_audio_data = _create_wav_in_memory(
-                pcm_data=audio_data,
-                rate=config.PYAUDIO_RATE,
-                channels=config.PYAUDIO_CHANNELS,
-                sample_width=config.PYAUDIO_SAMPLE_WIDTH
-            )
-            
-        response = config.elevenlabs_client.speech_to_text.convert(
-            file=wav_audio_data,
-            model_id=config.ELEVENLABS_SCRIBE_MODEL_ID,
-            tag_audio_events=False, # Assuming we don't need to tag audio events
-            language_code=config.SCRIBE_LANGUAGE_CODE
-        )
+        response = _convert_with_scribe(audio_data)
 
         # New logic to process 'words' array
         if hasattr(response, 'words') and isinstance(response.words, list) and response.words:
@@ -179,50 +216,131 @@ def pyaudio_callback_new(in_data, frame_count, time_info, status):
     """Callback for PyAudio to process incoming audio data"""
     if app_globals.audio_capture_active.is_set():
         with app_globals.audio_buffer_lock:
-            app_globals.full_audio_data.extend(in_data)
+            app_globals.audio_ring_buffer.append(in_data)
+            app_globals.audio_data_available.notify_all()
 
-        # Send to WebSocket if connected
-        if app_globals.ws_app and app_globals.ws_app.sock and app_globals.ws_app.sock.connected:
-            try:
-                app_globals.ws_app.send(json.dumps({
-                    "type": "input_audio_buffer.append",
-                    "audio": base64.b64encode(in_data).decode("utf-8")
-                }))
-            except websocket.WebSocketConnectionClosedException:
-                pass  # Expected if connection closes mid-send
-            except Exception as e:
-                pass  # Avoid spamming logs for minor send errors
+        # Hand off to the uplink sender thread; never encode or touch the socket here
+        if config.VAD_MODE != "local":  # No realtime WebSocket session in local VAD mode
+            if app_globals.audio_uplink_queue.qsize() < app_globals.audio_uplink_max_backlog_frames:
+                app_globals.audio_uplink_queue.put_nowait((time.monotonic(), in_data))
+            else:
+                app_globals.audio_uplink_stats["frames_dropped"] += 1
 
     return (None, pyaudio.paContinue)
 
-def generate_audio_elevenlabs(text: str, segment_id: int) -> bytes | None:
-    """Generate audio using ElevenLabs TTS."""
+def send_audio_to_websocket(pcm_data: bytes) -> bool:
+    """Send one input_audio_buffer.append message to the realtime WebSocket, if connected."""
+    if app_globals.ws_app and app_globals.ws_app.sock and app_globals.ws_app.sock.connected:
+        try:
+            app_globals.ws_app.send(json.dumps({
+                "type": "input_audio_buffer.append",
+                "audio": base64.b64encode(pcm_data).decode("utf-8")
+            }))
+            return True
+        except websocket.WebSocketConnectionClosedException:
+            pass  # Expected if connection closes mid-send
+        except Exception as e:
+            pass  # Avoid spamming logs for minor send errors
+    return False
+
+class StreamingTtsAudio:
+    """
+    PCM of one TTS segment that can be played while it is still being synthesized.
+
+    The TTS worker appends chunks as ElevenLabs delivers them and closes the
+    stream when synthesis ends (successfully or not); the playback worker
+    iterates it, blocking until the next chunk or the end. Iterate only once.
+    """
+
+    def __init__(self, segment_id: int):
+        self.segment_id = segment_id
+        self.request_time = time.monotonic()
+        self.first_chunk_time: float | None = None
+        self.total_bytes = 0
+        self._chunks = queue.SimpleQueue()
+        self._transforms = []  # (process(chunk) -> bytes, flush() -> bytes) pairs applied in order on the way out
+        self.output_bytes = 0  # Bytes handed to playback so far (after the transform)
+
+    def put(self, chunk: bytes):
+        if self.first_chunk_time is None:
+            self.first_chunk_time = time.monotonic()
+        self.total_bytes += len(chunk)
+        self._chunks.put(chunk)
+
+    def close(self):
+        self._chunks.put(None)
+
+    def add_transform(self, process, flush):
+        """Pass every chunk through `process` on the way to playback (after earlier transforms), then what `flush()` returns."""
+        self._transforms.append((process, flush))
+
+    def __iter__(self):
+        while True:
+            chunk = self._chunks.get()
+            if chunk is None:
+                break
+            for process, _ in self._transforms:
+                chunk = process(chunk)
+            if chunk:
+                self.output_bytes += len(chunk)
+                yield chunk
+        tail = b""
+        for process, flush in self._transforms:  # Each transform's tail still goes through the ones after it
+            tail = (process(tail) if tail else b"") + flush()
+        if tail:
+            self.output_bytes += len(tail)
+            yield tail
+
+
+def _can_synthesize(text: str, segment_id: int) -> bool:
     if not config.elevenlabs_client:
         print(f"⚠️ [TTS_WORKER_EL ({segment_id})] ElevenLabs client not initialized.")
-        return None
+        return False
     if not config.ELEVENLABS_VOICE_ID:
         print(f"⚠️ [TTS_WORKER_EL ({segment_id})] ElevenLabs Voice ID not configured.")
-        return None
+        return False
     if not text or not text.strip():
         print(f"ℹ️ [TTS_WORKER_EL ({segment_id})] No text to synthesize.")
+        return False
+    return True
+
+
+# Voice settings for every TTS request; also part of the TTS cache key
+_TTS_VOICE_SETTINGS = {
+    "stability": 1,
+    "similarity_boost": 0.9,
+    "style": 0.0,  # Adjust if style exaggeration is needed
+    "use_speaker_boost": True,
+    "speed": 1.2  # Slightly faster for real-time feel
+}
+
+
+def tts_cache_key(text: str) -> str:
+    """TTS cache key of `text` under the current voice, model, language and settings."""
+    return make_tts_cache_key(config.ELEVENLABS_VOICE_ID, config.ELEVENLABS_MODEL_ID, config.TTS_LANGUAGE_CODE,
+                              config.ELEVENLABS_OUTPUT_FORMAT, _TTS_VOICE_SETTINGS, text)
+
+
+def _request_elevenlabs_audio(text: str):
+    """Start a TTS request and return the iterator of PCM chunks ElevenLabs streams back."""
+    return config.elevenlabs_client.text_to_speech.convert(
+        voice_id=config.ELEVENLABS_VOICE_ID,
+        text=text,
+        model_id=config.ELEVENLABS_MODEL_ID,
+        output_format=config.ELEVENLABS_OUTPUT_FORMAT,  # Use configured output format
+        language_code=config.TTS_LANGUAGE_CODE,  # Use TTS_LANGUAGE_CODE for TTS language
+        voice_settings=VoiceSettings(**_TTS_VOICE_SETTINGS)
+    )
+
+
+def generate_audio_elevenlabs(text: str, segment_id: int) -> bytes | None:
+    """Generate audio using ElevenLabs TTS."""
+    if not _can_synthesize(text, segment_id):
         return None
 
     try:
         print(f"🎤 [TTS_WORKER_EL ({segment_id})] Synthesizing: \"{text[:50]}...\"")
-        audio_stream = config.elevenlabs_client.text_to_speech.convert(
-            voice_id=config.ELEVENLABS_VOICE_ID,
-            text=text,
-            model_id=config.ELEVENLABS_MODEL_ID,
-            output_format=config.ELEVENLABS_OUTPUT_FORMAT,  # Use configured output format
-            language_code=config.TTS_LANGUAGE_CODE,  # Use TTS_LANGUAGE_CODE for TTS language
-            voice_settings=VoiceSettings(
-                stability=1,
-                similarity_boost=0.9,
-                style=0.0,  # Adjust if style exaggeration is needed
-                use_speaker_boost=True,
-                speed=1.2  # Slightly faster for real-time feel
-            )
-        )
+        audio_stream = _request_elevenlabs_audio(text)
         
         audio_bytes = b"".join([chunk for chunk in audio_stream])
         print(f"🎧 [TTS_WORKER_EL ({segment_id})] Audio generated ({len(audio_bytes)} bytes).")
@@ -231,6 +349,60 @@ def generate_audio_elevenlabs(text: str, segment_id: int) -> bytes | None:
         print(f"⚠️ [TTS_WORKER_EL ({segment_id})] Error generating audio: {e}")
         return None
 
+
+def stream_audio_elevenlabs(text: str, segment_id: int, audio_out: StreamingTtsAudio) -> bytes | None:
+    """
+    Synthesize `text` into `audio_out` chunk by chunk, so playback can start before synthesis ends.
+
+    Always closes `audio_out`. Records the time to the first audio chunk in
+    pipeline_metrics["tts_first_audio_s"].
+
+    Returns:
+        bytes | None: The complete audio, or None if synthesis failed or produced nothing.
+    """
+    audio_chunks = []
+    try:
+        if not _can_synthesize(text, segment_id):
+            return None
+        print(f"🎤 [TTS_WORKER_EL ({segment_id})] Streaming synthesis: \"{text[:50]}...\"")
+        for chunk in _request_elevenlabs_audio(text):
+            if not chunk:
+                continue
+            if audio_out.first_chunk_time is None:
+                first_audio_s = time.monotonic() - audio_out.request_time
+                app_globals.pipeline_metrics["tts_first_audio_s"] = first_audio_s
+                print(f"⏱️ [TTS_WORKER_EL ({segment_id})] First audio chunk after {first_audio_s * 1000:.0f} ms.")
+            audio_out.put(chunk)
+            audio_chunks.append(chunk)
+        print(f"🎧 [TTS_WORKER_EL ({segment_id})] Audio streamed ({audio_out.total_bytes} bytes).")
+        return b"".join(audio_chunks) or None
+    except Exception as e:
+        print(f"⚠️ [TTS_WORKER_EL ({segment_id})] Error streaming audio: {e}")
+        return None
+    finally:
+        audio_out.close()
+
+# Converter for the current mixer configuration: (pygame.mixer.get_init() result, PcmConverter)
+_mixer_converter = None
+
+def _get_mixer_converter(segment_id: int) -> PcmConverter | None:
+    """PcmConverter from TTS PCM (mono, 16-bit, config.PYAUDIO_RATE) to the mixer's rate and channels."""
+    global _mixer_converter
+    mixer_config = app_globals.pygame.mixer.get_init()
+    if not mixer_config:
+        return None
+    if _mixer_converter is None or _mixer_converter[0] != mixer_config:
+        mixer_freq, _, mixer_channels = mixer_config
+        _mixer_converter = (mixer_config, PcmConverter(config.PYAUDIO_RATE, mixer_freq, target_channels=mixer_channels))
+        print(f"🔧 [PLAYBACK_WORKER ({segment_id})] Converting {config.PYAUDIO_RATE} Hz mono TTS audio "
+              f"to the mixer's {mixer_freq} Hz, {mixer_channels}ch.")
+    return _mixer_converter[1]
+
+def _convert_pcm_for_mixer(audio_bytes: bytes, segment_id: int) -> bytes:
+    """Convert a whole TTS clip to the Pygame mixer's channels and rate."""
+    converter = _get_mixer_converter(segment_id)
+    return converter.convert(audio_bytes) if converter is not None else audio_bytes
+
 def play_audio_pygame(audio_bytes: bytes, segment_id: int):
     """Play audio bytes using Pygame mixer."""
     if not app_globals.pygame_mixer_initialized.is_set():
@@ -243,76 +415,149 @@ def play_audio_pygame(audio_bytes: bytes, segment_id: int):
     try:
         print(f"🔊 [PLAYBACK_WORKER ({segment_id})] Playing audio ({len(audio_bytes)} bytes)...")
 
-        processed_audio_bytes = audio_bytes
-        source_audio_rate = config.PYAUDIO_RATE # Expected to be 16000 for TTS
-        source_audio_channels = 1 # TTS output is mono
-        # Assuming 16-bit PCM from TTS (config.ELEVENLABS_OUTPUT_FORMAT = "pcm_16000")
-        # Pygame size -16 means signed 16-bit. np.int16 is signed 16-bit.
-        source_dtype = np.int16 
-        
-        if app_globals.pygame.mixer.get_init():
-            actual_mixer_freq, actual_mixer_format_bitsize, actual_mixer_channels = app_globals.pygame.mixer.get_init()
-            
-            # Convert raw bytes to numpy array based on source format
-            current_samples = np.frombuffer(processed_audio_bytes, dtype=source_dtype)
-
-            # 1. Channel Conversion (if necessary)
-            if actual_mixer_channels == 2 and source_audio_channels == 1:
-                current_samples = np.repeat(current_samples, 2) # Duplicate samples for L and R
-                # After this, current_samples is stereo, matching actual_mixer_channels
-            elif actual_mixer_channels == 1 and source_audio_channels == 2:
-                 print(f"⚠️ [PLAYBACK_WORKER ({segment_id})] Mixer is mono, audio is stereo. This might not play correctly. Playing as is (first channel if samples are interleaved).")
-                 # Potentially take only one channel: current_samples = current_samples[::2] or current_samples[1::2]
-            elif actual_mixer_channels != source_audio_channels:
-                 print(f"⚠️ [PLAYBACK_WORKER ({segment_id})] Channel mismatch: Mixer {actual_mixer_channels}ch, Source {source_audio_channels}ch. Playing as is.")
-
-            # 2. Resampling (if necessary)
-            if actual_mixer_freq != source_audio_rate:
-                num_source_samples = len(current_samples)
-                if actual_mixer_channels == 2 and source_audio_channels == 1: # if we converted mono to stereo
-                    num_source_samples //= 2 # number of frames
-
-                # Calculate new number of samples for the target frequency
-                num_target_samples = int(round(num_source_samples * actual_mixer_freq / source_audio_rate))
-                
-                resampled_audio_list = []
-
-                if (actual_mixer_channels == 2 and source_audio_channels == 1) or \
-                   (actual_mixer_channels == 2 and source_audio_channels == 2): # Stereo processing
-                    # Separate channels if stereo, resample, then interleave
-                    # current_samples would be stereo here if converted or if source was stereo
-                    left_channel = current_samples[0::2]
-                    right_channel = current_samples[1::2]
-                    
-                    x_source = np.linspace(0, 1, len(left_channel))
-                    x_target = np.linspace(0, 1, num_target_samples)
-                    
-                    resampled_left = np.interp(x_target, x_source, left_channel)
-                    resampled_right = np.interp(x_target, x_source, right_channel)
-                    
-                    # Interleave L and R channels
-                    resampled_stereo = np.empty(num_target_samples * 2, dtype=source_dtype)
-                    resampled_stereo[0::2] = resampled_left
-                    resampled_stereo[1::2] = resampled_right
-                    current_samples = resampled_stereo.astype(source_dtype)
-
-                elif actual_mixer_channels == 1: # Mono processing
-                    x_source = np.linspace(0, 1, num_source_samples) # num_source_samples is correct here
-                    x_target = np.linspace(0, 1, num_target_samples)
-                    current_samples = np.interp(x_target, x_source, current_samples).astype(source_dtype)
-                
-                else: # Should not happen if previous channel logic is correct
-                    print(f"⚠️ [PLAYBACK_WORKER ({segment_id})] Unexpected channel configuration for resampling. Skipping resampling.")
+        processed_audio_bytes = _convert_pcm_for_mixer(audio_bytes, segment_id)
 
-            processed_audio_bytes = current_samples.tobytes()
-
-        sound = app_globals.pygame.mixer.Sound(buffer=processed_audio_bytes)
-        channel = sound.play()
-        if channel:
-            while channel.get_busy():
-                app_globals.pygame.time.Clock().tick(10) # Keep alive, prevent busy loop
-        else:
+        feeder = _MixerChannelFeeder()
+        feeder.queue(processed_audio_bytes)
+        if feeder.channel is None:
             print(f"⚠️ [PLAYBACK_WORKER ({segment_id})] Could not get a channel to play audio.")
+        feeder.wait_until_finished()
         print(f"✅ [PLAYBACK_WORKER ({segment_id})] Playback finished.")
     except Exception as e:
         print(f"⚠️ [PLAYBACK_WORKER ({segment_id})] Error playing audio: {e}")
+
+
+_MIXER_CLOCK_SLACK_S = 0.01  # How far the mixer may run behind the wall clock at the end of a sound
+
+
+class _MixerChannelFeeder:
+    """
+    Plays one segment's audio (a whole clip, or the pieces of a stream) back to back on a single mixer channel.
+
+    A channel holds one sound queued behind the playing one. Instead of
+    polling for that slot, the feeder tracks when the playing sound ends
+    (from the lengths of the sounds it queued) and blocks until then; it only
+    re-checks the channel, once per `_MIXER_CLOCK_SLACK_S`, if the mixer
+    runs behind. Waits end early on shutdown.
+    """
+
+    def __init__(self):
+        self.channel = None
+        self._playing_ends_at = 0.0  # Monotonic time the playing sound ends
+        self._queued_length_s = 0.0  # Length of the sound queued behind it (0.0: none)
+
+    def queue(self, mixer_pcm: bytes):
+        """Play `mixer_pcm` right after what is already playing (or start it now)."""
+        sound = app_globals.pygame.mixer.Sound(buffer=mixer_pcm)
+        if self.channel is None:
+            app_globals.tts_playback_overlap.playback_started()
+            self.channel = sound.play()
+            self._playing_ends_at = time.monotonic() + sound.get_length()
+            return
+        if self._queued_length_s:
+            self._wait_until(self._playing_ends_at, lambda: self.channel.get_queue() is not None)
+            self._playing_ends_at += self._queued_length_s  # The queued sound is playing now
+            self._queued_length_s = 0.0
+        if self.channel.get_busy():
+            self._queued_length_s = sound.get_length()
+        else:
+            self._playing_ends_at = time.monotonic() + sound.get_length()  # Starts immediately on an idle channel
+        self.channel.queue(sound)
+
+    def wait_until_finished(self):
+        """Block until everything queued has been played."""
+        if self.channel is not None:
+            self._wait_until(self._playing_ends_at + self._queued_length_s, self.channel.get_busy)
+
+    @staticmethod
+    def _wait_until(deadline: float, still_waiting):
+        app_globals.done.wait(max(0.0, deadline - time.monotonic()))
+        while still_waiting() and not app_globals.done.wait(_MIXER_CLOCK_SLACK_S):
+            pass
+
+
+def play_audio_stream_pygame(audio: StreamingTtsAudio, segment_id: int):
+    """Play a TTS segment while it streams in, in pieces of at least config.TTS_STREAM_PLAYBACK_CHUNK_MS."""
+    if not app_globals.pygame_mixer_initialized.is_set():
+        print(f"⚠️ [PLAYBACK_WORKER ({segment_id})] Pygame mixer not initialized. Cannot play audio.")
+        for _ in audio:  # Drain so the stream's chunks are not held
+            pass
+        return
+
+    bytes_per_sample = 2  # 16-bit mono PCM from TTS
+    min_piece_bytes = int(config.PYAUDIO_RATE * config.TTS_STREAM_PLAYBACK_CHUNK_MS / 1000) * bytes_per_sample
+    converter = _get_mixer_converter(segment_id)
+    if converter is not None:
+        converter.reset()  # One converter stream per segment, so its pieces join without clicks
+    pending = bytearray()
+    feeder = _MixerChannelFeeder()
+    played_bytes = 0
+    try:
+        for chunk in audio:
+            pending += chunk
+            if len(pending) < min_piece_bytes:
+                continue
+            playable_len = len(pending) - len(pending) % bytes_per_sample  # Keep a split sample for the next chunk
+            piece = bytes(pending[:playable_len])
+            del pending[:playable_len]
+            feeder.queue(converter.process(piece) if converter is not None else piece)
+            if played_bytes == 0:
+                _report_first_played_audio(audio, segment_id)
+            played_bytes += len(piece)
+        rest = bytes(pending[:len(pending) - len(pending) % bytes_per_sample])
+        mixer_rest = converter.process(rest) + converter.flush() if converter is not None else rest
+        if mixer_rest:
+            feeder.queue(mixer_rest)
+            if played_bytes == 0:
+                _report_first_played_audio(audio, segment_id)
+            played_bytes += len(rest)
+
+        if played_bytes == 0:
+            print(f"ℹ️ [PLAYBACK_WORKER ({segment_id})] No audio data to play.")
+            return
+        if feeder.channel:
+            feeder.wait_until_finished()
+        else:
+            print(f"⚠️ [PLAYBACK_WORKER ({segment_id})] Could not get a channel to play audio.")
+        print(f"✅ [PLAYBACK_WORKER ({segment_id})] Streamed playback finished ({played_bytes} bytes).")
+    except Exception as e:
+        print(f"⚠️ [PLAYBACK_WORKER ({segment_id})] Error playing audio stream: {e}")
+        for _ in audio:
+            pass
+
+
+def _report_first_played_audio(audio: StreamingTtsAudio, segment_id: int):
+    """Log and record the segment's time to first audio: from the TTS request to the start of playback."""
+    first_played_s = time.monotonic() - audio.request_time
+    if app_globals.playback_output_stream is not None:
+        # Continuous output: the audio still waits for what is already buffered ahead of it
+        first_played_s += app_globals.playback_output_stream.buffer.buffered_ms / 1000
+    app_globals.pipeline_metrics["playback_first_audio_s"] = first_played_s
+    print(f"⏱️ [PLAYBACK_WORKER ({segment_id})] Time to first audio: {first_played_s * 1000:.0f} ms.")
+
+
+def play_audio_continuous(audio, segment_id: int):
+    """Write a segment (whole clip or StreamingTtsAudio) into the continuous output stream and return."""
+    output = app_globals.playback_output_stream
+    underruns_before = output.buffer.underrun_count
+    written_bytes = 0
+    try:
+        for chunk in (audio if isinstance(audio, StreamingTtsAudio) else [audio]):
+            if written_bytes == 0 and isinstance(audio, StreamingTtsAudio):
+                _report_first_played_audio(audio, segment_id)
+            if not output.write(chunk):  # Output closed during shutdown
+                break
+            written_bytes += len(chunk)
+            app_globals.pipeline_metrics["playback_buffer_ms"] = output.buffer.buffered_ms
+    except Exception as e:
+        print(f"⚠️ [PLAYBACK_WORKER ({segment_id})] Error writing to output stream: {e}")
+    finally:
+        output.end_segment()
+
+    underruns = output.buffer.underrun_count
+    app_globals.pipeline_metrics["playback_underruns"] = underruns
+    if underruns > underruns_before:
+        print(f"⚠️ [PLAYBACK_WORKER ({segment_id})] Output ran dry {underruns - underruns_before}x while the segment "
+              f"was arriving ({underruns} underruns in total).")
+    print(f"🔊 [PLAYBACK_WORKER ({segment_id})] Queued {written_bytes} bytes for output "
+          f"(buffer {output.buffer.buffered_ms:.0f} ms).")
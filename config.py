@@ -1,7 +1,8 @@
+import os
 import pyaudio
 
 # --- API Versions and Constants ---
-AZ_OPENAI_API_VERSION = "2024-05-01-preview"
+AZ_OPENAI_API_VERSION = "2024-10-21"  # First GA version reporting cached prompt tokens and streamed usage
 AZ_API_VERSION_REALTIME = "2025-04-01-preview"
 ELEVENLABS_SCRIBE_MODEL_ID = "scribe_v1"
 ELEVENLABS_MODEL_ID = "eleven_flash_v2_5"
@@ -25,15 +26,72 @@ OUTPUT_LANGUAGE_NAME_FOR_PROMPT = "Portuguese"
 SCRIBE_LANGUAGE_CODE = "en"
 TTS_LANGUAGE_CODE = "pt"  # Default TTS language code
 TTS_OUTPUT_ENABLED = True
-PERIODIC_SCRIBE_INTERVAL_S = 5.0
+TTS_STREAMING_PLAYBACK_ENABLED = True  # Start playing a segment while ElevenLabs is still synthesizing it
+TTS_STREAM_PLAYBACK_CHUNK_MS = 200  # Streamed audio is handed to the mixer in pieces of at least this length
+TTS_MAX_IN_FLIGHT = 3  # Concurrent ElevenLabs TTS requests; playback still follows segment order
+TTS_CLAUSE_CHUNKING_ENABLED = True  # Synthesize each segment clause by clause, so its first clause plays early
+TTS_CHUNK_MIN_CHARS = 30  # Shorter clauses are merged with a neighbour (TTS prosody suffers on tiny pieces)
+PLAYBACK_CONTINUOUS_STREAM_ENABLED = True  # One open output stream fed from a jitter buffer (gapless); off: one mixer Sound per clip
+PLAYBACK_PREBUFFER_MS = 100  # Audio queued before output (re)starts after running dry
+PLAYBACK_MAX_BUFFER_MS = 1000  # The playback worker waits while more than this is queued
+PLAYBACK_CALLBACK_FRAMES = 512  # Frames per output callback (32 ms at 16 kHz)
+PLAYBACK_MAX_LAG_S = 6.0  # Segments kept waiting longer than this by earlier answers' audio get PLAYBACK_LAG_POLICY
+PLAYBACK_LAG_POLICY = "compress"  # "compress" (shorten pauses), "skip" (drop the segment) or "off"
+PLAYBACK_SKIP_LAG_S = 15.0  # Segments further behind than this are always skipped
+PLAYBACK_CATCHUP_MAX_PAUSE_MS = 120  # Longest pause kept when compressing a late segment
+PLAYBACK_SILENCE_THRESHOLD = 300  # Mean absolute 16-bit amplitude below which a 10 ms frame counts as a pause
+PLAYBACK_HOLE_TIMEOUT_S = 5.0  # A missing segment is skipped after later ones have waited this long
+PLAYBACK_MAX_PENDING_SEGMENTS = 64  # ...or as soon as this many later segments are waiting
+PLAYBACK_LAG_HISTORY_SIZE = 1000  # Recent lag samples kept in memory
+PLAYBACK_LAG_EXPORT_PATH = None  # CSV file every segment's lag is appended to (None: memory only)
+PLAYBACK_TIME_STRETCH_ENABLED = True  # Speed playback up (pitch unchanged) while it lags, back to 1.0x once caught up
+PLAYBACK_STRETCH_START_LAG_S = 2.0  # Playback backlog (own lag + other answers' audio queued behind) at which speeding up starts
+PLAYBACK_STRETCH_FULL_LAG_S = 6.0  # Playback backlog at which PLAYBACK_STRETCH_MAX_SPEED is reached
+PLAYBACK_STRETCH_MAX_SPEED = 1.3  # On top of the TTS voice speed; speech stays intelligible up to ~1.5x
+TTS_CACHE_ENABLED = True  # Replay earlier audio for identical text, voice, model, language and settings
+TTS_CACHE_MAX_BYTES = 32 * 1024 * 1024  # In-memory LRU size (~17 minutes of pcm_16000)
+TTS_CACHE_PERSISTENT = False  # Also keep clips as raw PCM files across sessions
+TTS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tts_cache")
+TTS_CACHE_DISK_MAX_BYTES = 256 * 1024 * 1024  # Least recently used files beyond this are deleted
+PERIODIC_SCRIBE_INTERVAL_S = 5.0  # Fixed interval, or the starting point when the adaptive interval is enabled
+PERIODIC_SCRIBE_ADAPTIVE_INTERVAL_ENABLED = True  # Tune the interval from Scribe RTT, translator time and queue depth
+PERIODIC_SCRIBE_MIN_INTERVAL_S = 1.5
+PERIODIC_SCRIBE_MAX_INTERVAL_S = 8.0
 PERIODIC_SCRIBE_INTER_CHUNK_OVERLAP_MS = 500
+PERIODIC_SCRIBE_MAX_IN_FLIGHT = 3  # Concurrent periodic Scribe requests; results are still delivered in order
 FINAL_SCRIBE_PRE_ROLL_MS = 500
+TRANSCRIPT_STITCHING_ENABLED = True  # Merge chunks by Scribe word timestamps instead of overlap + "..."
+TRANSCRIPT_STABILITY_HORIZON_MS = 400  # Words ending this close to a periodic chunk's end wait for the next chunk
+TRANSCRIPT_STITCH_OVERLAP_MS = 1000  # Chunk overlap when stitching; must exceed the horizon by the longest expected word
 LLM_TRANSLATOR_CONTEXT_WINDOW_SIZE = 5
-MAX_NATIVE_HISTORY_CHARS = 5000
-MAX_TRANSLATED_HISTORY_CHARS = 5000
+MAX_NATIVE_HISTORY_CHARS = 5000  # Oldest processed source segments are evicted beyond this
+MAX_TRANSLATED_HISTORY_CHARS = 5000  # Oldest spoken translations are evicted beyond this
+LLM_TRANSLATOR_CONTEXT_TOKEN_BUDGET = 1500  # Estimated tokens per request for fragments + both histories
+LLM_CHARS_PER_TOKEN = 4.0  # For token estimates; lower it for CJK-heavy language pairs
+LLM_TRANSLATOR_STREAMING_ENABLED = True  # Stream the translator response and send text_to_speak to TTS clause by clause
+LLM_STREAM_MIN_CLAUSE_CHARS = 30  # A streamed clause is held until it reaches this length (split as in TTS_CHUNK_MIN_CHARS)
+CONTINUITY_TRIM_MIN_OVERLAP_TOKENS = 2  # Shortest repeat of the last spoken words that is removed (must match exactly)
+CONTINUITY_TRIM_MAX_OVERLAP_TOKENS = 12  # Longest repeat that is looked for
+CONTINUITY_TRIM_FUZZY_RATIO = 0.85  # Token similarity at which a longer repeat with words inserted or dropped inside it still counts
+TRANSLATION_MEMORY_ENABLED = True  # Reuse earlier translations of whole repeated utterances instead of calling the LLM
+TRANSLATION_MEMORY_MAX_ENTRIES = 512  # In-memory LRU size
+TRANSLATION_MEMORY_MIN_CONFIRMATIONS = 2  # Times the LLM must produce the same translation before it is reused
+TRANSLATION_MEMORY_PERSISTENT = False  # Also keep the memory in an SQLite file across sessions
+TRANSLATION_MEMORY_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translation_memory.sqlite3")
+TRANSLATION_MEMORY_DISK_MAX_ENTRIES = 10000  # Least recently used entries beyond this are evicted from the file
 AZ_VAD_SILENCE_TIMEOUT_MS = 300
 AZ_VAD_PRE_ROLL_MS = 300
 
+# --- Voice Activity Detection ---
+VAD_MODE = "server"  # "server": Azure realtime server_vad over WebSocket; "local": on-device energy/zero-crossing VAD, no WebSocket
+LOCAL_VAD_FRAME_MS = 20
+LOCAL_VAD_ENERGY_THRESHOLD_DB = -45.0  # Frames quieter than this (dBFS) are never speech
+LOCAL_VAD_NOISE_MARGIN_DB = 10.0  # Speech must also be this far above the adaptive noise floor
+LOCAL_VAD_MAX_ZERO_CROSSING_RATE = 0.35  # Quieter frames with more zero crossings than this are treated as hiss
+LOCAL_VAD_MIN_SPEECH_MS = 100  # Continuous speech needed before speech_started
+LOCAL_VAD_SILENCE_TIMEOUT_MS = 300  # Continuous silence needed before speech_stopped
+LOCAL_VAD_PRE_ROLL_MS = 300
+
 # --- PyAudio Configuration ---
 PYAUDIO_RATE = 16000
 PYAUDIO_CHANNELS = 1
@@ -42,6 +100,15 @@ PYAUDIO_FRAMES_PER_BUFFER = 1024
 PYAUDIO_INPUT_DEVICE_INDEX = None
 PYAUDIO_OUTPUT_DEVICE_NAME = None
 PYAUDIO_SAMPLE_WIDTH = 2  # Will be updated by config_operations
+AUDIO_RING_BUFFER_SECONDS = 300  # Captured audio kept in memory; older audio is overwritten
+
+# --- Realtime Audio Uplink Configuration ---
+AUDIO_UPLINK_BATCH_MS = 100  # Captured buffers are coalesced into messages of about this duration
+AUDIO_UPLINK_MAX_BACKLOG_MS = 2000  # Audio waiting to be sent beyond this is dropped
+AUDIO_UPLINK_LATE_FRAME_MS = 500  # Buffers sent later than this after capture are counted as late
+AUDIO_UPLINK_SILENCE_GATING_ENABLED = False  # Only stream speech-adjacent audio (uses the LOCAL_VAD_* energy thresholds)
+AUDIO_UPLINK_GATE_HANGOVER_MS = 1000  # Keep streaming this long after speech; never below AZ_VAD_SILENCE_TIMEOUT_MS
+AUDIO_UPLINK_GATE_PRE_ROLL_MS = 500  # Held-back audio sent ahead of detected speech; should cover AZ_VAD_PRE_ROLL_MS
 
 # --- WebSocket Configuration ---
 WS_URL = ""  # Will be computed by config_operations
@@ -22,7 +22,8 @@ DEFAULT_APP_CONFIG = {
     "TTS_OUTPUT_ENABLED": True,
     "ELEVENLABS_VOICE_ID": "bVMeCyTHy58xNoL34h3p",  # Default voice ID (Marcos)
     "PYAUDIO_INPUT_DEVICE_INDEX": None,
-    "PYAUDIO_OUTPUT_DEVICE_NAME": None
+    "PYAUDIO_OUTPUT_DEVICE_NAME": None,
+    "VAD_MODE": "server"  # "server" (Azure realtime) or "local" (on-device)
 }
 
 def load_api_config(config_path: str = ENV_CONFIG_PATH) -> Dict[str, Any]:
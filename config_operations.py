@@ -61,10 +61,31 @@ def initialize_elevenlabs_client():
 def print_config_info():
     """Print configuration information"""
     print(f"CONFIG: Periodic Scribe Interval: {config.PERIODIC_SCRIBE_INTERVAL_S}s")
+    if config.PERIODIC_SCRIBE_ADAPTIVE_INTERVAL_ENABLED:
+        print(f"CONFIG: Periodic Scribe Adaptive Interval: {config.PERIODIC_SCRIBE_MIN_INTERVAL_S}s - {config.PERIODIC_SCRIBE_MAX_INTERVAL_S}s")
     print(f"CONFIG: Periodic Scribe Inter-Chunk Overlap: {config.PERIODIC_SCRIBE_INTER_CHUNK_OVERLAP_MS}ms")
+    print(f"CONFIG: Periodic Scribe Max In-Flight Requests: {config.PERIODIC_SCRIBE_MAX_IN_FLIGHT}")
     print(f"CONFIG: Final Scribe Pre-roll: {config.FINAL_SCRIBE_PRE_ROLL_MS}ms")
     print(f"CONFIG: Translator LLM Model: {config.AZ_TRANSLATOR_LLM_DEPLOYMENT_NAME}")
     print(f"CONFIG: Translator LLM Context Window: {config.LLM_TRANSLATOR_CONTEXT_WINDOW_SIZE} items")
+    print(f"CONFIG: Translator LLM Context Budget: ~{config.LLM_TRANSLATOR_CONTEXT_TOKEN_BUDGET} tokens "
+          f"(history caps: {config.MAX_NATIVE_HISTORY_CHARS} native / {config.MAX_TRANSLATED_HISTORY_CHARS} translated chars)")
+    if config.LLM_TRANSLATOR_STREAMING_ENABLED:
+        print(f"CONFIG: Translator LLM Streaming: on (min clause {config.LLM_STREAM_MIN_CLAUSE_CHARS} chars)")
+    if config.TTS_STREAMING_PLAYBACK_ENABLED:
+        print(f"CONFIG: TTS Streaming Playback: on (pieces of {config.TTS_STREAM_PLAYBACK_CHUNK_MS}ms)")
+    print(f"CONFIG: TTS Max In-Flight Requests: {config.TTS_MAX_IN_FLIGHT}")
+    if config.TTS_CLAUSE_CHUNKING_ENABLED:
+        print(f"CONFIG: TTS Clause Chunking: on (min {config.TTS_CHUNK_MIN_CHARS} chars)")
+    if config.PLAYBACK_CONTINUOUS_STREAM_ENABLED:
+        print(f"CONFIG: Continuous Playback Stream: on (prebuffer {config.PLAYBACK_PREBUFFER_MS}ms, max buffer {config.PLAYBACK_MAX_BUFFER_MS}ms)")
+    print(f"CONFIG: Playback Max Lag: {config.PLAYBACK_MAX_LAG_S}s ({config.PLAYBACK_LAG_POLICY}), always skip beyond {config.PLAYBACK_SKIP_LAG_S}s")
+    if config.PLAYBACK_TIME_STRETCH_ENABLED:
+        print(f"CONFIG: Playback Catch-Up: 1.0x at {config.PLAYBACK_STRETCH_START_LAG_S}s backlog up to {config.PLAYBACK_STRETCH_MAX_SPEED}x at {config.PLAYBACK_STRETCH_FULL_LAG_S}s")
+    if config.TTS_CACHE_ENABLED:
+        print(f"CONFIG: TTS Audio Cache: {config.TTS_CACHE_MAX_BYTES // (1024 * 1024)}MB in memory")
+        if config.TTS_CACHE_PERSISTENT:
+            print(f"CONFIG: TTS Audio Cache on Disk: {config.TTS_CACHE_DISK_MAX_BYTES // (1024 * 1024)}MB in {config.TTS_CACHE_DIR}")
     print(f"CONFIG: Language Pair: {config.INPUT_LANGUAGE_NAME_FOR_PROMPT} → {config.OUTPUT_LANGUAGE_NAME_FOR_PROMPT}")
     print(f"CONFIG: WebSocket URL: {config.WS_URL}")
 
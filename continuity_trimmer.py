@@ -0,0 +1,67 @@
+"""Local removal of translated text that repeats the end of what was already spoken."""
+
+import unicodedata
+from difflib import SequenceMatcher
+
+
+def _normalize_token(token: str) -> str:
+    """Case-fold, strip accents and punctuation, so "Olá," and "ola" compare equal."""
+    decomposed = unicodedata.normalize("NFKD", token.casefold())
+    return "".join(char for char in decomposed
+                   if not unicodedata.combining(char) and not unicodedata.category(char).startswith("P"))
+
+
+def _is_fuzzy_repeat(spoken_tail: list[str], new_head: list[str], fuzzy_ratio: float) -> bool:
+    """True if the token lists share their first and last tokens and otherwise differ only by inserted or dropped tokens."""
+    if spoken_tail[0] != new_head[0] or spoken_tail[-1] != new_head[-1]:
+        return False
+    matcher = SequenceMatcher(None, spoken_tail, new_head, autojunk=False)
+    opcodes = matcher.get_opcodes()
+    if opcodes[0][0] != "equal" or opcodes[-1][0] != "equal" or any(tag == "replace" for tag, *_ in opcodes):
+        return False
+    return matcher.ratio() >= fuzzy_ratio
+
+
+def find_continuity_overlap(spoken_text: str, new_text: str, min_overlap_tokens: int = 2,
+                            max_overlap_tokens: int = 12, fuzzy_ratio: float = 0.85) -> int:
+    """
+    Count the leading tokens of `new_text` that repeat the trailing tokens of `spoken_text`.
+
+    Tokens are whitespace-separated words compared after normalization. The
+    longest overlap wins. Overlaps of `min_overlap_tokens` words must match
+    exactly. Longer ones may have words inserted or dropped inside them
+    (an added article, a dropped adverb) as long as the token similarity is
+    at least `fuzzy_ratio`, but their first and last words must match exactly:
+    the last overlapped word is where the cut falls, and it must be the last
+    word spoken, or new content would be cut.
+
+    Returns:
+        int: Number of leading tokens of `new_text` to drop (0 if there is no overlap).
+    """
+    spoken_tokens = [_normalize_token(token) for token in spoken_text.split()[-max_overlap_tokens:]]
+    new_tokens = [_normalize_token(token) for token in new_text.split()[:max_overlap_tokens]]
+    if not spoken_tokens or not new_tokens:
+        return 0
+    for overlap in range(len(new_tokens), min_overlap_tokens - 1, -1):
+        new_head = new_tokens[:overlap]
+        if new_head[-1] != spoken_tokens[-1]:
+            continue
+        if spoken_tokens[-overlap:] == new_head:
+            return overlap
+        if overlap > min_overlap_tokens and any(
+                _is_fuzzy_repeat(spoken_tokens[-tail_length:], new_head, fuzzy_ratio)
+                for tail_length in range(min_overlap_tokens, len(spoken_tokens) + 1)):
+            return overlap
+    return 0
+
+
+def trim_continuity_overlap(spoken_text: str, new_text: str, min_overlap_tokens: int = 2,
+                            max_overlap_tokens: int = 12, fuzzy_ratio: float = 0.85) -> str:
+    """Return `new_text` without the leading words that repeat the end of `spoken_text`."""
+    if not spoken_text or not new_text:
+        return new_text
+    overlap = find_continuity_overlap(spoken_text, new_text, min_overlap_tokens, max_overlap_tokens, fuzzy_ratio)
+    if overlap == 0:
+        return new_text
+    return " ".join(new_text.split()[overlap:])
+
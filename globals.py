@@ -6,16 +6,48 @@ import pygame  # For pygame types and mixer
 import os  # For environment variable manipulation
 
 import config as config  # Add this import
+from audio_buffer import AudioRingBuffer
+from transcript_stitcher import TranscriptStitcher
+from interval_controller import AdaptiveIntervalController
+from history_store import TextHistory
+from priority_lanes import TranscriptionLaneQueue
+from translation_memory import TranslationMemory
+from overlap_meter import PlaybackOverlapMeter
+from tts_cache import TtsAudioCache
+from latency_slo import LagRecorder, PlaybackLagTracker
+from time_stretch import CatchUpSpeedController
 
 # --- Application Control ---
 done = threading.Event()  # Controls main loop and signals threads to stop
 
 # --- Audio Buffering and Capture Control ---
 audio_buffer_lock = threading.Lock()
-full_audio_data = bytearray()  # Stores all raw audio data from PyAudio
+audio_data_available = threading.Condition(audio_buffer_lock)  # Notified by the PyAudio callback after each append
+# Stores the most recent raw audio data from PyAudio, addressed by absolute byte offsets
+audio_ring_buffer = AudioRingBuffer(
+    capacity_bytes=int(config.PYAUDIO_RATE * config.AUDIO_RING_BUFFER_SECONDS) * config.PYAUDIO_SAMPLE_WIDTH * config.PYAUDIO_CHANNELS,
+    frame_width=config.PYAUDIO_SAMPLE_WIDTH * config.PYAUDIO_CHANNELS
+)
 audio_capture_active = threading.Event()
 audio_capture_active.set()  # Controls PyAudio callback data collection
 
+# --- Realtime Audio Uplink ---
+# Filled by the PyAudio callback, drained by audio_uplink_sender_worker_new
+# "Frames" in the counters below are PyAudio capture buffers (config.PYAUDIO_FRAMES_PER_BUFFER samples each)
+# Item format: (capture_time_monotonic: float, pcm_bytes: bytes)
+audio_uplink_queue = queue.SimpleQueue()
+audio_uplink_max_backlog_frames = max(1, int(config.AUDIO_UPLINK_MAX_BACKLOG_MS * config.PYAUDIO_RATE / 1000 / config.PYAUDIO_FRAMES_PER_BUFFER))
+audio_uplink_stats = {
+    "frames_sent": 0,
+    "frames_dropped": 0,  # Backlog full, dropped in the PyAudio callback
+    "frames_late": 0,  # Sent more than AUDIO_UPLINK_LATE_FRAME_MS after capture
+    "frames_discarded_disconnected": 0,
+    "frames_gated": 0,  # Withheld as silence by AUDIO_UPLINK_SILENCE_GATING_ENABLED
+    "bytes_gated": 0,  # PCM bytes saved by silence gating (before base64)
+    "messages_sent": 0,
+    "bytes_sent": 0
+}
+
 # --- WebSocket and VAD State ---
 ws_app: websocket.WebSocketApp | None = None  # WebSocketApp instance, set in on_ws_open
 ws_instance_global: websocket.WebSocketApp | None = None  # WebSocketApp instance, set in main.py
@@ -23,22 +55,49 @@ speech_active = threading.Event()  # Set by VAD when speech_started, cleared whe
 final_transcription_pending_for_current_utterance = threading.Event()  # Add this line
 
 # --- Scribe Transcription Timing and State ---
+current_utterance_id: int = 0  # Incremented at every speech_started; tags the transcriptions of an utterance
 utterance_start_time_monotonic: float | None = None
 utterance_audio_start_byte_offset: int = 0
 last_periodic_scribe_submission_time: float = 0.0
 last_periodic_scribe_chunk_end_byte_offset: int = 0
 
+# Chooses the periodic Scribe interval when PERIODIC_SCRIBE_ADAPTIVE_INTERVAL_ENABLED is set
+periodic_scribe_interval_controller = AdaptiveIntervalController(
+    initial_interval_s=config.PERIODIC_SCRIBE_INTERVAL_S,
+    min_interval_s=config.PERIODIC_SCRIBE_MIN_INTERVAL_S,
+    max_interval_s=config.PERIODIC_SCRIBE_MAX_INTERVAL_S,
+    max_in_flight=config.PERIODIC_SCRIBE_MAX_IN_FLIGHT
+)
+
+# Merges overlapping periodic/final Scribe chunks into non-overlapping text (TRANSCRIPT_STITCHING_ENABLED)
+transcript_stitcher = TranscriptStitcher(stability_horizon_s=config.TRANSCRIPT_STABILITY_HORIZON_MS / 1000)
+
 # --- Queues ---
 # Queue for Scribe transcriptions to be processed by the translator LLM agent
-# Item format: (transcription_text: str)
-scribe_to_translator_llm_queue = queue.Queue()
+# Item format: ScribeTranscription (the translator also posts its own finished LLM calls here to wake itself)
+# Final transcriptions preempt periodic ones; periodic items of an utterance that already has a final are dropped
+scribe_to_translator_llm_queue = TranscriptionLaneQueue()
+
+# Queue for final-segment Scribe requests, filled by the VAD event handler at speech_stopped
+# Item format: (start_byte_offset: int, end_byte_offset: int, utterance_id: int) - absolute offsets in audio_ring_buffer
+final_scribe_request_queue = queue.Queue()
 
 # Queue for translated text from LLM to be processed by TTS
 # Item format: (segment_id: int, text_to_speak: str)
 llm_to_tts_queue = queue.Queue()
 
-# Queue for generated audio bytes from TTS to be played back
-# Item format: (segment_id: int, audio_bytes: bytes | None)
+# Audio of earlier TTS requests, replayed instead of re-synthesizing identical text (TTS_CACHE_ENABLED)
+tts_audio_cache = TtsAudioCache(
+    max_bytes=config.TTS_CACHE_MAX_BYTES,
+    disk_dir=config.TTS_CACHE_DIR if config.TTS_CACHE_PERSISTENT else None,
+    disk_max_bytes=config.TTS_CACHE_DISK_MAX_BYTES
+)
+
+# Queue for generated audio from TTS to be played back
+# Item format: (segment_id: int, sub_index: int, sub_count: int, audio: bytes | StreamingTtsAudio | None, queued_at: float)
+# queued_at is time.monotonic() when the item was queued; playback measures its lag from when audio was ready
+# Each segment is played as sub_count clause-sized sub-segments, in sub_index order (TTS_CLAUSE_CHUNKING_ENABLED)
+# A StreamingTtsAudio is queued before synthesis starts and fills as ElevenLabs streams (TTS_STREAMING_PLAYBACK_ENABLED)
 tts_to_playback_queue = queue.Queue()
 
 # --- LLM Translator Agent State ---
@@ -47,27 +106,114 @@ tts_to_playback_queue = queue.Queue()
 recent_scribe_transcriptions = deque(maxlen=5)  # Default maxlen, will be updated from config
 recent_scribe_transcriptions_lock = threading.Lock()
 
+# Earlier translations of whole utterances, reused instead of an LLM call (TRANSLATION_MEMORY_ENABLED)
+translation_memory = TranslationMemory(
+    max_entries=config.TRANSLATION_MEMORY_MAX_ENTRIES,
+    min_confirmations=config.TRANSLATION_MEMORY_MIN_CONFIRMATIONS,
+    db_path=config.TRANSLATION_MEMORY_DB_PATH if config.TRANSLATION_MEMORY_PERSISTENT else None,
+    disk_max_entries=config.TRANSLATION_MEMORY_DISK_MAX_ENTRIES
+)
+
 # Stores the history of what the translator LLM has decided to speak (in the target language)
-# Changed from string to list of strings
-translated_speech_history = []
+# Oldest entries are evicted beyond config.MAX_TRANSLATED_HISTORY_CHARS
+translated_speech_history = TextHistory(max_chars=config.MAX_TRANSLATED_HISTORY_CHARS)
 translated_speech_history_lock = threading.Lock()
 
 # Stores the history of the original language text that the LLM processed to produce translations
-# Changed from string to list of strings
-native_speech_history_processed_by_llm = []
+# Oldest entries are evicted beyond config.MAX_NATIVE_HISTORY_CHARS
+native_speech_history_processed_by_llm = TextHistory(max_chars=config.MAX_NATIVE_HISTORY_CHARS)
 native_speech_history_processed_by_llm_lock = threading.Lock()
 
+# Outcome of every translator LLM call (written only by the translator agent)
+translator_call_stats = {
+    "calls_started": 0,
+    "calls_useful": 0,  # Spoke, or consumed new source text
+    "calls_idle": 0,  # Completed, but found nothing new to process
+    "calls_superseded": 0,  # Cancelled or discarded because a final transcription made their input stale
+    "calls_failed": 0
+}
+
+# --- Pipeline Metrics ---
+# Latest value of each runtime metric, keyed by name. Each key is written only by the worker that owns it (or its thread pool).
+pipeline_metrics = {}
+
+# Synthesis time that ran while audio was playing (parallel TTS, TTS_MAX_IN_FLIGHT)
+tts_playback_overlap = PlaybackOverlapMeter()
+
+# --- Event-Driven Wakeups ---
+# Workers block on queues and conditions instead of polling; these wake them when state changes.
+# Waiters snapshot pipeline_state_generation under the condition and wait for it to change,
+# so a notification between their check and their wait is never lost.
+pipeline_state_changed = threading.Condition()  # Speech started/stopped, periodic Scribe slot freed, shutdown
+pipeline_state_generation = 0
+
+def notify_pipeline_state_changed():
+    """Wake every worker waiting on pipeline_state_changed."""
+    global pipeline_state_generation
+    with pipeline_state_changed:
+        pipeline_state_generation += 1
+        pipeline_state_changed.notify_all()
+
+def request_shutdown():
+    """Set `done` and wake workers blocked on conditions so they exit immediately."""
+    done.set()
+    notify_pipeline_state_changed()
+    with audio_data_available:
+        audio_data_available.notify_all()
+
 # --- Segment ID Generation ---
 next_segment_id = 0
 segment_id_lock = threading.Lock()
 
-def get_new_segment_id() -> int:
+# Answer of each segment: the first segment of the text it belongs to (streamed clauses of one translator
+# call are segments of one answer), kept until playback is done with it; playback measures lag per answer
+segment_answer_ids = {}
+
+def get_new_segment_id(answer_segment_id: int | None = None) -> int:
+    """New segment ID; pass the answer's first segment ID for a segment that continues the same answer."""
     global next_segment_id
     with segment_id_lock:
         current_id = next_segment_id
         next_segment_id += 1
+        segment_answer_ids[current_id] = current_id if answer_segment_id is None else answer_segment_id
         return current_id
 
+def segment_answer_id(segment_id: int) -> int:
+    with segment_id_lock:
+        return segment_answer_ids.get(segment_id, segment_id)
+
+def reset_segment_ids():
+    """Restart segment IDs at 0 for a new session, forgetting the previous session's answers."""
+    global next_segment_id
+    with segment_id_lock:
+        next_segment_id = 0
+        segment_answer_ids.clear()
+    playback_lag_tracker.reset()
+
+def forget_segments_before(segment_id: int):
+    """Drop the answers of segments playback is done with."""
+    with segment_id_lock:
+        for finished_id in [known_id for known_id in segment_answer_ids if known_id < segment_id]:
+            del segment_answer_ids[finished_id]
+
+# --- Continuous Playback Output ---
+# ContinuousOutputStream while the playback worker runs with PLAYBACK_CONTINUOUS_STREAM_ENABLED, else None
+playback_output_stream = None
+
+# How far playback runs behind (PLAYBACK_MAX_LAG_S); used by the playback worker only
+playback_lag_tracker = PlaybackLagTracker()
+
+# Playback lag of every played segment over time (PLAYBACK_MAX_LAG_S), optionally exported as CSV
+playback_lag_recorder = LagRecorder(history_size=config.PLAYBACK_LAG_HISTORY_SIZE,
+                                    csv_path=config.PLAYBACK_LAG_EXPORT_PATH)
+
+# Playback speed-up from the playback backlog (PLAYBACK_TIME_STRETCH_ENABLED); used by the playback worker only
+playback_speed_controller = CatchUpSpeedController(
+    start_lag_s=config.PLAYBACK_STRETCH_START_LAG_S,
+    full_lag_s=config.PLAYBACK_STRETCH_FULL_LAG_S,
+    max_speed=config.PLAYBACK_STRETCH_MAX_SPEED
+)
+
 # --- Pygame Mixer Initialization ---
 pygame_mixer_initialized = threading.Event()
 pygame_selected_output_device = None  # Will store the actual selected device name
@@ -3,7 +3,6 @@
 import customtkinter
 import tkinter as tk
 import threading
-import time
 import pyaudio
 import pygame
 import pygame._sdl2.audio as sdl2_audio
@@ -21,7 +20,10 @@ import config_loader
 import config_operations
 import globals as app_globals
 from workers import (
+    audio_uplink_sender_worker_new,
+    local_vad_worker_new,
     periodic_scribe_transcription_worker_new,
+    final_scribe_transcription_worker_new,
     translator_llm_agent_worker_new,
     tts_worker_new,
     playback_worker_new
@@ -33,6 +35,7 @@ from websocket_handler import (
     on_ws_error_new,
     on_ws_close_new
 )
+from vad_handler import reset_vad_state
 import websocket  # For WebSocketApp type hint
 
 from .config_window import ConfigWindow
@@ -506,9 +509,15 @@ class App(customtkinter.CTk):
         app_globals.translated_speech_history.clear()
         app_globals.native_speech_history_processed_by_llm.clear()
         app_globals.all_scribe_transcriptions_log.clear()
-        app_globals.next_segment_id = 0
+        app_globals.reset_segment_ids()
+        app_globals.playback_speed_controller.reset()
+        
+        for counter_name in app_globals.audio_uplink_stats:
+            app_globals.audio_uplink_stats[counter_name] = 0
         
         # Ensure queues are empty for a new session
+        while not app_globals.audio_uplink_queue.empty(): app_globals.audio_uplink_queue.get()
+        while not app_globals.final_scribe_request_queue.empty(): app_globals.final_scribe_request_queue.get()
         while not app_globals.scribe_to_translator_llm_queue.empty(): app_globals.scribe_to_translator_llm_queue.get()
         while not app_globals.llm_to_tts_queue.empty(): app_globals.llm_to_tts_queue.get()
         while not app_globals.tts_to_playback_queue.empty(): app_globals.tts_to_playback_queue.get()
@@ -521,10 +530,27 @@ class App(customtkinter.CTk):
         """Core logic thread function that runs the main processing pipeline."""
         app_globals.initialize_pygame_mixer_if_needed()
 
+        use_local_vad = config.VAD_MODE == "local"
+        if use_local_vad:
+            # No WebSocket session will reset the VAD state, so do it before capture starts
+            reset_vad_state()
+
         # --- Start Worker Threads ---
+        self.audio_uplink_thread = None
+        self.local_vad_thread = None
+        if use_local_vad:
+            self.local_vad_thread = threading.Thread(target=local_vad_worker_new, daemon=True)
+            self.local_vad_thread.start()
+        else:
+            self.audio_uplink_thread = threading.Thread(target=audio_uplink_sender_worker_new, daemon=True)
+            self.audio_uplink_thread.start()
+
         self.periodic_scribe_thread = threading.Thread(target=periodic_scribe_transcription_worker_new, daemon=True)
         self.periodic_scribe_thread.start()
 
+        self.final_scribe_thread = threading.Thread(target=final_scribe_transcription_worker_new, daemon=True)
+        self.final_scribe_thread.start()
+
         self.translator_agent_thread = threading.Thread(target=translator_llm_agent_worker_new, daemon=True)
         self.translator_agent_thread.start()
 
@@ -549,10 +575,13 @@ class App(customtkinter.CTk):
             self.stream.start_stream()
         except Exception as e:
             app_globals.schedule_gui_update("speaking_status_text", f"Error: PyAudio failed: {e}")
-            app_globals.done.set() # Signal stop
+            app_globals.request_shutdown() # Signal stop
 
-        # --- WebSocket Setup ---
-        if not app_globals.done.is_set():
+        # --- WebSocket Setup (server VAD only) ---
+        if use_local_vad:
+            app_globals.ws_instance_global = None
+            print("🎙️ [LOCAL_VAD] Using on-device VAD. Realtime WebSocket session not started.")
+        elif not app_globals.done.is_set():
             ws_header = {"api-key": config.AZ_OPENAI_KEY}
             
             app_globals.ws_instance_global = websocket.WebSocketApp(
@@ -566,10 +595,9 @@ class App(customtkinter.CTk):
             self.ws_thread = threading.Thread(target=app_globals.ws_instance_global.run_forever, daemon=True)
             self.ws_thread.start()
 
-        # --- Core Loop (monitor done flag) ---
+        # --- Core Loop (block until shutdown is requested) ---
         try:
-            while not app_globals.done.is_set():
-                time.sleep(0.5)
+            app_globals.done.wait()
         except Exception as e:
             pass
         finally:
@@ -598,10 +626,15 @@ class App(customtkinter.CTk):
             self.stream = None
 
         # Signal worker threads to stop by putting None in their input queues
-        app_globals.scribe_to_translator_llm_queue.put(None) 
+        app_globals.audio_uplink_queue.put(None)
+        app_globals.final_scribe_request_queue.put(None)
+        app_globals.scribe_to_translator_llm_queue.put(None)  # The translator forwards it to TTS, TTS to playback
 
         threads_to_join = [
+            (self.audio_uplink_thread, "Audio Uplink Sender"),
+            (self.local_vad_thread, "Local VAD"),
             (self.periodic_scribe_thread, "Periodic Scribe"),
+            (self.final_scribe_thread, "Final Scribe"),
             (self.translator_agent_thread, "Translator LLM Agent"),
             (self.tts_thread, "TTS Worker"),
             (self.playback_thread, "Playback Worker")
@@ -613,7 +646,7 @@ class App(customtkinter.CTk):
 
     def stop_translation_session(self):
         """Stop the translation session."""
-        app_globals.done.set() # Signal all threads and loops to stop
+        app_globals.request_shutdown() # Signal all threads and loops to stop
 
     def reset_gui_after_stop(self):
         """Reset the GUI state after stopping a translation session."""
@@ -632,7 +665,7 @@ class App(customtkinter.CTk):
     def on_closing(self):
         """Handle window close event."""
         if self.core_logic_thread and self.core_logic_thread.is_alive():
-            app_globals.done.set()
+            app_globals.request_shutdown()
             self.core_logic_thread.join(timeout=10) # Wait for core logic to clean up
         
         if pygame.mixer.get_init():
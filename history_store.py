@@ -0,0 +1,109 @@
+"""Bounded text histories and token budgeting for the translator LLM context."""
+
+import math
+from collections import deque
+from typing import List, NamedTuple
+
+
+def estimate_tokens(text: str, chars_per_token: float) -> int:
+    """Rough token count for `text` (no tokenizer dependency; ~4 chars/token for Latin scripts)."""
+    return math.ceil(len(text) / chars_per_token) if text else 0
+
+
+class TextHistory:
+    """
+    Append-only list of text entries capped at `max_chars` in total.
+
+    Backed by a deque with a running character count, so appending and evicting
+    the oldest entries are O(1) (unlike `list.pop(0)`). Not thread-safe on its
+    own; callers hold the history's lock from `globals`.
+    """
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._entries = deque()
+        self._total_chars = 0
+
+    @property
+    def total_chars(self) -> int:
+        """Characters currently held across all entries."""
+        return self._total_chars
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __getitem__(self, index: int) -> str:
+        return self._entries[index]
+
+    def append(self, text: str):
+        """Add an entry, evicting the oldest ones until the total fits in `max_chars` (the newest always stays)."""
+        self._entries.append(text)
+        self._total_chars += len(text)
+        while self._total_chars > self.max_chars and len(self._entries) > 1:
+            self._total_chars -= len(self._entries.popleft())
+
+    def clear(self):
+        self._entries.clear()
+        self._total_chars = 0
+
+
+class TranslatorContext(NamedTuple):
+    """The fragments and histories selected for one translator request."""
+    recent_fragments: List[str]
+    native_history: List[str]
+    translated_history: List[str]
+    estimated_tokens: int
+
+
+def _newest_within_budget(entries, token_budget: int, chars_per_token: float) -> tuple[List[str], int]:
+    """Return the newest entries (in original order) whose estimated tokens fit in `token_budget`, and their cost."""
+    selected = []
+    used_tokens = 0
+    for entry in reversed(entries):
+        entry_tokens = estimate_tokens(entry, chars_per_token)
+        if used_tokens + entry_tokens > token_budget:
+            break
+        selected.append(entry)
+        used_tokens += entry_tokens
+    selected.reverse()
+    return selected, used_tokens
+
+
+def select_translator_context(recent_fragments, native_history, translated_history,
+                              token_budget: int, chars_per_token: float) -> TranslatorContext:
+    """
+    Fit the translator's volatile context into a per-request token budget.
+
+    The recent fragments are what must be translated, so they are filled first
+    (newest first; the newest fragment is always kept). The remainder is shared
+    evenly by the two histories, newest entries first, and budget one history
+    does not need goes to the other.
+
+    Args:
+        recent_fragments: Scribe fragments, oldest first.
+        native_history: Source-language segments already processed, oldest first.
+        translated_history: Target-language text already spoken, oldest first.
+        token_budget: Estimated tokens available for all three together.
+        chars_per_token: Characters per token used for the estimate.
+
+    Returns:
+        TranslatorContext: The selected lists (oldest first) and their estimated token count.
+    """
+    recent_fragments = list(recent_fragments)
+    fragments, fragment_tokens = _newest_within_budget(recent_fragments, token_budget, chars_per_token)
+    if not fragments and recent_fragments:
+        fragments = recent_fragments[-1:]
+        fragment_tokens = estimate_tokens(fragments[0], chars_per_token)
+
+    history_budget = max(0, token_budget - fragment_tokens)
+    translated_share = history_budget // 2
+    translated, translated_tokens = _newest_within_budget(translated_history, translated_share, chars_per_token)
+    native, native_tokens = _newest_within_budget(native_history, history_budget - translated_tokens, chars_per_token)
+    if native_tokens < history_budget - translated_share:
+        # The native history did not need its share; give the rest back to the translated history
+        translated, translated_tokens = _newest_within_budget(translated_history, history_budget - native_tokens, chars_per_token)
+
+    return TranslatorContext(fragments, native, translated, fragment_tokens + native_tokens + translated_tokens)
@@ -0,0 +1,98 @@
+"""Adaptive tuning of the periodic Scribe interval from observed pipeline latency."""
+
+import threading
+
+
+class AdaptiveIntervalController:
+    """
+    Chooses the periodic Scribe interval from measured latencies and backlog.
+
+    The interval is kept long enough that:
+      * Scribe keeps up: with `max_in_flight` concurrent requests, chunks cannot be
+        produced faster than one every `scribe_rtt / max_in_flight` seconds (times `headroom`);
+      * the translator keeps up: producing fragments faster than one LLM call takes
+        only grows the translator's backlog.
+    A translator backlog stretches the interval further, and every update
+    moves at most halfway towards the new target so a single slow response does
+    not make the interval jump. The result is clamped to [min_interval_s, max_interval_s].
+    """
+
+    def __init__(self,
+                 initial_interval_s: float,
+                 min_interval_s: float,
+                 max_interval_s: float,
+                 max_in_flight: int,
+                 headroom: float = 1.5,
+                 backlog_factor: float = 0.5,
+                 smoothing: float = 0.3):
+        self.min_interval_s = min_interval_s
+        self.max_interval_s = max_interval_s
+        self.max_in_flight = max(1, max_in_flight)
+        self.headroom = headroom
+        self.backlog_factor = backlog_factor
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._initial_interval_s = self._clamp(initial_interval_s)
+        self.reset()
+
+    def reset(self):
+        """Return to the initial interval and forget all observations."""
+        with self._lock:
+            self._interval_s = self._initial_interval_s
+            self._scribe_rtt_s = None
+            self._translator_time_s = None
+
+    @property
+    def interval_s(self) -> float:
+        """Currently chosen interval in seconds."""
+        return self._interval_s
+
+    @property
+    def scribe_rtt_s(self) -> float | None:
+        """Smoothed Scribe round-trip time, if any has been observed."""
+        return self._scribe_rtt_s
+
+    @property
+    def translator_time_s(self) -> float | None:
+        """Smoothed translator LLM processing time, if any has been observed."""
+        return self._translator_time_s
+
+    def observe_scribe_rtt(self, rtt_s: float):
+        """Record the round-trip time of one periodic Scribe request."""
+        with self._lock:
+            self._scribe_rtt_s = self._smooth(self._scribe_rtt_s, rtt_s)
+
+    def observe_translator_time(self, processing_time_s: float):
+        """Record how long one translator LLM call took."""
+        with self._lock:
+            self._translator_time_s = self._smooth(self._translator_time_s, processing_time_s)
+
+    def update(self, translator_queue_depth: int) -> float:
+        """
+        Recompute the interval from the latest observations.
+
+        Args:
+            translator_queue_depth: Transcriptions waiting for the translator LLM agent.
+
+        Returns:
+            float: The new interval in seconds.
+        """
+        with self._lock:
+            if self._scribe_rtt_s is None and self._translator_time_s is None:
+                return self._interval_s
+            target_s = max(
+                (self._scribe_rtt_s or 0.0) * self.headroom / self.max_in_flight,
+                self._translator_time_s or 0.0
+            )
+            target_s *= 1.0 + self.backlog_factor * max(0, translator_queue_depth)
+            target_s = self._clamp(target_s)
+            self._interval_s = self._clamp(self._interval_s + 0.5 * (target_s - self._interval_s))
+            return self._interval_s
+
+    def _smooth(self, previous: float | None, sample: float) -> float:
+        if previous is None:
+            return sample
+        return previous + self.smoothing * (sample - previous)
+
+    def _clamp(self, interval_s: float) -> float:
+        return min(self.max_interval_s, max(self.min_interval_s, interval_s))
@@ -0,0 +1,123 @@
+"""PCM jitter buffer between the playback worker and a callback-driven output stream."""
+
+import threading
+import time
+from collections import deque
+
+
+class PcmJitterBuffer:
+    """
+    FIFO of PCM bytes, written by the playback worker and read by the audio callback.
+
+    The reader never blocks: missing audio is replaced by silence. After the
+    buffer has run dry, output resumes only once `prebuffer_ms` of audio is
+    queued (or the segment being written has ended), so network jitter in a
+    streamed segment causes one short pause instead of many clicks. Running
+    dry while a segment is still being written counts as an underrun; running
+    dry after `end_segment()` is just the end of speech.
+
+    Writers block while more than `max_buffer_ms` is queued, which paces the
+    playback worker at real time. Thread-safe.
+    """
+
+    def __init__(self, sample_rate: int, bytes_per_frame: int, prebuffer_ms: int, max_buffer_ms: int):
+        self.bytes_per_frame = bytes_per_frame
+        self.bytes_per_ms = sample_rate * bytes_per_frame / 1000
+        self.prebuffer_bytes = int(prebuffer_ms * self.bytes_per_ms)
+        self.max_buffer_bytes = max(int(max_buffer_ms * self.bytes_per_ms), self.prebuffer_bytes)
+        self._condition = threading.Condition()
+        self._chunks = deque()
+        self._read_offset = 0  # Bytes of _chunks[0] already played
+        self._buffered_bytes = 0
+        self._segment_open = False  # A segment is being written and has not ended
+        self._pending_byte_count = 0  # Bytes written in the open segment, to keep whole frames
+        self._prebuffering = True
+        self._closed = False
+        self.underrun_count = 0
+        self.playing = False  # True while the last read produced audio
+
+    @property
+    def buffered_ms(self) -> float:
+        return self._buffered_bytes / self.bytes_per_ms
+
+    def write(self, pcm: bytes) -> bool:
+        """Queue PCM for playback, waiting while the buffer is full; returns False once closed."""
+        if not pcm:
+            return not self._closed
+        with self._condition:
+            self._segment_open = True
+            while self._buffered_bytes >= self.max_buffer_bytes and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                return False
+            self._chunks.append(bytes(pcm))
+            self._buffered_bytes += len(pcm)
+            self._pending_byte_count += len(pcm)
+            return True
+
+    def end_segment(self):
+        """Mark the end of the audio being written, so the rest plays without waiting for prebuffering."""
+        with self._condition:
+            partial_frame = self._pending_byte_count % self.bytes_per_frame
+            if partial_frame and self._chunks:
+                # A split frame would shift every later sample by one byte; pad it to a whole frame
+                self._chunks.append(bytes(self.bytes_per_frame - partial_frame))
+                self._buffered_bytes += self.bytes_per_frame - partial_frame
+            self._pending_byte_count = 0
+            self._segment_open = False
+
+    def read_into(self, out) -> int:
+        """Fill the writable buffer `out` (audio callback side); returns the bytes of real audio copied."""
+        wanted = len(out)
+        copied = 0
+        with self._condition:
+            if self._prebuffering and self._buffered_bytes < self.prebuffer_bytes and self._segment_open:
+                out[:] = bytes(wanted)
+                self.playing = False
+                return 0
+            self._prebuffering = False
+            while copied < wanted and self._chunks:
+                chunk = self._chunks[0]
+                take = min(len(chunk) - self._read_offset, wanted - copied)
+                out[copied:copied + take] = chunk[self._read_offset:self._read_offset + take]
+                copied += take
+                self._read_offset += take
+                if self._read_offset == len(chunk):
+                    self._chunks.popleft()
+                    self._read_offset = 0
+            self._buffered_bytes -= copied
+            if copied < wanted:
+                out[copied:] = bytes(wanted - copied)
+                if self._segment_open and (copied > 0 or self.playing):  # Ran dry mid-segment
+                    self.underrun_count += 1
+                self._prebuffering = True
+            self.playing = copied > 0
+            self._condition.notify_all()
+        return copied
+
+    def wait_until_drained(self, timeout: float | None = None) -> bool:
+        """Wait until everything written has been played (or the buffer is closed)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._buffered_bytes > 0 and not self._closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def clear(self):
+        """Drop everything queued."""
+        with self._condition:
+            self._chunks.clear()
+            self._read_offset = 0
+            self._buffered_bytes = 0
+            self._pending_byte_count = 0
+            self._prebuffering = True
+            self._condition.notify_all()
+
+    def close(self):
+        """Release blocked writers and waiters; later writes are refused."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
@@ -0,0 +1,167 @@
+"""Playback latency SLO: what to do with segments that would play too late, and the lag record."""
+
+import csv
+import time
+from collections import deque
+
+import numpy as np
+
+PLAY = "play"
+SKIP = "skip"
+COMPRESS = "compress"
+
+
+def choose_lag_action(lag_s: float, max_lag_s: float, skip_lag_s: float, policy: str) -> str:
+    """
+    Decide how to play a segment that is `lag_s` behind.
+
+    Within `max_lag_s` the segment plays as is. Beyond it the configured
+    `policy` applies ("skip" or "compress"; "off" always plays). Beyond
+    `skip_lag_s` the segment is skipped whatever the policy, since no amount
+    of compression brings it back in time.
+    """
+    if policy == "off" or lag_s <= max_lag_s:
+        return PLAY
+    if lag_s > skip_lag_s or policy == SKIP:
+        return SKIP
+    return COMPRESS
+
+
+def compress_pauses(pcm: bytes, sample_rate: int, max_pause_ms: int, silence_threshold: int,
+                    frame_ms: int = 10) -> bytes:
+    """
+    Shorten every pause in 16-bit mono `pcm` to at most `max_pause_ms`.
+
+    Frames of `frame_ms` whose mean absolute amplitude is below
+    `silence_threshold` are silent; only the first `max_pause_ms` of each run
+    of silent frames is kept, including leading and trailing silence. Speech
+    is untouched, so this is the cheapest catch-up there is: TTS output
+    routinely carries a few hundred milliseconds of silence at its edges and
+    between sentences.
+    """
+    compressor = PauseCompressor(sample_rate, max_pause_ms, silence_threshold, frame_ms)
+    return compressor.process(pcm) + compressor.flush()
+
+
+class PauseCompressor:
+    """
+    `compress_pauses` for audio that is still streaming in.
+
+    `process()` accepts any byte count and returns the whole frames decided so
+    far; a pause that spans several chunks is shortened as one. `flush()`
+    returns what is left and resets. Not thread-safe.
+    """
+
+    def __init__(self, sample_rate: int, max_pause_ms: int, silence_threshold: int, frame_ms: int = 10):
+        self.frame_bytes = max(1, sample_rate * frame_ms // 1000) * 2
+        self.max_pause_frames = max(1, max_pause_ms // frame_ms)
+        self.silence_threshold = silence_threshold
+        self.removed_bytes = 0
+        self.reset()
+
+    def reset(self):
+        self._carry = b""
+        self._pause_frames = 0  # Silent frames in a row up to the end of the last processed frame
+
+    def process(self, pcm: bytes) -> bytes:
+        pcm = self._carry + pcm
+        frame_count = len(pcm) // self.frame_bytes
+        self._carry = pcm[frame_count * self.frame_bytes:]
+        if frame_count == 0:
+            return b""
+        frames = np.frombuffer(pcm, dtype=np.int16, count=frame_count * self.frame_bytes // 2).reshape(frame_count, -1)
+        silent = np.abs(frames.astype(np.int32)).mean(axis=1) < self.silence_threshold
+
+        # Position of each frame within its run of silent frames (1-based, continuing the previous chunk's run);
+        # 0 for speech frames
+        frame_indices = np.arange(frame_count)
+        last_speech_index = np.maximum.accumulate(np.where(silent, -1 - self._pause_frames, frame_indices))
+        position_in_pause = frame_indices - last_speech_index
+        keep = ~silent | (position_in_pause <= self.max_pause_frames)
+        self._pause_frames = int(position_in_pause[-1]) if silent[-1] else 0
+
+        self.removed_bytes += int(frame_count - np.count_nonzero(keep)) * self.frame_bytes
+        return frames[keep].tobytes()
+
+    def flush(self) -> bytes:
+        """The partial frame at the end, unless it falls in a pause that is being cut."""
+        rest = self._carry[:len(self._carry) - len(self._carry) % 2]
+        if self._pause_frames > self.max_pause_frames:
+            self.removed_bytes += len(rest)
+            rest = b""
+        self.reset()
+        return rest
+
+
+class PlaybackLagTracker:
+    """
+    How far playback runs behind: how much later each piece of audio starts than it could have.
+
+    An answer (one text to speak, whether split into sub-segments or streamed
+    clause by clause) could at best start as soon as its first audio is ready
+    and then play its pieces back to back, each no earlier than it is ready.
+    A piece's lag is how much later it actually starts: the time it waited for
+    other answers' audio. Playing the answer's own earlier audio is not lag,
+    however long the answer is, and neither is waiting for audio that was not
+    synthesized yet. Used by the playback worker only.
+    """
+
+    def __init__(self):
+        self._answers = {}  # {answer_id: [earliest start of its next piece, earliest start of the piece playing]}
+
+    def lag_s(self, answer_id: int, ready_at: float, start_at: float) -> float:
+        """Lag of a piece of `answer_id` that was ready at `ready_at` and starts playing at `start_at`."""
+        answer = self._answers.setdefault(answer_id, [ready_at, ready_at])
+        answer[1] = max(ready_at, answer[0])
+        return max(0.0, start_at - answer[1])
+
+    def played(self, answer_id: int, duration_s: float):
+        """Record that the piece whose lag was taken last played (or was written to the output) for `duration_s`."""
+        if answer_id in self._answers:
+            answer = self._answers[answer_id]
+            answer[0] = answer[1] + duration_s
+
+    def reset(self):
+        """Forget all answers (segment ids restart with a new session)."""
+        self._answers.clear()
+
+    def forget_answers_before(self, answer_id: int):
+        for finished_id in [known_id for known_id in self._answers if known_id < answer_id]:
+            del self._answers[finished_id]
+
+
+class LagRecorder:
+    """
+    Record of playback lag over time: recent samples in memory, optionally also appended to a CSV file.
+
+    Each sample is (unix time, segment_id, sub_index, lag_s, action). Written by the playback worker only.
+    """
+
+    def __init__(self, history_size: int, csv_path: str | None = None):
+        self.history = deque(maxlen=history_size)
+        self.csv_path = csv_path
+        self._csv_file = None
+        self._csv_writer = None
+
+    def record(self, segment_id: int, sub_index: int, lag_s: float, action: str):
+        sample = (time.time(), segment_id, sub_index, round(lag_s, 3), action)
+        self.history.append(sample)
+        if self.csv_path is None:
+            return
+        try:
+            if self._csv_writer is None:
+                self._csv_file = open(self.csv_path, "a", newline="", encoding="utf-8")
+                self._csv_writer = csv.writer(self._csv_file)
+                if self._csv_file.tell() == 0:
+                    self._csv_writer.writerow(("unix_time", "segment_id", "sub_index", "lag_s", "action"))
+            self._csv_writer.writerow(sample)
+            self._csv_file.flush()
+        except OSError as e:
+            print(f"⚠️ [PLAYBACK_WORKER] Could not export lag to {self.csv_path} ({e}). Keeping it in memory only.")
+            self.csv_path = None
+
+    def close(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
@@ -0,0 +1,207 @@
+"""Incremental parsing of the translator LLM's streamed JSON decision into speakable clauses."""
+
+import json
+
+from tts_segmenter import next_clause_end
+
+_WHITESPACE = " \t\r\n"
+_SIMPLE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+
+
+class StreamingTranslationParser:
+    """
+    Consumes the translator's JSON object as it streams in and releases `text_to_speak` clause by clause.
+
+    Only the top-level object is interpreted. String values are decoded as their
+    characters arrive (escapes included), scalar values when their terminator
+    arrives. Text is only released once `should_speak` is known to be true; if
+    the model writes `text_to_speak` first, it is held until the decision arrives.
+
+    Usage:
+        parser = StreamingTranslationParser(min_clause_chars=30, language_code="pt")
+        for delta in stream:
+            for clause in parser.feed(delta): speak(clause)
+        for clause in parser.finish(): speak(clause)
+    """
+
+    def __init__(self, min_clause_chars: int, language_code: str, speech_key: str = "text_to_speak",
+                 decision_key: str = "should_speak"):
+        self.min_clause_chars = min_clause_chars
+        self.language_code = language_code  # Of the speech text, for abbreviations that do not end a clause
+        self.speech_key = speech_key
+        self.decision_key = decision_key
+        self.fields = {}  # Completed top-level values, by key
+        self._raw = ""
+        self._index = 0
+        self._state = "object_start"
+        self._key = None
+        self._value_chars = []
+        self._nested_depth = 0
+        self._nested_in_string = False
+        self._nested_escape = False
+        self._pending_speech = ""  # Decoded speech text not yet released as a clause
+
+    @property
+    def should_speak(self) -> bool | None:
+        """The decision once it has streamed in, else None."""
+        decision = self.fields.get(self.decision_key)
+        return None if decision is None else bool(decision)
+
+    @property
+    def is_complete(self) -> bool:
+        """True once the closing brace of the object has been parsed."""
+        return self._state == "done"
+
+    def feed(self, delta: str) -> list[str]:
+        """Parse a streamed delta and return the clauses that became ready to speak."""
+        self._raw += delta
+        self._parse()
+        return self._take_clauses(final=False)
+
+    def finish(self) -> list[str]:
+        """Return the remaining speech text once the stream has ended."""
+        return self._take_clauses(final=True)
+
+    def _take_clauses(self, final: bool) -> list[str]:
+        if self.should_speak is not True:
+            if self.should_speak is False:
+                self._pending_speech = ""
+            return []
+        clauses = []
+        while not final:
+            clause_end = next_clause_end(self._pending_speech, self.language_code, self.min_clause_chars)
+            if clause_end is None:
+                break
+            clauses.append(self._pending_speech[:clause_end].strip())
+            self._pending_speech = self._pending_speech[clause_end:]
+        if final and self._pending_speech.strip():
+            clauses.append(self._pending_speech.strip())
+            self._pending_speech = ""
+        return clauses
+
+    def _parse(self):
+        raw = self._raw
+        while self._index < len(raw) and self._state != "done":
+            char = raw[self._index]
+            state = self._state
+
+            if state == "object_start":
+                if char == "{":
+                    self._state = "key_or_end"
+                self._index += 1
+            elif state == "key_or_end":
+                if char == '"':
+                    self._state = "key"
+                    self._value_chars = []
+                elif char == "}":
+                    self._state = "done"
+                self._index += 1
+            elif state == "colon":
+                if char == ":":
+                    self._state = "value_start"
+                self._index += 1
+            elif state == "value_start":
+                if char in _WHITESPACE:
+                    self._index += 1
+                elif char == '"':
+                    self._state = "string_value"
+                    self._value_chars = []
+                    self._index += 1
+                elif char in "{[":
+                    self._state = "nested_value"
+                    self._value_chars = []
+                    self._nested_depth = 0
+                    self._nested_in_string = False
+                    self._nested_escape = False
+                else:
+                    self._state = "scalar_value"
+                    self._value_chars = []
+            elif state in ("key", "string_value"):
+                if char == '"':
+                    text = "".join(self._value_chars)
+                    if state == "key":
+                        self._key = text
+                        self._state = "colon"
+                    else:
+                        self.fields[self._key] = text
+                        self._state = "key_or_end"
+                    self._index += 1
+                    continue
+                if char == "\\":
+                    decoded, consumed = self._decode_escape(raw, self._index)
+                    if consumed == 0:
+                        return  # Escape sequence split across deltas; wait for the rest
+                    self._index += consumed
+                else:
+                    decoded = char
+                    self._index += 1
+                self._value_chars.append(decoded)
+                if state == "string_value" and self._key == self.speech_key:
+                    self._pending_speech += decoded
+            elif state == "scalar_value":
+                if char in _WHITESPACE or char in ",}":
+                    self._store_json_value("".join(self._value_chars))
+                    self._state = "done" if char == "}" else "key_or_end"
+                else:
+                    self._value_chars.append(char)
+                self._index += 1
+            elif state == "nested_value":
+                self._value_chars.append(char)
+                self._index += 1
+                if self._nested_in_string:
+                    if self._nested_escape:
+                        self._nested_escape = False
+                    elif char == "\\":
+                        self._nested_escape = True
+                    elif char == '"':
+                        self._nested_in_string = False
+                elif char == '"':
+                    self._nested_in_string = True
+                elif char in "{[":
+                    self._nested_depth += 1
+                elif char in "}]":
+                    self._nested_depth -= 1
+                    if self._nested_depth == 0:
+                        self._store_json_value("".join(self._value_chars))
+                        self._state = "key_or_end"
+
+    def _store_json_value(self, value_text: str):
+        try:
+            self.fields[self._key] = json.loads(value_text)
+        except json.JSONDecodeError:
+            self.fields[self._key] = None
+
+    @staticmethod
+    def _decode_escape(raw: str, index: int) -> tuple[str, int]:
+        """
+        Decode the escape sequence at raw[index]; returns (text, chars consumed), or ("", 0) if incomplete.
+
+        An invalid escape ("\\x", "\\u12G4") is kept as written instead of failing
+        the stream, since earlier clauses of it may already have been spoken.
+        """
+        if index + 1 >= len(raw):
+            return "", 0
+        escape_char = raw[index + 1]
+        if escape_char != "u":
+            return _SIMPLE_ESCAPES.get(escape_char, raw[index:index + 2]), 2
+        if index + 6 > len(raw):
+            return "", 0
+        code_unit = _parse_code_unit(raw[index + 2:index + 6])
+        if code_unit is None:
+            return raw[index:index + 2], 2
+        if 0xD800 <= code_unit <= 0xDBFF:
+            # High surrogate: decode together with the following low surrogate escape
+            if index + 12 > len(raw):
+                return "", 0
+            low_unit = _parse_code_unit(raw[index + 8:index + 12]) if raw[index + 6:index + 8] == "\\u" else None
+            if low_unit is not None and 0xDC00 <= low_unit <= 0xDFFF:
+                return chr(0x10000 + ((code_unit - 0xD800) << 10) + (low_unit - 0xDC00)), 12
+        return chr(code_unit), 6
+
+
+def _parse_code_unit(hex_digits: str) -> int | None:
+    """The UTF-16 code unit of a \\uXXXX escape's four hex digits, or None if they are not hex"""
+    if len(hex_digits) != 4 or any(digit not in _HEX_DIGITS for digit in hex_digits):
+        return None
+    return int(hex_digits, 16)
@@ -1,64 +1,34 @@
 import json
-from typing import List, Dict, Any
+import threading
+from functools import lru_cache
+from typing import List, Dict, Any, Callable
 
 import config as config
+import globals as app_globals
+from llm_stream_parser import StreamingTranslationParser
+from history_store import estimate_tokens
 
-def llm_translate_and_decide_speech(
-    recent_scribe_fragments: List[str],
-    current_translated_speech_history: List[str],
-    current_native_speech_history_processed_by_llm: List[str]
-) -> Dict[str, Any]:
+@lru_cache(maxsize=8)
+def _compile_system_prompt(input_language_name: str, output_language_name: str) -> str:
     """
-    Uses an LLM to analyze recent Scribe transcriptions, decide if there's new content
-    to translate and speak, and provide the translation.
-
-    Args:
-        recent_scribe_fragments: A list of the most recent Scribe transcription strings.
-        current_translated_speech_history: List of what the translator has already said (target language).
-        current_native_speech_history_processed_by_llm: List of what the LLM has already processed from source language.
+    Build the translator system prompt for a language pair.
 
-    Returns:
-        A dictionary with the LLM's decision:
-        {
-            "should_speak": bool,
-            "text_to_speak": str,  // Translated text if should_speak is true, else ""
-            "newly_transcribed_segment_processed": str, // The original language segment LLM processed
-            "initial_untrimmed_translation": str, // Translation before continuity trimming
-            "continuity_trim_applied": bool // Whether continuity trimming was applied
-        }
+    Cached, so every request for the pair sends a byte-identical system message.
+    Azure/OpenAI prompt caching only applies to an exact, unchanged request prefix.
     """
-    default_error_response = {
-        "should_speak": False,
-        "text_to_speak": "",
-        "newly_transcribed_segment_processed": "[LLM Error]",
-        "initial_untrimmed_translation": "[LLM Error]",
-        "continuity_trim_applied": False
-    }
-
-    if not config.client_az_llm:
-        print("⚠️ [TRANSLATOR_LLM] Azure LLM client not initialized.")
-        return default_error_response
-
-    if not recent_scribe_fragments:
-        return {"should_speak": False, "text_to_speak": "", "newly_transcribed_segment_processed": "", "initial_untrimmed_translation": "", "continuity_trim_applied": False}
-
-    system_prompt = f"""You are an expert real-time simultaneous interpreter, embodying the highest professional standards.
-Your primary language pair is {config.INPUT_LANGUAGE_NAME_FOR_PROMPT} (source) to {config.OUTPUT_LANGUAGE_NAME_FOR_PROMPT} (target).
+    return f"""You are an expert real-time simultaneous interpreter, embodying the highest professional standards.
+Your primary language pair is {input_language_name} (source) to {output_language_name} (target).
 
 # Core Responsibilities & Qualities:
 1.  **Accuracy & Fidelity**: Your translation must accurately and faithfully convey the full meaning, intent, and nuances of the original speaker for the identified new segment. Do not add, omit, or distort information.
-2.  **Natural Fluency**: The translated output in {config.OUTPUT_LANGUAGE_NAME_FOR_PROMPT} must be fluent, grammatically correct, and sound natural, as a professional human interpreter would produce. Avoid overly literal or stilted phrasing.
+2.  **Natural Fluency**: The translated output in {output_language_name} must be fluent, grammatically correct, and sound natural, as a professional human interpreter would produce. Avoid overly literal or stilted phrasing.
 3.  **Narrative Coherence**: Your translations must maintain the logical flow of ideas across segments. Each translation should connect meaningfully with previous ones to form a coherent narrative, not just isolated phrases.
 4.  **Contextual Awareness**: Actively use the accumulated context from previous translations to inform your current translation. If the new segment refers back to concepts mentioned earlier, ensure your translation maintains these references coherently.
 5.  **Impartiality & Neutrality**: Maintain strict impartiality. Your role is to be a clear and unbiased conduit. Do not interject personal opinions or alter the speaker's message.
 6.  **Tone & Emotion Preservation**: If the tone (formal, informal, urgent) or emotion (excitement, concern) is evident, strive to reflect this appropriately in the translated language while maintaining accuracy.
 7.  **Completeness & Semantic Integrity**: Focus on translating NEW, SEMANTICALLY COMPLETE segments of speech. A segment is semantically complete when it expresses a complete thought that contributes meaningfully to the overall narrative, even if grammatically it might be a fragment or incomplete sentence in some contexts.
 8.  **Robustness to STT Imperfections**: Understand that the input transcriptions are generated by a Speech-to-Text (STT) model and may contain errors (e.g., misheard words, incorrect phrasing). As a skilled interpreter, adapt to these inaccuracies. If a transcription seems unusual, try to infer the speaker's most probable intended meaning based on context and common speech patterns.
-9.  **Seamless Continuity in Translation**: CRITICAL: Your `text_to_speak` output MUST connect seamlessly with the `translated_speech_history`.
-    *   After generating an `initial_translation` for the `newly_transcribed_segment_processed`, compare the beginning of this `initial_translation` with the ending phrases of the *last string entry* in the `translated_speech_history` list.
-    *   If the beginning of your `initial_translation` is an EXACT or VERY CLOSE SEMANTIC REPETITION of the ending of the previous `text_to_speak`, your final `text_to_speak` MUST be the portion that *comes after* the redundant part.
-    *   The goal is to absolutely avoid audible repetition while maintaining a smooth narrative.
-    *   Example: If `translated_speech_history`'s last entry ends with "...the big cat" and your `initial_translation` is "The big cat sat on the mat", the final `text_to_speak` MUST become "sat on the mat."
+9.  **Seamless Continuity in Translation**: Your `text_to_speak` output MUST connect seamlessly with the `translated_speech_history`. Words that repeat the end of the last spoken entry are removed automatically after you answer, so translate the whole new segment and do not trim it yourself.
 
 # Additional Instructions:
 - **Exclude Sounds, Numbers, and Onomatopoeias**: Your translation must not include sounds (e.g., "uh", "ah") or onomatopoeias (e.g., "boom", "splash").
@@ -67,12 +37,12 @@ Your primary language pair is {config.INPUT_LANGUAGE_NAME_FOR_PROMPT} (source) t
 
 # Input Analysis:
 You will receive:
-1.  `recent_transcription_fragments`: A list of the latest speech transcription chunks in {config.INPUT_LANGUAGE_NAME_FOR_PROMPT}.
+1.  `recent_transcription_fragments`: A list of the latest speech transcription chunks in {input_language_name}.
     *   These are outputs from an STT model and may not be perfect representations of the spoken audio.
     *   **Important Note on Fragment Overlaps**: These fragments represent ongoing speech. Due to the way audio is captured and processed, a new fragment might include text that rephrases, refines, or repeats parts of a previous fragment.
     *   Your critical task is to use `native_speech_history_processed_by_llm` to identify only the *genuinely new semantic information* while maintaining narrative coherence.
-2.  `native_speech_history_processed_by_llm`: A list of {config.INPUT_LANGUAGE_NAME_FOR_PROMPT} text segments that you have ALREADY identified as complete and processed. Use this to determine what is genuinely new.
-3.  `translated_speech_history`: A list of what has ALREADY been spoken/translated into {config.OUTPUT_LANGUAGE_NAME_FOR_PROMPT}. Use this to ensure continuity and avoid audible repetition.
+2.  `native_speech_history_processed_by_llm`: A list of {input_language_name} text segments that you have ALREADY identified as complete and processed. Use this to determine what is genuinely new.
+3.  `translated_speech_history`: A list of what has ALREADY been spoken/translated into {output_language_name}. Use this to ensure continuity and avoid audible repetition.
 
 # Your Task:
 1.  **Identify New, Complete Segment**:
@@ -89,16 +59,12 @@ You will receive:
     *   **Step 5: Final Decision**: If no semantically complete segment can be extracted (it's all fragmentary or redundant with history), then `newly_transcribed_segment_processed` should be an empty string.
 
 2.  **Translate with Narrative Consistency**:
-    *   If a valid `newly_transcribed_segment_processed` is identified, translate it into {config.OUTPUT_LANGUAGE_NAME_FOR_PROMPT} with special attention to how it fits into the overall narrative established in `translated_speech_history`.
+    *   If a valid `newly_transcribed_segment_processed` is identified, translate it into {output_language_name} with special attention to how it fits into the overall narrative established in `translated_speech_history`.
     *   Your translation should not only be accurate to the source segment but should also:
         *   Maintain consistent terminology for key concepts mentioned previously
         *   Use appropriate referential expressions (pronouns, demonstratives) that clearly connect to previously established entities
         *   Preserve the logical relationship between this segment and previous ones (causality, contrast, elaboration, etc.)
-    *   This is your `initial_untrimmed_translation`.
-    *   **Refine for Continuity**: Compare the beginning of `initial_untrimmed_translation` with the end of the last spoken text in `translated_speech_history`.
-    *   If there is repetition of what was just said, remove the repeated portion to produce the `text_to_speak`. Set `continuity_trim_applied` to `true`.
-    *   If no trim is needed, `text_to_speak` will be the same as `initial_untrimmed_translation`. Set `continuity_trim_applied` to `false`.
-    *   The `text_to_speak` should ONLY contain the truly new part of the translation needed for a flowing narrative.
+    *   This is your `text_to_speak`.
 
 3.  **Decision on Speaking**:
     *   Set `should_speak` to `true` ONLY if:
@@ -109,22 +75,69 @@ You will receive:
         *   `text_to_speak` is so minimal or fragmentary that a professional interpreter would wait for more context before speaking
 
 # Output Format (JSON ONLY):
-Output ONLY a JSON object with the following structure:
+Output ONLY a JSON object with the following structure, with the keys in EXACTLY this order (your output is spoken while it is still being generated, so the decision and the speech must come first):
 ```json
 {{
-  "newly_transcribed_segment_processed": "The segment from transcription fragments (in {config.INPUT_LANGUAGE_NAME_FOR_PROMPT}) that you identified as new and processed. Empty if nothing new was processed or if new content was fragmentary.",
-  "initial_untrimmed_translation": "The translation of `newly_transcribed_segment_processed` into {config.OUTPUT_LANGUAGE_NAME_FOR_PROMPT} BEFORE any continuity trimming. Empty if `newly_transcribed_segment_processed` is empty.",
-  "continuity_trim_applied": boolean, // True if the beginning of `initial_untrimmed_translation` was trimmed for continuity with `translated_speech_history`, false otherwise.
-  "text_to_speak": "The final translated text in {config.OUTPUT_LANGUAGE_NAME_FOR_PROMPT}, AFTER continuity trimming (if any). This is what should be spoken. Empty if `newly_transcribed_segment_processed` is empty or if the entire translation was trimmed.",
-  "should_speak": boolean // True if `text_to_speak` is non-empty AND represents a semantically meaningful addition to the conversation.
+  "should_speak": boolean, // True if `text_to_speak` is non-empty AND represents a semantically meaningful addition to the conversation.
+  "text_to_speak": "The translation of `newly_transcribed_segment_processed` into {output_language_name}. This is what should be spoken. Empty if `newly_transcribed_segment_processed` is empty.",
+  "newly_transcribed_segment_processed": "The segment from transcription fragments (in {input_language_name}) that you identified as new and processed. Empty if nothing new was processed or if new content was fragmentary."
 }}
 ```
 """
 
+
+def llm_translate_and_decide_speech(
+    recent_scribe_fragments: List[str],
+    current_translated_speech_history: List[str],
+    current_native_speech_history_processed_by_llm: List[str],
+    on_speech_chunk: Callable[[str], None] | None = None,
+    cancel_event: threading.Event | None = None
+) -> Dict[str, Any] | None:
+    """
+    Uses an LLM to analyze recent Scribe transcriptions, decide if there's new content
+    to translate and speak, and provide the translation.
+
+    Args:
+        recent_scribe_fragments: A list of the most recent Scribe transcription strings.
+        current_translated_speech_history: List of what the translator has already said (target language).
+        current_native_speech_history_processed_by_llm: List of what the LLM has already processed from source language.
+        on_speech_chunk: Optional callback. When set and LLM_TRANSLATOR_STREAMING_ENABLED is on, the response is
+            streamed and each clause of `text_to_speak` is passed to it as soon as it has been generated
+            (only if `should_speak` is true). All clauses have been delivered by the time this returns.
+        cancel_event: Optional event set by the caller when the answer is no longer wanted. A streamed
+            response is abandoned at the next chunk; a non-streamed one is discarded when it arrives.
+
+    Returns:
+        A dictionary with the LLM's decision:
+        {
+            "should_speak": bool,
+            "text_to_speak": str,  // Translated text if should_speak is true, else ""
+            "newly_transcribed_segment_processed": str // The original language segment LLM processed
+        }
+        or None if the call was cancelled through `cancel_event`.
+        `text_to_speak` is not trimmed for continuity; callers apply continuity_trimmer before TTS.
+    """
+    default_error_response = {
+        "should_speak": False,
+        "text_to_speak": "",
+        "newly_transcribed_segment_processed": "[LLM Error]"
+    }
+
+    if not config.client_az_llm:
+        print("⚠️ [TRANSLATOR_LLM] Azure LLM client not initialized.")
+        return default_error_response
+
+    if not recent_scribe_fragments:
+        return {"should_speak": False, "text_to_speak": "", "newly_transcribed_segment_processed": ""}
+
+    # Compiled once per language pair, so every request starts with the same bytes (provider prompt caching)
+    system_prompt = _compile_system_prompt(config.INPUT_LANGUAGE_NAME_FOR_PROMPT, config.OUTPUT_LANGUAGE_NAME_FOR_PROMPT)
+
+    # Everything volatile goes after the static system prompt, slowest-changing first
     user_payload = {
-        "recent_transcription_fragments": recent_scribe_fragments,
+        "translated_speech_history": current_translated_speech_history,
         "native_speech_history_processed_by_llm": current_native_speech_history_processed_by_llm,
-        "translated_speech_history": current_translated_speech_history
+        "recent_transcription_fragments": recent_scribe_fragments
     }
 
     user_message_json_str = json.dumps(user_payload, ensure_ascii=False)
@@ -145,26 +158,40 @@ Output ONLY a JSON object with the following structure:
         {"role": "user", "content": final_user_content}
     ]
 
+    # Prompt size actually sent on this call (the system prompt is constant per language pair)
+    prompt_chars = len(system_prompt) + len(final_user_content)
+    app_globals.pipeline_metrics["translator_llm_prompt_chars"] = prompt_chars
+    print(f"🧠 [TRANSLATOR_LLM_PROMPT] {prompt_chars} chars (~{estimate_tokens(system_prompt + final_user_content, config.LLM_CHARS_PER_TOKEN)} tokens): "
+          f"{len(recent_scribe_fragments)} fragments, {len(current_native_speech_history_processed_by_llm)} native + "
+          f"{len(current_translated_speech_history)} translated history entries")
+
+    llm_response_content = None
     try:
-        response = config.client_az_llm.chat.completions.create(
-            model=config.AZ_TRANSLATOR_LLM_DEPLOYMENT_NAME,
-            messages=messages,
-            temperature=0.2,
-            max_tokens=250,
-            response_format={"type": "json_object"}
-        )
-        
-        llm_response_content = response.choices[0].message.content
+        if on_speech_chunk is not None and config.LLM_TRANSLATOR_STREAMING_ENABLED:
+            llm_response_content = _stream_translation_response(messages, on_speech_chunk, cancel_event)
+        else:
+            response = config.client_az_llm.chat.completions.create(
+                model=config.AZ_TRANSLATOR_LLM_DEPLOYMENT_NAME,
+                messages=messages,
+                temperature=0.2,
+                max_tokens=250,
+                response_format={"type": "json_object"}
+            )
+            _report_prompt_cache_usage(response.usage)
+            
+            llm_response_content = response.choices[0].message.content
+
+        if cancel_event is not None and cancel_event.is_set():
+            print("🧠 [TRANSLATOR_LLM_CANCELLED] Response superseded before it was used.")
+            return None
 
         if llm_response_content:
             structured_response = json.loads(llm_response_content)
             # Validate expected keys
             if "should_speak" in structured_response and \
                "text_to_speak" in structured_response and \
-               "newly_transcribed_segment_processed" in structured_response and \
-               "initial_untrimmed_translation" in structured_response and \
-               "continuity_trim_applied" in structured_response:
-                print(f"🧠 [TRANSLATOR_LLM_RESULT] Untrimmed: \"{structured_response['initial_untrimmed_translation']}\", TrimApplied: {structured_response['continuity_trim_applied']}, Speak: {structured_response['should_speak']}, Final Text: \"{structured_response['text_to_speak']}\", Processed Original: \"{structured_response['newly_transcribed_segment_processed']}\"")
+               "newly_transcribed_segment_processed" in structured_response:
+                print(f"🧠 [TRANSLATOR_LLM_RESULT] Speak: {structured_response['should_speak']}, Text: \"{structured_response['text_to_speak']}\", Processed Original: \"{structured_response['newly_transcribed_segment_processed']}\"")
                 return structured_response
             else:
                 print(f"⚠️ [TRANSLATOR_LLM_ERROR] LLM response missing required keys. Response: {llm_response_content}")
@@ -179,3 +206,65 @@ Output ONLY a JSON object with the following structure:
     except Exception as e:
         print(f"⚠️ [TRANSLATOR_LLM_ERROR] Error in LLM call: {e} (Type: {type(e).__name__})")
         return default_error_response
+
+
+def _stream_translation_response(messages: List[Dict[str, str]], on_speech_chunk: Callable[[str], None],
+                                 cancel_event: threading.Event | None = None) -> str:
+    """
+    Stream the translator's JSON response, forwarding clauses of `text_to_speak` as they arrive.
+
+    Returns:
+        str: The complete response content, for the same validation as a non-streamed response
+            (partial if `cancel_event` was set; the caller discards it).
+    """
+    stream = config.client_az_llm.chat.completions.create(
+        model=config.AZ_TRANSLATOR_LLM_DEPLOYMENT_NAME,
+        messages=messages,
+        temperature=0.2,
+        max_tokens=250,
+        response_format={"type": "json_object"},
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+
+    parser = StreamingTranslationParser(min_clause_chars=config.LLM_STREAM_MIN_CLAUSE_CHARS,
+                                        language_code=config.TTS_LANGUAGE_CODE)
+    content_parts = []
+    usage = None
+    for chunk in stream:
+        if cancel_event is not None and cancel_event.is_set():
+            stream.close()  # Stop generation instead of paying for the rest of a stale answer
+            return "".join(content_parts)
+        if getattr(chunk, "usage", None):
+            usage = chunk.usage  # Sent in a final chunk without choices
+        if not chunk.choices:  # Azure also sends content-filter results in chunks without choices
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        content_parts.append(delta)
+        for clause in parser.feed(delta):
+            on_speech_chunk(clause)
+
+    if parser.is_complete:
+        # Only a well-formed response may release its trailing clause; a truncated one is discarded
+        for clause in parser.finish():
+            on_speech_chunk(clause)
+    else:
+        print("⚠️ [TRANSLATOR_LLM_STREAM] Response ended before the JSON object was complete.")
+    _report_prompt_cache_usage(usage)
+    return "".join(content_parts)
+
+
+def _report_prompt_cache_usage(usage):
+    """Log and publish how much of the prompt the provider served from its prompt cache."""
+    if usage is None:
+        return
+    prompt_tokens = usage.prompt_tokens or 0
+    prompt_tokens_details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = (getattr(prompt_tokens_details, "cached_tokens", None) or 0) if prompt_tokens_details else 0
+    app_globals.pipeline_metrics["translator_llm_prompt_tokens"] = prompt_tokens
+    app_globals.pipeline_metrics["translator_llm_cached_tokens"] = cached_tokens
+    cached_percent = 100 * cached_tokens / prompt_tokens if prompt_tokens else 0.0
+    print(f"🧠 [TRANSLATOR_LLM_USAGE] Prompt: {prompt_tokens} tokens ({cached_tokens} cached, {cached_percent:.0f}%), "
+          f"Completion: {usage.completion_tokens} tokens")
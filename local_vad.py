@@ -0,0 +1,118 @@
+"""On-device voice activity detection from short-term energy and zero-crossing rate."""
+
+import numpy as np
+
+SPEECH_STARTED = "speech_started"
+SPEECH_STOPPED = "speech_stopped"
+
+
+class EnergyZcrVad:
+    """
+    Streaming energy/zero-crossing-rate VAD for mono 16-bit PCM.
+
+    Audio is split into fixed frames whose RMS level (dBFS) and zero-crossing
+    rate are computed in one vectorized pass per call. A frame counts as speech
+    when its level is above both an absolute floor and an adaptive noise floor,
+    and its zero-crossing rate is low enough to rule out hiss. Loud frames are
+    accepted regardless of zero-crossing rate so fricatives do not end an utterance.
+
+    Events are reported with absolute sample offsets counted from the first
+    sample ever passed to `process`, matching the ring buffer's offsets.
+    """
+
+    def __init__(self,
+                 sample_rate: int,
+                 frame_ms: int = 20,
+                 energy_threshold_db: float = -45.0,
+                 noise_margin_db: float = 10.0,
+                 max_zero_crossing_rate: float = 0.35,
+                 min_speech_ms: int = 100,
+                 silence_timeout_ms: int = 300):
+        self.frame_samples = max(1, int(sample_rate * frame_ms / 1000))
+        self.energy_threshold_db = energy_threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.min_speech_frames = max(1, int(round(min_speech_ms / frame_ms)))
+        self.silence_timeout_frames = max(1, int(round(silence_timeout_ms / frame_ms)))
+        self.reset()
+
+    def reset(self):
+        """Forget all state, including the absolute sample position."""
+        self.noise_floor_db = self.energy_threshold_db - self.noise_margin_db
+        self.in_speech = False
+        self.samples_processed = 0
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._speech_run_frames = 0
+        self._speech_run_start_sample = 0
+        self._silence_run_frames = 0
+        self._last_speech_end_sample = 0
+
+    def process(self, pcm_data: bytes) -> list[tuple[str, int]]:
+        """
+        Feed captured PCM and return the VAD transitions it produced.
+
+        Args:
+            pcm_data: Mono signed 16-bit little-endian PCM.
+
+        Returns:
+            list[tuple[str, int]]: (SPEECH_STARTED | SPEECH_STOPPED, absolute sample offset) pairs.
+                Start offsets point at the first speech frame, stop offsets at the
+                end of the last speech frame before the silence timeout.
+        """
+        new_samples = np.frombuffer(pcm_data, dtype=np.int16)
+        # Absolute offset of the first sample handled in this call (carried-over partial frame included)
+        first_sample = self.samples_processed - len(self._remainder)
+        self.samples_processed += len(new_samples)
+        samples = np.concatenate((self._remainder, new_samples)) if len(self._remainder) else new_samples
+        frame_count = len(samples) // self.frame_samples
+        self._remainder = samples[frame_count * self.frame_samples:].copy()
+        if frame_count == 0:
+            return []
+
+        frames = samples[:frame_count * self.frame_samples].reshape(frame_count, self.frame_samples)
+        level_db, zero_crossing_rate = self._frame_features(frames)
+        speech_flags = self._is_speech(level_db, zero_crossing_rate)
+
+        events = []
+        for frame_index in range(frame_count):
+            frame_start = first_sample + frame_index * self.frame_samples
+            frame_end = frame_start + self.frame_samples
+            if speech_flags[frame_index]:
+                if self._speech_run_frames == 0:
+                    self._speech_run_start_sample = frame_start
+                self._speech_run_frames += 1
+                self._silence_run_frames = 0
+                self._last_speech_end_sample = frame_end
+                if not self.in_speech and self._speech_run_frames >= self.min_speech_frames:
+                    self.in_speech = True
+                    events.append((SPEECH_STARTED, self._speech_run_start_sample))
+            else:
+                self._speech_run_frames = 0
+                if self.in_speech:
+                    self._silence_run_frames += 1
+                    if self._silence_run_frames >= self.silence_timeout_frames:
+                        self.in_speech = False
+                        self._silence_run_frames = 0
+                        events.append((SPEECH_STOPPED, self._last_speech_end_sample))
+                else:
+                    # Track the background level only while nobody is speaking
+                    self.noise_floor_db = 0.95 * self.noise_floor_db + 0.05 * float(level_db[frame_index])
+
+        return events
+
+    def _frame_features(self, frames: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return per-frame RMS level in dBFS and zero-crossing rate."""
+        frames_f32 = frames.astype(np.float32)
+        rms = np.sqrt(np.mean(frames_f32 * frames_f32, axis=1))
+        level_db = 20.0 * np.log10(rms / 32768.0 + 1e-10)
+        sign_changes = np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1])
+        zero_crossing_rate = np.count_nonzero(sign_changes, axis=1) / max(1, frames.shape[1] - 1)
+        return level_db, zero_crossing_rate
+
+    def _is_speech(self, level_db: np.ndarray, zero_crossing_rate: np.ndarray) -> np.ndarray:
+        """Combine level and zero-crossing rate into a per-frame speech decision."""
+        threshold_db = max(self.energy_threshold_db, self.noise_floor_db + self.noise_margin_db)
+        loud_enough = level_db > threshold_db
+        voiced = zero_crossing_rate < self.max_zero_crossing_rate
+        very_loud = level_db > threshold_db + 15.0
+        return loud_enough & (voiced | very_loud)
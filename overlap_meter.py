@@ -0,0 +1,53 @@
+"""Measures how much TTS synthesis time ran concurrently with audio playback."""
+
+import threading
+import time
+from collections import deque
+
+
+class PlaybackOverlapMeter:
+    """
+    Accumulates synthesis time and the part of it that overlapped with playback.
+
+    The playback side reports when it starts and stops playing; the synthesis
+    side reports each finished synthesis interval. Overlap is computed against
+    the most recent `remembered_intervals` playback intervals plus the one in
+    progress, which covers any synthesis shorter than that many segments.
+
+    Thread-safe.
+    """
+
+    def __init__(self, remembered_intervals: int = 64):
+        self._lock = threading.Lock()
+        self._playback_intervals = deque(maxlen=remembered_intervals)  # (start, end), oldest first
+        self._playback_started_at = None
+        self.synthesis_s = 0.0
+        self.overlapped_s = 0.0
+
+    def playback_started(self, now: float | None = None):
+        with self._lock:
+            self._playback_started_at = time.monotonic() if now is None else now
+
+    def playback_stopped(self, now: float | None = None):
+        with self._lock:
+            if self._playback_started_at is None:
+                return
+            self._playback_intervals.append((self._playback_started_at, time.monotonic() if now is None else now))
+            self._playback_started_at = None
+
+    def add_synthesis(self, start: float, end: float) -> float:
+        """Record a synthesis interval; returns the seconds of it that overlapped with playback."""
+        with self._lock:
+            intervals = list(self._playback_intervals)
+            if self._playback_started_at is not None:
+                intervals.append((self._playback_started_at, end))
+            overlapped = sum(max(0.0, min(end, playback_end) - max(start, playback_start))
+                             for playback_start, playback_end in intervals)
+            self.synthesis_s += end - start
+            self.overlapped_s += overlapped
+            return overlapped
+
+    def overlap_ratio(self) -> float:
+        """Share of all synthesis time that ran while audio was playing."""
+        with self._lock:
+            return self.overlapped_s / self.synthesis_s if self.synthesis_s else 0.0
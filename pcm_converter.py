@@ -0,0 +1,167 @@
+"""Polyphase resampling and channel conversion of 16-bit PCM for the playback path."""
+
+import math
+
+import numpy as np
+
+
+def _design_polyphase_filter(upsample: int, downsample: int, taps_per_phase: int) -> np.ndarray:
+    """Kaiser-windowed sinc low-pass, split into `upsample` phases of `taps_per_phase` taps (float32)."""
+    length = upsample * taps_per_phase
+    cutoff = 0.5 / max(upsample, downsample) * 0.95  # Cycles per upsampled sample, just below the lower Nyquist
+    n = np.arange(length) - (length - 1) // 2  # Centred on a whole tap, so the delay is an exact number of taps
+    prototype = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, 8.0)
+    prototype *= upsample / prototype.sum()  # Unity gain after zero-stuffing
+    # Phase p holds prototype[p], prototype[p + L], prototype[p + 2L], ...
+    return np.ascontiguousarray(prototype.reshape(taps_per_phase, upsample).T, dtype=np.float32)
+
+
+class PcmConverter:
+    """
+    Converts signed 16-bit PCM between sample rates and from mono to N channels.
+
+    Built once per (source, target) configuration. The rate ratio is reduced
+    to L/M, so every M source samples yield exactly L output samples, always
+    from the same filter phases at the same offsets. Those are precomputed
+    into one (L x window) matrix, and a conversion is a single float32 matrix
+    product over a strided view of the input (no per-sample index arrays),
+    plus one int16 write per output channel. Unlike linear interpolation, the
+    windowed-sinc filter removes the images above the source Nyquist frequency.
+    The filter delay is compensated, so output sample j is at time j / target_rate.
+
+    Streaming: `process()` converts whole groups of M samples and keeps the
+    rest, with the filter history, for the next call, so consecutive pieces
+    of one stream join without clicks. `flush()` emits what is still held
+    and resets; `convert()` handles a whole clip. Equal rates skip the filter.
+    Not thread-safe; use one instance per playback thread.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int, target_channels: int = 1, taps_per_phase: int = 16):
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+        self.target_channels = target_channels
+        self.taps_per_phase = taps_per_phase
+        divisor = math.gcd(source_rate, target_rate)
+        self.upsample = target_rate // divisor
+        self.downsample = source_rate // divisor
+        self.resamples = source_rate != target_rate
+        if self.resamples:
+            self._build_group_matrix(_design_polyphase_filter(self.upsample, self.downsample, taps_per_phase))
+        self.reset()
+
+    def _build_group_matrix(self, phases: np.ndarray):
+        upsample, downsample, taps = self.upsample, self.downsample, self.taps_per_phase
+        history = taps - 1
+        # Position of output 0 in 1/L source samples, counted from the start of the zero history,
+        # placed half the filter length later so the output is not delayed
+        first_position = history * upsample + (upsample * taps - 1) // 2
+        positions = first_position + downsample * np.arange(upsample)
+        newest = positions // upsample
+        self._window_start = int(newest[0]) - history
+        window_length = int(newest[-1] - newest[0]) + taps
+        matrix = np.zeros((upsample, window_length), dtype=np.float32)
+        for output_index, (newest_index, phase) in enumerate(zip(newest, positions % upsample)):
+            oldest_offset = int(newest_index) - history - self._window_start
+            matrix[output_index, oldest_offset:oldest_offset + taps] = phases[phase, ::-1]
+        self._group_matrix_t = np.ascontiguousarray(matrix.T)  # (window, L): windows @ matrix.T
+        self._window_length = window_length
+        self._initial_history = history
+
+    def reset(self):
+        """Forget the stream history (start of an unrelated stream)."""
+        if self.resamples:
+            self._pending = np.zeros(self._initial_history, dtype=np.float32)
+            self._input_count = 0
+            self._output_count = 0
+
+    def convert(self, pcm: bytes) -> bytes:
+        """Convert a complete clip."""
+        self.reset()
+        return self.process(pcm) + self.flush()
+
+    def process(self, pcm: bytes) -> bytes:
+        """Convert the next piece of a stream (whole samples only)."""
+        samples = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2)
+        if not self.resamples:
+            return self._to_channels(samples)
+        self._input_count += len(samples)
+        return self._to_channels(self._resample(samples))
+
+    def flush(self) -> bytes:
+        """Emit the samples still held for the stream and reset it."""
+        if not self.resamples:
+            return b""
+        missing_outputs = -(-self._input_count * self.upsample // self.downsample) - self._output_count
+        missing_groups = -(-missing_outputs // self.upsample)
+        needed_samples = self._window_start + self._window_length + (missing_groups - 1) * self.downsample
+        padding = np.zeros(max(0, needed_samples - len(self._pending)), dtype=np.int16)
+        tail = self._resample(padding)[:max(0, missing_outputs)]
+        self.reset()
+        return self._to_channels(tail)
+
+    def _resample(self, samples: np.ndarray) -> np.ndarray:
+        block = np.concatenate((self._pending, samples.astype(np.float32)))
+        usable = len(block) - self._window_start - self._window_length
+        groups = usable // self.downsample + 1 if usable >= 0 else 0
+        if groups == 0:
+            self._pending = block
+            return np.empty(0, dtype=np.float32)
+        windows = np.lib.stride_tricks.as_strided(
+            block[self._window_start:], shape=(groups, self._window_length),
+            strides=(block.strides[0] * self.downsample, block.strides[0]), writeable=False)
+        output = (windows @ self._group_matrix_t).ravel()  # Group g, phase r -> output g * L + r
+        self._pending = block[groups * self.downsample:].copy()
+        self._output_count += len(output)
+        np.clip(output, -32768, 32767, out=output)
+        return output
+
+    def _to_channels(self, samples: np.ndarray) -> bytes:
+        if self.target_channels == 1:
+            return samples.astype(np.int16).tobytes()
+        frames = np.empty((len(samples), self.target_channels), dtype=np.int16)
+        frames[:] = samples[:, None]  # One pass: cast and duplicate into every channel
+        return frames.tobytes()
+
+
+def _legacy_convert(audio_bytes: bytes, source_rate: int, mixer_rate: int) -> bytes:
+    """The per-clip conversion this module replaced (mono to stereo, then linear interpolation per channel)."""
+    current_samples = np.repeat(np.frombuffer(audio_bytes, dtype=np.int16), 2)
+    num_target_samples = int(round(len(current_samples) // 2 * mixer_rate / source_rate))
+    left_channel = current_samples[0::2]
+    right_channel = current_samples[1::2]
+    x_source = np.linspace(0, 1, len(left_channel))
+    x_target = np.linspace(0, 1, num_target_samples)
+    resampled_stereo = np.empty(num_target_samples * 2, dtype=np.int16)
+    resampled_stereo[0::2] = np.interp(x_target, x_source, left_channel)
+    resampled_stereo[1::2] = np.interp(x_target, x_source, right_channel)
+    return resampled_stereo.astype(np.int16).tobytes()
+
+
+if __name__ == "__main__":
+    # Benchmark: 16 kHz mono TTS clips to a 44.1/48 kHz stereo mixer, against the replaced conversion
+    import timeit
+
+    source_rate = 16000
+    rng = np.random.default_rng(0)
+    for clip_s in (0.5, 5.0):
+        t = np.arange(int(source_rate * clip_s)) / source_rate
+        clip = (np.sin(2 * np.pi * 440 * t) * 8000 + rng.normal(0, 500, t.size)).astype(np.int16).tobytes()
+        for mixer_rate in (44100, 48000):
+            converter = PcmConverter(source_rate, mixer_rate, target_channels=2)
+            runs = 20
+            legacy_s = timeit.timeit(lambda: _legacy_convert(clip, source_rate, mixer_rate), number=runs) / runs
+            polyphase_s = timeit.timeit(lambda: converter.convert(clip), number=runs) / runs
+            print(f"{clip_s:>4}s clip -> {mixer_rate} Hz stereo: legacy {legacy_s * 1000:7.2f} ms, "
+                  f"polyphase {polyphase_s * 1000:7.2f} ms ({legacy_s / polyphase_s:.2f}x)")
+
+    # Aliasing: a 5 kHz tone upsampled to 44.1 kHz should leave no image at 16 - 5 = 11 kHz
+    t = np.arange(source_rate) / source_rate
+    tone = (np.sin(2 * np.pi * 5000 * t) * 16000).astype(np.int16).tobytes()
+    for name, converted in (("legacy", _legacy_convert(tone, source_rate, 44100)),
+                            ("polyphase", PcmConverter(source_rate, 44100, target_channels=2).convert(tone))):
+        left = np.frombuffer(converted, dtype=np.int16)[0::2].astype(np.float64)
+        spectrum = np.abs(np.fft.rfft(left * np.hanning(left.size)))
+        frequencies = np.fft.rfftfreq(left.size, 1 / 44100)
+        image = spectrum[np.abs(frequencies - 11000) < 50].max()
+        wanted = spectrum[np.abs(frequencies - 5000) < 50].max()
+        print(f"{name:>9}: 11 kHz image at {20 * np.log10(image / wanted):.1f} dB relative to the 5 kHz tone")
@@ -0,0 +1,102 @@
+"""Continuous, callback-driven audio output fed from a PCM jitter buffer."""
+
+import time
+
+import pygame
+import pygame._sdl2.audio as sdl2_audio
+
+from jitter_buffer import PcmJitterBuffer
+from pcm_converter import PcmConverter
+
+
+class ContinuousOutputStream:
+    """
+    One SDL2 output device kept open for the whole session.
+
+    The SDL audio thread pulls PCM from a `PcmJitterBuffer` through a
+    callback, so consecutive segments play back to back without the gaps of
+    starting a new `pygame.mixer.Sound` per clip, and streamed audio can be
+    played as it is written. Written PCM is mono 16-bit at `sample_rate`; the
+    device opens at its own rate and channel count, and a `PcmConverter`
+    chosen once for that configuration converts each segment as a stream.
+
+    Usage:
+        output = ContinuousOutputStream(device_name, 16000, prebuffer_ms=100, max_buffer_ms=1000)
+        output.open()
+        output.write(pcm); output.end_segment()
+        output.close()
+    """
+
+    BYTES_PER_SAMPLE = 2  # Signed 16-bit
+
+    def __init__(self, device_name: str | None, sample_rate: int, prebuffer_ms: int, max_buffer_ms: int,
+                 chunk_frames: int = 512, on_playing_changed=None):
+        self.device_name = device_name
+        self.sample_rate = sample_rate
+        self.chunk_frames = chunk_frames
+        self.on_playing_changed = on_playing_changed  # Called with (playing, monotonic time) from the audio thread
+        self.prebuffer_ms = prebuffer_ms
+        self.max_buffer_ms = max_buffer_ms
+        self.buffer = None  # PcmJitterBuffer in the device's format, once open
+        self._converter = None
+        self._carry = b""  # Half of a sample split across writes
+        self._device = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._device is not None
+
+    def open(self):
+        """Open and start the output device (raises on failure)."""
+        if not pygame.get_init():
+            pygame.init()
+        output_devices = sdl2_audio.get_audio_device_names(False)
+        device_name = self.device_name if self.device_name in output_devices else None  # None: system default
+        self._device = sdl2_audio.AudioDevice(
+            devicename=device_name,
+            iscapture=False,
+            frequency=self.sample_rate,
+            audioformat=sdl2_audio.AUDIO_S16,
+            numchannels=1,
+            chunksize=self.chunk_frames,
+            # Take the device's native rate and channels and convert ourselves, instead of SDL's resampler
+            allowed_changes=sdl2_audio.AUDIO_ALLOW_FREQUENCY_CHANGE | sdl2_audio.AUDIO_ALLOW_CHANNELS_CHANGE,
+            callback=self._fill_output
+        )
+        device_rate, device_channels = self._device.frequency, self._device.numchannels
+        self._converter = PcmConverter(self.sample_rate, device_rate, target_channels=device_channels)
+        self.buffer = PcmJitterBuffer(device_rate, self.BYTES_PER_SAMPLE * device_channels,
+                                      self.prebuffer_ms, self.max_buffer_ms)
+        self._device.pause(0)  # The callback only runs from here on, once the buffer exists
+        print(f"🔈 [PLAYBACK_ENGINE] Output stream open on {device_name or 'default device'} "
+              f"({device_rate} Hz, {device_channels}ch, {self._device.chunksize} frames per callback).")
+
+    def write(self, pcm: bytes) -> bool:
+        """Queue PCM for playback (blocks while the jitter buffer is full)."""
+        pcm = self._carry + pcm
+        whole_samples_len = len(pcm) - len(pcm) % self.BYTES_PER_SAMPLE
+        self._carry = pcm[whole_samples_len:]
+        return self.buffer.write(self._converter.process(pcm[:whole_samples_len]))
+
+    def end_segment(self):
+        """Play out what the converter still holds for the segment and mark its end."""
+        self._carry = b""
+        self.buffer.write(self._converter.flush())
+        self.buffer.end_segment()
+
+    def wait_until_drained(self, timeout: float | None = None) -> bool:
+        return self.buffer.wait_until_drained(timeout)
+
+    def close(self):
+        if self.buffer is not None:
+            self.buffer.close()
+        if self._device is not None:
+            self._device.pause(1)
+            self._device.close()
+            self._device = None
+
+    def _fill_output(self, audio_device, stream):
+        was_playing = self.buffer.playing
+        self.buffer.read_into(stream)
+        if self.on_playing_changed is not None and self.buffer.playing != was_playing:
+            self.on_playing_changed(self.buffer.playing, time.monotonic())
@@ -0,0 +1,121 @@
+"""Priority-aware translator input queue: final transcriptions preempt periodic ones."""
+
+import queue
+import threading
+from collections import deque
+from typing import NamedTuple
+
+
+class ScribeTranscription(NamedTuple):
+    """A Scribe result on its way to the translator LLM agent."""
+    kind: str  # "periodic" or "final"
+    utterance_id: int
+    text: str
+    audio_start_s: float | None = None  # Audio the text was recognized from, on the ring buffer timeline
+    audio_end_s: float | None = None
+
+    def covers(self, other: "ScribeTranscription") -> bool:
+        """True if this item's audio includes all of `other`'s (False when either range is unknown)."""
+        if None in (self.audio_start_s, self.audio_end_s, other.audio_start_s, other.audio_end_s):
+            return False
+        return self.audio_start_s <= other.audio_start_s and other.audio_end_s <= self.audio_end_s
+
+
+class TranscriptionLaneQueue:
+    """
+    Queue with three lanes, served in order: control, final, periodic.
+
+    Control items are anything that is not a ScribeTranscription (the shutdown
+    sentinel, finished translator calls) and always go first. Final
+    transcriptions jump ahead of periodic ones. Once a final transcription for
+    an utterance has been queued, the utterance's periodic items whose audio
+    it covers are dropped, both those still waiting and those that arrive
+    late; periodic text from audio the final did not transcribe is kept. The
+    queue also remembers which recent utterances had periodic items at all.
+
+    Mirrors the parts of `queue.Queue` the pipeline uses (put/get/get_nowait/empty/qsize).
+    """
+
+    def __init__(self, remembered_utterances: int = 64):
+        self._not_empty = threading.Condition()
+        self._control_lane = deque()
+        self._final_lane = deque()
+        self._periodic_lane = deque()
+        self._finals = {}  # {utterance_id: final ScribeTranscription}
+        self._finalized_order = deque()  # Bounds _finals to the most recent utterances
+        self._periodic_utterance_ids = deque(maxlen=remembered_utterances)
+        self._remembered_utterances = remembered_utterances
+        self.dropped_periodic_count = 0
+
+    def discard_if_superseded(self, item) -> bool:
+        """Count and report `item` as dropped if it is a periodic transcription a queued final already covers."""
+        with self._not_empty:
+            if not self._is_superseded(item):
+                return False
+            self.dropped_periodic_count += 1
+            return True
+
+    def put(self, item) -> bool:
+        """Queue `item`; returns False if it was dropped as superseded."""
+        with self._not_empty:
+            if not isinstance(item, ScribeTranscription):
+                self._control_lane.append(item)
+            elif item.kind == "final":
+                self._mark_finalized(item)
+                self._final_lane.append(item)
+            elif self._is_superseded(item):
+                self.dropped_periodic_count += 1
+                return False
+            else:
+                self._periodic_lane.append(item)
+                if not self._periodic_utterance_ids or self._periodic_utterance_ids[-1] != item.utterance_id:
+                    self._periodic_utterance_ids.append(item.utterance_id)
+            self._not_empty.notify()
+            return True
+
+    def had_periodic(self, utterance_id: int) -> bool:
+        """True if a periodic transcription of the utterance was ever accepted (recent utterances only)."""
+        with self._not_empty:
+            return utterance_id in self._periodic_utterance_ids
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        """Remove and return the highest-priority item; raises queue.Empty like `queue.Queue.get`."""
+        with self._not_empty:
+            if block:
+                if not self._not_empty.wait_for(self._qsize, timeout=timeout):
+                    raise queue.Empty
+            elif not self._qsize():
+                raise queue.Empty
+            for lane in (self._control_lane, self._final_lane, self._periodic_lane):
+                if lane:
+                    return lane.popleft()
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        with self._not_empty:
+            return self._qsize()
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def _qsize(self) -> int:
+        return len(self._control_lane) + len(self._final_lane) + len(self._periodic_lane)
+
+    def _is_superseded(self, item) -> bool:
+        if not isinstance(item, ScribeTranscription) or item.kind != "periodic":
+            return False
+        final = self._finals.get(item.utterance_id)
+        return final is not None and final.covers(item)
+
+    def _mark_finalized(self, final: ScribeTranscription):
+        if final.utterance_id not in self._finals:
+            self._finalized_order.append(final.utterance_id)
+            if len(self._finalized_order) > self._remembered_utterances:
+                self._finals.pop(self._finalized_order.popleft(), None)
+        self._finals[final.utterance_id] = final
+        # Waiting periodic items whose audio the final also transcribed will never be worth an LLM call of their own
+        remaining = deque(item for item in self._periodic_lane if not self._is_superseded(item))
+        self.dropped_periodic_count += len(self._periodic_lane) - len(remaining)
+        self._periodic_lane = remaining
@@ -0,0 +1,56 @@
+import pytest
+
+from audio_buffer import AudioRangeOverwrittenError, AudioRingBuffer
+
+
+def test_reads_by_absolute_offset_across_the_wrap():
+    buffer = AudioRingBuffer(capacity_bytes=8)
+    buffer.append(b"abcdef")
+    buffer.append(b"ghij")  # Wraps; "ab" is overwritten
+    assert buffer.end_offset == 10
+    assert buffer.oldest_offset == 2
+    assert len(buffer) == 8
+    assert buffer.read(2) == b"cdefghij"
+    views = buffer.read_views(5, 9)
+    assert len(views) == 2  # Split at the end of the storage
+    assert b"".join(views) == b"fghi"
+
+
+def test_write_larger_than_capacity_keeps_the_newest_audio():
+    buffer = AudioRingBuffer(capacity_bytes=4)
+    buffer.append(b"012")
+    buffer.append(b"3456789")
+    assert buffer.end_offset == 10
+    assert buffer.read(6) == b"6789"
+
+
+def test_overwritten_range_raises():
+    buffer = AudioRingBuffer(capacity_bytes=4)
+    buffer.append(b"01234567")
+    with pytest.raises(AudioRangeOverwrittenError) as raised:
+        buffer.read(2, 6)
+    assert raised.value.oldest_available_offset == 4
+    with pytest.raises(ValueError):
+        buffer.read(6, 9)  # Past the newest audio
+    with pytest.raises(ValueError):
+        buffer.read(6, 5)
+    assert buffer.read(5, 5) == b""
+
+
+def test_capacity_is_frame_aligned():
+    buffer = AudioRingBuffer(capacity_bytes=9, frame_width=2)
+    assert buffer.capacity_bytes == 8
+    buffer.append(b"\x01\x00" * 6)
+    assert buffer.end_sample == 6
+    with pytest.raises(ValueError):
+        AudioRingBuffer(capacity_bytes=1, frame_width=2)
+
+
+def test_clear_restarts_offsets_at_zero():
+    buffer = AudioRingBuffer(capacity_bytes=4)
+    buffer.append(b"012345")
+    buffer.clear()
+    assert buffer.end_offset == 0
+    assert len(buffer) == 0
+    buffer.append(b"ab")
+    assert buffer.read(0) == b"ab"
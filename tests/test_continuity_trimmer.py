@@ -0,0 +1,28 @@
+from continuity_trimmer import find_continuity_overlap, trim_continuity_overlap
+
+
+def test_exact_repeat_is_removed():
+    assert trim_continuity_overlap("Hoje vamos falar sobre o projeto.", "sobre o projeto, e depois do prazo.") == \
+        "e depois do prazo."
+    assert trim_continuity_overlap("Olá a todos", "olá, a todos! Bem-vindos.") == "Bem-vindos."
+
+
+def test_repeat_with_an_inserted_or_dropped_word_is_removed():
+    assert trim_continuity_overlap("nós vamos falar sobre o projeto", "falar sobre o novo projeto hoje") == "hoje"
+    assert trim_continuity_overlap("vamos falar sobre o novo projeto", "falar sobre o projeto amanhã") == "amanhã"
+
+
+def test_different_last_word_is_not_a_repeat():
+    assert trim_continuity_overlap("isso é muito importante para nós", "muito importante para o projeto") == \
+        "muito importante para o projeto"
+
+
+def test_replaced_interior_word_is_not_a_repeat():
+    assert trim_continuity_overlap("vamos falar de uma forma simples", "de outra forma simples, vamos ver") == \
+        "de outra forma simples, vamos ver"
+
+
+def test_short_overlaps_must_be_exact_and_unrelated_text_is_kept():
+    assert find_continuity_overlap("the big dog", "a dog runs") == 0
+    assert find_continuity_overlap("we can start", "tomorrow we begin") == 0
+    assert trim_continuity_overlap("", "texto novo") == "texto novo"
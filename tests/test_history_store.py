@@ -0,0 +1,47 @@
+from history_store import TextHistory, estimate_tokens, select_translator_context
+
+
+def test_history_evicts_oldest_entries_beyond_max_chars():
+    history = TextHistory(max_chars=10)
+    for text in ("aaaa", "bbbb", "cccc"):
+        history.append(text)
+    assert list(history) == ["bbbb", "cccc"]
+    assert history.total_chars == 8
+    history.append("d" * 12)  # The newest entry stays even when it alone is too long
+    assert list(history) == ["d" * 12]
+    assert history[-1] == "d" * 12
+    history.clear()
+    assert len(history) == 0
+    assert history.total_chars == 0
+
+
+def test_token_estimate_rounds_up():
+    assert estimate_tokens("", 4.0) == 0
+    assert estimate_tokens("abcde", 4.0) == 2
+
+
+def test_fragments_first_then_histories_share_the_rest():
+    context = select_translator_context(
+        ["aaa", "bbbb"], native_history=["nnnn", "nn"], translated_history=["xx", "y"],
+        token_budget=10, chars_per_token=1.0)
+    assert context.recent_fragments == ["aaa", "bbbb"]
+    assert context.translated_history == ["y"]
+    assert context.native_history == ["nn"]
+    assert context.estimated_tokens == 10
+
+
+def test_unused_history_budget_goes_to_the_other_history():
+    context = select_translator_context(
+        ["aaa", "bbbb"], native_history=[], translated_history=["xx", "y"],
+        token_budget=10, chars_per_token=1.0)
+    assert context.translated_history == ["xx", "y"]
+    assert context.estimated_tokens == 10
+
+
+def test_newest_fragment_is_kept_over_budget():
+    context = select_translator_context(
+        ["old", "abcdef"], native_history=["n"], translated_history=["x"],
+        token_budget=2, chars_per_token=1.0)
+    assert context.recent_fragments == ["abcdef"]
+    assert context.native_history == []
+    assert context.translated_history == []
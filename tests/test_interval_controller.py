@@ -0,0 +1,46 @@
+import pytest
+
+from interval_controller import AdaptiveIntervalController
+
+
+def make_controller():
+    return AdaptiveIntervalController(initial_interval_s=2.0, min_interval_s=1.0, max_interval_s=10.0,
+                                      max_in_flight=2, headroom=1.5, backlog_factor=0.5, smoothing=0.3)
+
+
+def test_keeps_the_initial_interval_until_something_is_observed():
+    controller = make_controller()
+    assert controller.update(translator_queue_depth=5) == 2.0
+
+
+def test_moves_halfway_towards_what_scribe_can_sustain():
+    controller = make_controller()
+    controller.observe_scribe_rtt(4.0)  # 4 s round trips, 2 in flight, 1.5 headroom: one chunk per 3 s
+    assert controller.update(0) == pytest.approx(2.5)
+    assert controller.update(0) == pytest.approx(2.75)
+
+
+def test_the_slower_of_scribe_and_translator_wins():
+    controller = make_controller()
+    controller.observe_scribe_rtt(2.0)
+    controller.observe_translator_time(6.0)
+    assert controller.update(0) == pytest.approx(4.0)
+
+
+def test_translator_backlog_stretches_the_interval():
+    controller = make_controller()
+    controller.observe_translator_time(3.0)
+    assert controller.update(translator_queue_depth=2) == pytest.approx(4.0)  # Target 3 s * (1 + 0.5 * 2)
+
+
+def test_observations_are_smoothed_and_the_interval_clamped():
+    controller = make_controller()
+    controller.observe_scribe_rtt(2.0)
+    controller.observe_scribe_rtt(12.0)
+    assert controller.scribe_rtt_s == pytest.approx(5.0)
+    controller.observe_translator_time(100.0)
+    assert controller.update(0) == pytest.approx(6.0)  # Halfway towards the 10 s maximum, not towards 100 s
+    controller.reset()
+    assert controller.interval_s == 2.0
+    assert controller.scribe_rtt_s is None
+    assert controller.translator_time_s is None
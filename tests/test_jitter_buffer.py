@@ -0,0 +1,65 @@
+import threading
+
+from jitter_buffer import PcmJitterBuffer
+
+
+def make_buffer():
+    # 1 kHz 16-bit mono: 2 bytes per ms
+    return PcmJitterBuffer(sample_rate=1000, bytes_per_frame=2, prebuffer_ms=10, max_buffer_ms=20)
+
+
+def read(buffer, size):
+    out = bytearray(b"\xff" * size)
+    copied = buffer.read_into(out)
+    return copied, bytes(out)
+
+
+def test_waits_for_the_prebuffer_while_a_segment_is_open():
+    buffer = make_buffer()
+    buffer.write(b"\x01" * 10)
+    assert read(buffer, 4) == (0, bytes(4))  # Silence until 10 ms are queued
+    buffer.write(b"\x02" * 10)
+    assert read(buffer, 12) == (12, b"\x01" * 10 + b"\x02" * 2)
+    assert buffer.buffered_ms == 4.0
+
+
+def test_end_of_segment_plays_the_rest_without_prebuffering():
+    buffer = make_buffer()
+    buffer.write(b"\x01\x01\x01")
+    buffer.end_segment()  # Pads the split frame
+    assert read(buffer, 6) == (4, b"\x01\x01\x01\x00" + bytes(2))
+    assert buffer.underrun_count == 0  # Running dry after the end is not an underrun
+
+
+def test_running_dry_mid_segment_is_an_underrun():
+    buffer = make_buffer()
+    buffer.write(b"\x01" * 20)
+    assert read(buffer, 24) == (20, b"\x01" * 20 + bytes(4))
+    assert buffer.underrun_count == 1
+    buffer.write(b"\x02" * 4)
+    assert read(buffer, 4) == (0, bytes(4))  # Prebuffering again
+
+
+def test_writers_block_while_full_until_read():
+    buffer = make_buffer()
+    buffer.write(bytes(40))
+    second_write_done = threading.Event()
+    writer = threading.Thread(target=lambda: (buffer.write(b"\x01" * 4), second_write_done.set()))
+    writer.start()
+    assert not second_write_done.wait(0.05)
+    read(buffer, 8)
+    assert second_write_done.wait(1.0)
+    writer.join()
+
+
+def test_close_releases_writers_and_waiters():
+    buffer = make_buffer()
+    buffer.write(bytes(40))
+    results = []
+    writer = threading.Thread(target=lambda: results.append(buffer.write(b"\x01")))
+    writer.start()
+    buffer.close()
+    writer.join(1.0)
+    assert results == [False]
+    assert buffer.wait_until_drained(timeout=0.1)
+    assert not buffer.write(b"\x01")
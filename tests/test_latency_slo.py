@@ -0,0 +1,67 @@
+from latency_slo import COMPRESS, PLAY, SKIP, PlaybackLagTracker, choose_lag_action
+
+MAX_LAG_S = 6.0
+SKIP_LAG_S = 15.0
+
+
+def play_back_to_back(tracker, pieces, start_at):
+    """Play (answer_id, ready_at, duration_s) pieces in order; returns their lags and when playback ends"""
+    lags = []
+    now = start_at
+    for answer_id, ready_at, duration_s in pieces:
+        now = max(now, ready_at)  # The output idles until the piece is ready
+        lags.append(tracker.lag_s(answer_id, ready_at, now))
+        tracker.played(answer_id, duration_s)
+        now += duration_s
+    return lags, now
+
+
+def test_long_answer_without_backlog_is_played_as_is():
+    # A 20 s answer in five sub-segments, synthesized in parallel well ahead of playback
+    tracker = PlaybackLagTracker()
+    pieces = [(0, 0.4 + 0.3 * sub_index, 4.0) for sub_index in range(5)]
+    lags, _ = play_back_to_back(tracker, pieces, start_at=0.4)
+    actions = [choose_lag_action(lag_s, MAX_LAG_S, SKIP_LAG_S, COMPRESS) for lag_s in lags]
+    assert max(lags) == 0.0
+    assert actions == [PLAY] * 5
+
+
+def test_streamed_clauses_of_one_answer_are_not_lag():
+    # Clauses streamed as separate segments of one answer; later ones are ready before earlier ones finish
+    tracker = PlaybackLagTracker()
+    pieces = [(7, 1.0 + 0.5 * clause_index, 3.0) for clause_index in range(8)]
+    lags, _ = play_back_to_back(tracker, pieces, start_at=1.0)
+    assert max(lags) == 0.0
+
+
+def test_waiting_for_other_answers_is_lag():
+    tracker = PlaybackLagTracker()
+    first_answer = [(0, 0.0, 4.0) for _ in range(5)]
+    second_answer = [(5, 2.0, 3.0), (5, 2.5, 3.0)]
+    lags, _ = play_back_to_back(tracker, first_answer + second_answer, start_at=0.0)
+    assert lags[:5] == [0.0] * 5
+    assert lags[5:] == [18.0, 18.0]  # Ready at 2 s, started after the first answer's 20 s
+    assert choose_lag_action(lags[5], MAX_LAG_S, SKIP_LAG_S, COMPRESS) == SKIP
+
+
+def test_waiting_for_unsynthesized_audio_is_not_lag():
+    tracker = PlaybackLagTracker()
+    lags, _ = play_back_to_back(tracker, [(0, 0.0, 1.0), (0, 3.0, 1.0), (0, 3.5, 1.0)], start_at=0.0)
+    assert lags == [0.0, 0.0, 0.0]
+
+
+def test_forgotten_answers_start_over():
+    tracker = PlaybackLagTracker()
+    tracker.lag_s(0, ready_at=0.0, start_at=0.0)
+    tracker.played(0, 10.0)
+    tracker.forget_answers_before(1)
+    assert tracker.lag_s(0, ready_at=20.0, start_at=20.0) == 0.0
+
+
+def test_reset_forgets_the_previous_session():
+    tracker = PlaybackLagTracker()
+    tracker.lag_s(0, ready_at=0.0, start_at=0.0)
+    tracker.played(0, 30.0)
+    tracker.reset()
+    # Segment ids restart at 0: a new answer 0 must not continue the old one's schedule
+    assert tracker.lag_s(0, ready_at=10.0, start_at=13.0) == 3.0
@@ -0,0 +1,56 @@
+import json
+
+from llm_stream_parser import StreamingTranslationParser
+
+
+def parse_in_deltas(raw: str, delta_chars: int = 3, min_clause_chars: int = 10, language_code: str = "pt"):
+    parser = StreamingTranslationParser(min_clause_chars=min_clause_chars, language_code=language_code)
+    clauses = []
+    for start in range(0, len(raw), delta_chars):
+        clauses += parser.feed(raw[start:start + delta_chars])
+    return parser, clauses + parser.finish()
+
+
+def test_escapes_split_across_deltas_decode_like_json():
+    text = 'Ele disse "olá",\n então\tfoi embora. Até já \U0001F44B, \u00e9 isso/fim.'
+    raw = json.dumps({"should_speak": True, "text_to_speak": text})
+    for delta_chars in (1, 2, 5):
+        parser, clauses = parse_in_deltas(raw, delta_chars)
+        assert parser.is_complete
+        assert parser.fields["text_to_speak"] == text
+        assert " ".join(clauses).split() == text.split()
+
+
+def test_invalid_escapes_are_kept_as_written():
+    raw = '{"should_speak": true, "text_to_speak": "Primeira frase falada. Caminho C:\\xyz e \\u12G4 fim."}'
+    for delta_chars in (1, 4, len(raw)):
+        parser, clauses = parse_in_deltas(raw, delta_chars)
+        assert parser.is_complete
+        assert parser.should_speak is True
+        assert parser.fields["text_to_speak"] == "Primeira frase falada. Caminho C:\\xyz e \\u12G4 fim."
+        assert clauses[0] == "Primeira frase falada."
+
+
+def test_lone_high_surrogate_does_not_swallow_the_next_escape():
+    raw = '{"should_speak": true, "text_to_speak": "a\\ud83d\\n b"}'
+    parser, _ = parse_in_deltas(raw, 1)
+    assert parser.fields["text_to_speak"] == "a\ud83d\n b"
+
+
+def test_streamed_clauses_do_not_split_after_abbreviations():
+    text = "O Sr. Silva chegou agora. Ele falou com a Dra. Costa sobre o projeto."
+    raw = json.dumps({"should_speak": True, "text_to_speak": text}, ensure_ascii=False)
+    _, clauses = parse_in_deltas(raw, 2, min_clause_chars=5)
+    assert clauses == ["O Sr. Silva chegou agora.", "Ele falou com a Dra. Costa sobre o projeto."]
+
+    text = "Use short clauses, e.g. this one. Then stop."
+    raw = json.dumps({"should_speak": True, "text_to_speak": text})
+    _, clauses = parse_in_deltas(raw, 2, min_clause_chars=20, language_code="en")
+    assert clauses == ["Use short clauses, e.g. this one.", "Then stop."]
+
+
+def test_speech_is_held_until_the_decision_arrives():
+    raw = json.dumps({"text_to_speak": "Uma frase longa o bastante. Outra frase.", "should_speak": False})
+    parser, clauses = parse_in_deltas(raw, 4)
+    assert parser.should_speak is False
+    assert clauses == []
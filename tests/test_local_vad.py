@@ -0,0 +1,53 @@
+import numpy as np
+
+from local_vad import SPEECH_STARTED, SPEECH_STOPPED, EnergyZcrVad
+
+SAMPLE_RATE = 16000
+
+
+def silence(seconds):
+    return np.zeros(int(SAMPLE_RATE * seconds), dtype=np.int16)
+
+
+def tone(seconds, frequency=200, amplitude=8000):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * frequency * t) * amplitude).astype(np.int16)
+
+
+def make_vad():
+    # 20 ms frames: speech needs 5 frames to start and 15 silent frames to stop
+    return EnergyZcrVad(SAMPLE_RATE, frame_ms=20, min_speech_ms=100, silence_timeout_ms=300)
+
+
+def test_reports_start_and_stop_at_absolute_sample_offsets():
+    audio = np.concatenate((silence(0.5), tone(0.5), silence(0.5))).tobytes()
+    assert make_vad().process(audio) == [(SPEECH_STARTED, 8000), (SPEECH_STOPPED, 16000)]
+
+
+def test_streamed_pieces_give_the_same_events():
+    audio = np.concatenate((silence(0.5), tone(0.5), silence(0.5))).tobytes()
+    vad = make_vad()
+    piece_bytes = 2 * 333  # Splits frames across calls
+    events = []
+    for start in range(0, len(audio), piece_bytes):
+        events += vad.process(audio[start:start + piece_bytes])
+    assert events == [(SPEECH_STARTED, 8000), (SPEECH_STOPPED, 16000)]
+    assert vad.samples_processed == len(audio) // 2
+
+
+def test_short_bursts_and_hiss_are_not_speech():
+    rng = np.random.default_rng(0)
+    hiss = rng.normal(0, 600, SAMPLE_RATE).astype(np.int16)  # Loud enough, but crosses zero constantly
+    audio = np.concatenate((silence(0.2), tone(0.06), silence(0.2), hiss)).tobytes()
+    vad = make_vad()
+    assert vad.process(audio) == []
+    assert not vad.in_speech
+
+
+def test_reset_restarts_offsets():
+    vad = make_vad()
+    vad.process(np.concatenate((silence(0.5), tone(0.2))).tobytes())
+    assert vad.in_speech
+    vad.reset()
+    assert not vad.in_speech
+    assert vad.process(np.concatenate((silence(0.1), tone(0.2))).tobytes()) == [(SPEECH_STARTED, 1600)]
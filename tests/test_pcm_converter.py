@@ -0,0 +1,43 @@
+import numpy as np
+
+from pcm_converter import PcmConverter
+
+SOURCE_RATE = 16000
+
+
+def tone(frequency, seconds=0.5, amplitude=8000):
+    t = np.arange(int(SOURCE_RATE * seconds)) / SOURCE_RATE
+    return (np.sin(2 * np.pi * frequency * t) * amplitude).astype(np.int16).tobytes()
+
+
+def test_clip_length_follows_the_rate_ratio():
+    clip = tone(440)
+    for target_rate in (44100, 48000, 22050, 8000):
+        converted = PcmConverter(SOURCE_RATE, target_rate).convert(clip)
+        assert len(converted) // 2 == -(-len(clip) // 2 * target_rate // SOURCE_RATE)
+
+
+def test_equal_rates_only_duplicate_channels():
+    clip = tone(440, seconds=0.01)
+    converted = PcmConverter(SOURCE_RATE, SOURCE_RATE, target_channels=2).convert(clip)
+    frames = np.frombuffer(converted, dtype=np.int16).reshape(-1, 2)
+    assert np.array_equal(frames[:, 0], np.frombuffer(clip, dtype=np.int16))
+    assert np.array_equal(frames[:, 0], frames[:, 1])
+
+
+def test_streamed_pieces_match_the_whole_clip():
+    clip = tone(440)
+    whole = PcmConverter(SOURCE_RATE, 44100, target_channels=2).convert(clip)
+    converter = PcmConverter(SOURCE_RATE, 44100, target_channels=2)
+    piece_bytes = 2 * 333  # Not a multiple of the 160-sample group
+    streamed = b"".join(converter.process(clip[start:start + piece_bytes])
+                        for start in range(0, len(clip), piece_bytes)) + converter.flush()
+    assert streamed == whole
+
+
+def test_tone_keeps_its_level_and_timing():
+    converted = np.frombuffer(PcmConverter(SOURCE_RATE, 48000).convert(tone(440)), dtype=np.int16)
+    t = np.arange(len(converted)) / 48000
+    expected = np.sin(2 * np.pi * 440 * t) * 8000
+    middle = slice(len(converted) // 4, 3 * len(converted) // 4)  # Away from the filter's edges
+    assert np.max(np.abs(converted[middle] - expected[middle])) < 80  # Within 1% of the amplitude
@@ -0,0 +1,63 @@
+import queue
+
+from priority_lanes import ScribeTranscription, TranscriptionLaneQueue
+
+
+def drain(lanes):
+    items = []
+    while True:
+        try:
+            items.append(lanes.get_nowait())
+        except queue.Empty:
+            return items
+
+
+def test_finals_go_ahead_of_periodic_items():
+    lanes = TranscriptionLaneQueue()
+    lanes.put(ScribeTranscription("periodic", 1, "um", 0.0, 2.0))
+    lanes.put(ScribeTranscription("final", 2, "dois", 5.0, 7.0))
+    lanes.put(None)
+    assert [getattr(item, "text", item) for item in drain(lanes)] == [None, "dois", "um"]
+
+
+def test_periodic_items_the_final_covers_are_dropped():
+    lanes = TranscriptionLaneQueue()
+    lanes.put(ScribeTranscription("periodic", 1, "waiting", 4.0, 6.0))
+    lanes.put(ScribeTranscription("final", 1, "final", 3.5, 11.0))
+    late_item = ScribeTranscription("periodic", 1, "late", 6.0, 10.0)
+    assert lanes.discard_if_superseded(late_item)
+    assert not lanes.put(late_item)
+    assert [item.text for item in drain(lanes)] == ["final"]
+    assert lanes.dropped_periodic_count == 3
+
+
+def test_periodic_items_outside_the_final_are_kept():
+    lanes = TranscriptionLaneQueue()
+    lanes.put(ScribeTranscription("periodic", 1, "waiting", 0.5, 3.0))
+    lanes.put(ScribeTranscription("final", 1, "final", 9.0, 11.0))
+    # Returned after the final although its audio came first (concurrent periodic requests)
+    late_item = ScribeTranscription("periodic", 1, "will talk about data", 4.2, 6.6)
+    assert not lanes.discard_if_superseded(late_item)
+    assert lanes.put(late_item)
+    # Without a range nothing can be shown to be covered
+    assert lanes.put(ScribeTranscription("periodic", 1, "unknown"))
+    assert [item.text for item in drain(lanes)] == ["final", "waiting", "will talk about data", "unknown"]
+    assert lanes.dropped_periodic_count == 0
+
+
+def test_items_handed_out_before_the_final_are_judged_by_coverage():
+    lanes = TranscriptionLaneQueue()
+    covered = ScribeTranscription("periodic", 1, "covered", 4.0, 6.0)
+    uncovered = ScribeTranscription("periodic", 1, "uncovered", 0.5, 3.0)
+    lanes.put(covered)
+    lanes.put(uncovered)
+    handed_out = drain(lanes)  # Waiting in the agent while a call is in flight
+    lanes.put(ScribeTranscription("final", 1, "final", 3.5, 11.0))
+    assert [item.text for item in handed_out if not lanes.discard_if_superseded(item)] == ["uncovered"]
+    assert lanes.dropped_periodic_count == 1
+
+
+def test_a_final_only_supersedes_its_own_utterance():
+    lanes = TranscriptionLaneQueue()
+    lanes.put(ScribeTranscription("final", 1, "final", 0.0, 20.0))
+    assert lanes.put(ScribeTranscription("periodic", 2, "next", 12.0, 14.0))
@@ -0,0 +1,37 @@
+from time_stretch import CatchUpSpeedController
+
+
+def make_controller():
+    return CatchUpSpeedController(start_lag_s=2.0, full_lag_s=6.0, max_speed=1.3)
+
+
+def test_no_backlog_keeps_normal_speed():
+    controller = make_controller()
+    # Every sub-segment of a long answer with nothing queued behind it
+    assert [controller.update(0.0) for _ in range(5)] == [1.0] * 5
+
+
+def test_speed_ramps_towards_backlog_target():
+    controller = make_controller()
+    speeds = [controller.update(6.0) for _ in range(6)]
+    assert speeds == sorted(speeds)
+    assert 1.0 < speeds[0] < 1.3
+    assert abs(speeds[-1] - 1.3) < 0.01
+
+
+def test_speed_snaps_back_once_backlog_clears():
+    controller = make_controller()
+    for _ in range(4):
+        controller.update(6.0)
+    speeds = [controller.update(0.0) for _ in range(6)]
+    assert speeds[0] > 1.0
+    assert speeds[-1] == 1.0
+
+
+def test_reset_returns_to_normal_speed():
+    controller = make_controller()
+    for _ in range(4):
+        controller.update(6.0)
+    controller.reset()
+    assert controller.speed == 1.0
+    assert controller.update(0.0) == 1.0
@@ -0,0 +1,49 @@
+from transcript_stitcher import ScribeWord, TranscriptStitcher
+
+HORIZON_S = 0.4
+PRE_ROLL_S = 1.0  # max(FINAL_SCRIBE_PRE_ROLL_MS, TRANSCRIPT_STITCH_OVERLAP_MS)
+
+SPEECH = [
+    ScribeWord("hello", 0.2, 0.6),
+    ScribeWord("everyone", 0.7, 1.3),
+    ScribeWord("today", 2.0, 2.5),
+    ScribeWord("we", 3.0, 3.3),
+    ScribeWord("will", 4.2, 4.5),
+    ScribeWord("talk", 4.6, 5.0),
+    ScribeWord("about", 5.1, 5.5),
+    ScribeWord("data", 6.0, 6.6),
+    ScribeWord("pipelines", 9.7, 10.0),
+    ScribeWord("tonight", 10.3, 10.8),
+]
+
+
+def recognized(start_s, end_s):
+    """Words Scribe returns for the audio [start_s, end_s]"""
+    return [word for word in SPEECH if word.end_s > start_s and word.start_s < end_s]
+
+
+def test_chunks_in_order_emit_every_word_once():
+    stitcher = TranscriptStitcher(HORIZON_S)
+    texts = [stitcher.add_chunk(recognized(0.0, 4.0), 4.0, is_final=False),
+             stitcher.add_chunk(recognized(3.0, 10.0), 10.0, is_final=False)]
+    final_start_s = stitcher.final_chunk_start_s(utterance_start_s=0.0, pre_roll_s=PRE_ROLL_S)
+    texts.append(stitcher.add_chunk(recognized(final_start_s, 11.0), 11.0, is_final=True))
+    assert " ".join(text for text in texts if text).split() == [word.text for word in SPEECH]
+
+
+def test_final_before_in_flight_periodic_chunk_keeps_its_words():
+    stitcher = TranscriptStitcher(HORIZON_S)
+    texts = [stitcher.add_chunk(recognized(0.0, 4.0), 4.0, is_final=False)]
+    # Periodic chunk [3-10 s] is submitted, speech stops at 11 s, and the final returns first
+    final_start_s = stitcher.final_chunk_start_s(utterance_start_s=0.0, pre_roll_s=PRE_ROLL_S)
+    assert final_start_s <= 4.2  # Covers the in-flight chunk's unemitted words
+    texts.append(stitcher.add_chunk(recognized(final_start_s, 11.0), 11.0, is_final=True))
+    late_text = stitcher.add_chunk(recognized(3.0, 10.0), 10.0, is_final=False)
+    assert late_text == ""
+    assert " ".join(texts).split() == [word.text for word in SPEECH]
+
+
+def test_final_chunk_starts_no_earlier_than_the_utterance():
+    stitcher = TranscriptStitcher(HORIZON_S)
+    stitcher.add_chunk(recognized(0.0, 4.0), 4.0, is_final=True)
+    assert stitcher.final_chunk_start_s(utterance_start_s=20.0, pre_roll_s=PRE_ROLL_S) == 20.0
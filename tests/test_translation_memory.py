@@ -0,0 +1,61 @@
+import itertools
+
+import translation_memory
+from translation_memory import TranslationMemory, normalize_source_segment
+
+
+def test_normalization_ignores_case_punctuation_and_spacing():
+    assert normalize_source_segment("  Guten   Morgen, alle! ") == "guten morgen alle"
+    assert normalize_source_segment("ＧＵＴＥＮ Morgen") == "guten morgen"  # NFKC folds full-width letters
+    assert TranslationMemory.make_key("?!", "de", "en", "model") is None
+    assert TranslationMemory.make_key("Hallo!", "de", "en", "model") == \
+        TranslationMemory.make_key("hallo", "de", "en", "model")
+    assert TranslationMemory.make_key("Hallo", "de", "en", "model") != \
+        TranslationMemory.make_key("Hallo", "de", "fr", "model")
+
+
+def test_hits_need_repeated_identical_translations():
+    memory = TranslationMemory(max_entries=10, min_confirmations=2)
+    memory.record("k", "Good morning")
+    assert memory.lookup("k") is None
+    memory.record("k", "Good morning")
+    assert memory.lookup("k") == "Good morning"
+    memory.record("k", "Morning")  # A different translation restarts the count
+    assert memory.lookup("k") is None
+    assert memory.stats["hits"] == 1
+    assert memory.stats["misses"] == 2
+
+
+def test_memory_tier_evicts_least_recently_used_entries():
+    memory = TranslationMemory(max_entries=2, min_confirmations=1)
+    memory.record("a", "A")
+    memory.record("b", "B")
+    assert memory.lookup("a") == "A"
+    memory.record("c", "C")
+    assert memory.lookup("b") is None
+    assert memory.lookup("a") == "A"
+
+
+def test_disk_store_survives_restarts(tmp_path):
+    db_path = str(tmp_path / "memory.sqlite")
+    memory = TranslationMemory(max_entries=10, min_confirmations=2, db_path=db_path)
+    memory.record("k", "Good morning")
+    memory.close()
+
+    restarted = TranslationMemory(max_entries=10, min_confirmations=2, db_path=db_path)
+    restarted.record("k", "Good morning")  # Confirms the entry loaded from disk
+    assert restarted.lookup("k") == "Good morning"
+    restarted.close()
+
+
+def test_disk_store_keeps_the_most_recent_entries(tmp_path, monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(translation_memory.time, "time", lambda: next(clock))  # Distinct last_used values
+    db_path = str(tmp_path / "memory.sqlite")
+    memory = TranslationMemory(max_entries=1, min_confirmations=1, db_path=db_path, disk_max_entries=2)
+    for key in ("a", "b", "c"):
+        memory.record(key, key.upper())
+    assert memory.lookup("a") is None
+    assert memory.lookup("b") == "B"
+    assert memory.stats["disk_hits"] == 1
+    memory.close()
@@ -0,0 +1,50 @@
+import os
+
+from tts_cache import TtsAudioCache, make_tts_cache_key
+
+SETTINGS = {"stability": 0.5, "similarity_boost": 0.75}
+
+
+def key_for(text, voice_id="voice", settings=SETTINGS):
+    return make_tts_cache_key(voice_id, "model", "de", "pcm_16000", settings, text)
+
+
+def test_key_depends_on_everything_that_shapes_the_audio():
+    assert key_for("Hallo") == key_for("Hallo", settings=dict(reversed(list(SETTINGS.items()))))
+    assert key_for("Hallo") != key_for("Hallo.")
+    assert key_for("Hallo") != key_for("Hallo", voice_id="other")
+    assert key_for("Hallo") != key_for("Hallo", settings={**SETTINGS, "stability": 0.6})
+
+
+def test_memory_tier_evicts_least_recently_used_clips():
+    cache = TtsAudioCache(max_bytes=8)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # "b" is now the least recently used
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    assert cache.memory_bytes == 8
+    cache.put("huge", b"x" * 9)  # Larger than the tier: not cached
+    assert cache.get("huge") is None
+    assert cache.stats["hits"] == 3
+    assert cache.stats["misses"] == 2
+    assert cache.stats["bytes_saved"] == 12
+    assert cache.hit_ratio() == 3 / 5
+
+
+def test_disk_tier_survives_restarts_and_is_bounded(tmp_path):
+    cache = TtsAudioCache(max_bytes=100, disk_dir=str(tmp_path), disk_max_bytes=8)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.put("c", b"cccc")  # Evicts "a" from disk
+    assert sorted(os.listdir(tmp_path)) == ["b.pcm", "c.pcm"]
+    assert cache.disk_bytes == 8
+
+    restarted = TtsAudioCache(max_bytes=100, disk_dir=str(tmp_path), disk_max_bytes=8)
+    assert restarted.disk_bytes == 8
+    assert restarted.get("a") is None
+    assert restarted.get("b") == b"bbbb"
+    assert restarted.stats["disk_hits"] == 1
+    assert restarted.memory_bytes == 4  # Promoted into memory
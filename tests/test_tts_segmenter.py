@@ -0,0 +1,26 @@
+from tts_segmenter import next_clause_end, split_text_for_tts
+
+
+def test_split_keeps_abbreviations_and_merges_short_pieces():
+    text = "Bom dia, Sr. Silva. Hoje vamos falar sobre o orçamento do próximo ano; depois, sobre as contratações."
+    assert split_text_for_tts(text, "pt-BR", min_chars=20) == [
+        "Bom dia, Sr. Silva. Hoje vamos falar sobre o orçamento do próximo ano;",
+        "depois, sobre as contratações.",
+    ]
+
+
+def test_split_does_not_break_numbers_and_cjk_needs_no_space():
+    assert split_text_for_tts("O valor é 3.5 milhões de reais.", "pt", min_chars=5) == ["O valor é 3.5 milhões de reais."]
+    assert split_text_for_tts("今天天气很好。我们出去走走吧！", "zh", min_chars=3) == ["今天天气很好。", "我们出去走走吧！"]
+
+
+def test_short_last_piece_joins_the_previous_one():
+    assert split_text_for_tts("Esta é uma frase bem longa para o teste. Ok.", "pt", min_chars=10) == \
+        ["Esta é uma frase bem longa para o teste. Ok."]
+
+
+def test_next_clause_end_waits_for_the_whitespace_after_a_boundary():
+    assert next_clause_end("A primeira frase termina aqui.", "pt", min_chars=5) is None
+    text = "A primeira frase termina aqui. A segunda"
+    assert text[:next_clause_end(text, "pt", min_chars=5)] == "A primeira frase termina aqui."
+    assert next_clause_end("Fale com o Dr. Souza", "pt", min_chars=5) is None
@@ -0,0 +1,153 @@
+"""Pitch-preserving time compression (WSOLA) and the catch-up speed it is driven by."""
+
+import numpy as np
+
+
+class WsolaTimeStretcher:
+    """
+    Streaming WSOLA (waveform-similarity overlap-add) time stretcher for 16-bit mono PCM.
+
+    Output frames of `frame_ms` are overlap-added with a periodic Hann window
+    at half-frame hops. Each frame is read from the input `speed` times
+    further along than the output advances, shifted by up to
+    `tolerance_ms` to where it best continues the previous frame (normalized
+    cross-correlation over all candidate shifts as one matrix-vector
+    product). Speed changes duration only, not pitch.
+
+    `process()` accepts any byte count and keeps the state needed to
+    continue seamlessly; `flush()` emits the rest and resets. `convert()`
+    stretches a whole clip. Not thread-safe.
+    """
+
+    def __init__(self, sample_rate: int, frame_ms: int = 30, tolerance_ms: int = 10):
+        self.hop = max(1, sample_rate * frame_ms // 2000)  # Output hop: half a frame
+        self.frame_length = 2 * self.hop
+        self.tolerance = sample_rate * tolerance_ms // 1000
+        # Periodic Hann: windows at half-frame hops sum to exactly 1
+        self._window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(self.frame_length) / self.frame_length)).astype(np.float32)
+        self.reset()
+
+    def reset(self):
+        self._input = np.zeros(0, dtype=np.float32)
+        self._input_offset = 0  # Absolute index of _input[0]
+        self._input_end = 0  # Absolute index after the last real (unpadded) input sample
+        self._analysis_position = 0.0  # Nominal absolute start of the next frame
+        self._previous_start = None  # Absolute start of the last frame read
+        self._output_tail = None  # Second half of the last frame, still to be overlapped
+        self._carry = b""
+        self._expected_output = 0.0
+        self._emitted_output = 0
+
+    def convert(self, pcm: bytes, speed: float) -> bytes:
+        """Stretch a complete clip to 1/speed of its duration."""
+        self.reset()
+        return self.process(pcm, speed) + self.flush()
+
+    def process(self, pcm: bytes, speed: float) -> bytes:
+        """Stretch the next piece of a stream; returns the output that is final so far."""
+        pcm = self._carry + pcm
+        whole_len = len(pcm) - len(pcm) % 2
+        self._carry = pcm[whole_len:]
+        samples = np.frombuffer(pcm, dtype=np.int16, count=whole_len // 2).astype(np.float32)
+        self._input = np.concatenate((self._input, samples))
+        self._input_end += len(samples)
+        self._expected_output += len(samples) / speed
+        return self._run(speed, self._input_end)
+
+    def flush(self) -> bytes:
+        """Emit the remaining output (trimmed to the stretched duration) and reset."""
+        self._input = np.concatenate((self._input, np.zeros(self.frame_length + 2 * self.tolerance, dtype=np.float32)))
+        remaining = max(0, round(self._expected_output) - self._emitted_output)
+        output = self._run(1.0, self._input_end + self.frame_length, output_limit=remaining)
+        if self._output_tail is not None and len(output) // 2 < remaining:
+            tail = self._output_tail[:remaining - len(output) // 2]
+            output += np.clip(tail, -32768, 32767).astype(np.int16).tobytes()
+        self.reset()
+        return output
+
+    def _run(self, speed: float, analysis_limit: int, output_limit: int | None = None) -> bytes:
+        hop, frame_length, tolerance = self.hop, self.frame_length, self.tolerance
+        available_end = self._input_offset + len(self._input)
+        produced = []
+        produced_count = 0
+        while self._analysis_position < analysis_limit:
+            if output_limit is not None and produced_count >= output_limit:
+                break
+            nominal = int(round(self._analysis_position))
+            if nominal + tolerance + frame_length > available_end:
+                break  # Wait for more input
+            start = self._best_frame_start(nominal)
+            frame = self._input[start - self._input_offset:start - self._input_offset + frame_length] * self._window
+            if self._output_tail is None:
+                # Stream start: as if an earlier frame had covered the first half-frame exactly
+                self._output_tail = self._input[start - self._input_offset:start - self._input_offset + hop] * self._window[hop:]
+            final = frame[:hop] + self._output_tail
+            self._output_tail = frame[hop:]
+            produced.append(final)
+            produced_count += hop
+            self._previous_start = start
+            self._analysis_position += hop * speed
+
+        # Keep only the input later frames (and their search windows) can still reach
+        keep_from = min(int(self._analysis_position) - tolerance,
+                        self._previous_start + hop if self._previous_start is not None else self._input_offset)
+        drop = max(0, keep_from - self._input_offset)
+        if drop:
+            self._input = self._input[drop:]
+            self._input_offset += drop
+
+        if not produced:
+            return b""
+        output = np.concatenate(produced)
+        if output_limit is not None:
+            output = output[:output_limit]
+        self._emitted_output += len(output)
+        np.clip(output, -32768, 32767, out=output)
+        return output.astype(np.int16).tobytes()
+
+    def _best_frame_start(self, nominal: int) -> int:
+        """Start near `nominal` whose frame best continues the previous frame's natural successor"""
+        if self._previous_start is None:
+            return max(nominal, self._input_offset)
+        hop, frame_length = self.hop, self.frame_length
+        lowest = max(nominal - self.tolerance, self._input_offset)
+        highest = nominal + self.tolerance
+        natural = self._previous_start + hop - self._input_offset
+        template = self._input[natural:natural + frame_length]
+        region = self._input[lowest - self._input_offset:highest - self._input_offset + frame_length]
+        candidates = np.lib.stride_tricks.sliding_window_view(region, frame_length)
+        correlation = candidates @ template
+        squared = np.concatenate(([0.0], np.cumsum(region.astype(np.float64) ** 2)))
+        energy = squared[frame_length:] - squared[:-frame_length]
+        return lowest + int(np.argmax(correlation / np.sqrt(energy + 1e-9)))
+
+
+class CatchUpSpeedController:
+    """
+    Playback speed from the playback backlog (how far behind the audio queued
+    behind playback will play): 1.0x up to `start_lag_s`, rising linearly to
+    `max_speed` at `full_lag_s`.
+
+    The speed moves towards that target by `smoothing` of the difference per
+    segment, so it ramps instead of jumping, and snaps back to exactly 1.0x
+    once the backlog is below `start_lag_s` and the speed is within 2% of it.
+    """
+
+    def __init__(self, start_lag_s: float, full_lag_s: float, max_speed: float, smoothing: float = 0.5):
+        self.start_lag_s = start_lag_s
+        self.full_lag_s = max(full_lag_s, start_lag_s + 1e-3)
+        self.max_speed = max(1.0, max_speed)
+        self.smoothing = smoothing
+        self.speed = 1.0
+
+    def reset(self):
+        """Return to normal speed (a new session starts without a backlog)."""
+        self.speed = 1.0
+
+    def update(self, backlog_s: float) -> float:
+        fraction = min(1.0, max(0.0, (backlog_s - self.start_lag_s) / (self.full_lag_s - self.start_lag_s)))
+        target = 1.0 + fraction * (self.max_speed - 1.0)
+        self.speed += self.smoothing * (target - self.speed)
+        if target == 1.0 and self.speed < 1.02:
+            self.speed = 1.0
+        return self.speed
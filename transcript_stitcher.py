@@ -0,0 +1,91 @@
+"""Stitching of overlapping Scribe chunks into non-overlapping text deltas using word timestamps."""
+
+import threading
+from typing import List, NamedTuple
+
+
+class ScribeWord(NamedTuple):
+    """A recognized word with its position on the absolute audio timeline (seconds since session start)."""
+    text: str
+    start_s: float
+    end_s: float
+
+
+class TranscriptStitcher:
+    """
+    Turns overlapping periodic/final Scribe chunks into text that is emitted exactly once.
+
+    Each chunk's words are placed on the absolute ring buffer timeline. A word is
+    new when its midpoint lies after everything already emitted. Words of a
+    periodic chunk that end within `stability_horizon_s` of the chunk's end are
+    held back, because audio cut at the chunk edge may still change them; the
+    next chunk (which overlaps this one) or the final chunk re-recognizes them.
+    Final chunks commit every new word.
+
+    Thread-safe: periodic and final results arrive from different threads.
+    """
+
+    def __init__(self, stability_horizon_s: float):
+        self.stability_horizon_s = stability_horizon_s
+        self._lock = threading.Lock()
+        self._committed_until_s = 0.0
+
+    def reset(self):
+        """Forget emitted words (call when absolute offsets restart at 0)."""
+        with self._lock:
+            self._committed_until_s = 0.0
+
+    @property
+    def committed_until_s(self) -> float:
+        """Absolute time up to which words have been emitted."""
+        return self._committed_until_s
+
+    def final_chunk_start_s(self, utterance_start_s: float, pre_roll_s: float) -> float:
+        """
+        Where an utterance's final chunk must start so that none of its words are lost.
+
+        The final chunk commits the rest of the utterance, so it has to cover
+        everything not yet emitted, including the audio of periodic chunks
+        that are still being transcribed (they may arrive after the final).
+        It therefore starts at what has been emitted, not at what has been
+        submitted, with `pre_roll_s` of context before that.
+        """
+        with self._lock:
+            return max(utterance_start_s, self._committed_until_s - pre_roll_s)
+
+    def add_chunk(self, words: List[ScribeWord], chunk_end_s: float, is_final: bool) -> str:
+        """
+        Merge one chunk's words and return the newly committed text.
+
+        Args:
+            words: The chunk's words on the absolute timeline, in order.
+            chunk_end_s: Absolute time of the end of the chunk's audio.
+            is_final: True for the utterance's final chunk (no stability horizon).
+
+        Returns:
+            str: Space-joined new words, or "" if nothing new is stable yet.
+        """
+        return join_words(self.add_chunk_words(words, chunk_end_s, is_final))
+
+    def add_chunk_words(self, words: List[ScribeWord], chunk_end_s: float, is_final: bool) -> List[ScribeWord]:
+        """Like `add_chunk`, but returns the newly committed words themselves (with their timestamps)."""
+        commit_horizon_s = chunk_end_s if is_final else chunk_end_s - self.stability_horizon_s
+        with self._lock:
+            new_words = []
+            for word in words:
+                if (word.start_s + word.end_s) / 2 <= self._committed_until_s:
+                    continue  # Already emitted from an earlier, overlapping chunk
+                if word.end_s > commit_horizon_s:
+                    break  # Too close to the chunk edge; wait for the next chunk
+                new_words.append(word)
+            if new_words:
+                self._committed_until_s = max(self._committed_until_s, new_words[-1].end_s)
+            if is_final:
+                # Nothing from this utterance may be emitted again, even if a slower periodic chunk arrives later
+                self._committed_until_s = max(self._committed_until_s, chunk_end_s)
+        return new_words
+
+
+def join_words(words: List[ScribeWord]) -> str:
+    """Space-joined text of `words`, skipping blank ones."""
+    return " ".join(word.text.strip() for word in words if word.text.strip())
@@ -0,0 +1,133 @@
+"""Translation memory: reuse earlier LLM translations of repeated source segments."""
+
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_source_segment(text: str) -> str:
+    """Canonical form of a source segment: NFKC, case-folded, punctuation removed, whitespace collapsed."""
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    normalized = "".join(" " if unicodedata.category(char).startswith("P") else char for char in normalized)
+    return " ".join(normalized.split())
+
+
+class TranslationMemory:
+    """
+    Exact-match translation memory with an in-memory LRU and an optional SQLite store.
+
+    Entries are keyed by (language pair, model, normalized source segment). An entry
+    only counts as a confident hit once the LLM has produced the same translation for
+    it `min_confirmations` times; a different translation replaces the entry and
+    restarts its count. The SQLite store survives restarts and keeps at most
+    `disk_max_entries`, evicting the least recently used.
+
+    Thread-safe.
+    """
+
+    def __init__(self, max_entries: int, min_confirmations: int = 2,
+                 db_path: str | None = None, disk_max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.min_confirmations = max(1, min_confirmations)
+        self.db_path = db_path
+        self.disk_max_entries = disk_max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # {key: (translation, confirmations)}, least recently used first
+        self._db = None
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "disk_hits": 0}
+
+    @staticmethod
+    def make_key(source_text: str, input_language: str, output_language: str, model: str) -> str | None:
+        """Memory key for a segment, or None if nothing is left after normalization."""
+        normalized = normalize_source_segment(source_text)
+        if not normalized:
+            return None
+        return "\x1f".join((input_language, output_language, model, normalized))
+
+    def lookup(self, key: str) -> str | None:
+        """Return the translation for `key` if it is a confident hit (counts a hit or a miss)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            else:
+                entry = self._load_from_disk(key)
+                if entry is not None:
+                    self.stats["disk_hits"] += 1
+                    self._remember(key, entry)
+            if entry is None or entry[1] < self.min_confirmations:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self._touch_on_disk(key)
+            return entry[0]
+
+    def record(self, key: str, translation: str):
+        """Store an LLM translation for `key`, confirming the entry if it matches the stored one."""
+        with self._lock:
+            entry = self._entries.get(key) or self._load_from_disk(key)
+            if entry is not None and entry[0] == translation:
+                entry = (translation, entry[1] + 1)
+            else:
+                entry = (translation, 1)
+            self._remember(key, entry)
+            self.stats["stores"] += 1
+            self._save_to_disk(key, entry)
+
+    def hit_ratio(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, entry: tuple):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _connection(self):
+        if self.db_path is None:
+            return None
+        if self._db is None:
+            try:
+                self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._db.execute("CREATE TABLE IF NOT EXISTS translation_memory ("
+                                 "key TEXT PRIMARY KEY, translation TEXT NOT NULL, "
+                                 "confirmations INTEGER NOT NULL, last_used REAL NOT NULL)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ [TRANSLATION_MEMORY] Disk store unavailable ({e}). Using memory only.")
+                self.db_path = None
+                self._db = None
+        return self._db
+
+    def _load_from_disk(self, key: str) -> tuple | None:
+        db = self._connection()
+        if db is None:
+            return None
+        row = db.execute("SELECT translation, confirmations FROM translation_memory WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _touch_on_disk(self, key: str):
+        db = self._connection()
+        if db is not None:
+            db.execute("UPDATE translation_memory SET last_used = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+
+    def _save_to_disk(self, key: str, entry: tuple):
+        db = self._connection()
+        if db is None:
+            return
+        db.execute("INSERT OR REPLACE INTO translation_memory (key, translation, confirmations, last_used) "
+                   "VALUES (?, ?, ?, ?)", (key, entry[0], entry[1], time.time()))
+        db.execute("DELETE FROM translation_memory WHERE key IN ("
+                   "SELECT key FROM translation_memory ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                   (self.disk_max_entries,))
+        db.commit()
@@ -0,0 +1,151 @@
+"""Content-addressed cache of synthesized TTS audio (raw PCM), in memory and optionally on disk."""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+def make_tts_cache_key(voice_id: str, model_id: str, language_code: str, output_format: str,
+                       voice_settings: dict, text: str) -> str:
+    """Hash of everything that determines the synthesized audio."""
+    request = json.dumps([voice_id, model_id, language_code, output_format, voice_settings, text],
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+class TtsAudioCache:
+    """
+    LRU cache of PCM clips keyed by `make_tts_cache_key`, bounded in bytes.
+
+    The memory tier keeps at most `max_bytes` of audio. With `disk_dir` set,
+    clips are also written there as `<key>.pcm` files, at most
+    `disk_max_bytes` in total; the least recently used files (by modification
+    time, refreshed on every hit) are deleted beyond that. A disk hit is
+    promoted back into memory. Clips larger than a tier's limit skip that tier.
+
+    Thread-safe.
+    """
+
+    def __init__(self, max_bytes: int, disk_dir: str | None = None, disk_max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._lock = threading.Lock()
+        self._clips = OrderedDict()  # {key: pcm bytes}, least recently used first
+        self._memory_bytes = 0
+        self._disk_files = OrderedDict()  # {key: size}, least recently used first
+        self._disk_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "disk_hits": 0, "stores": 0, "bytes_saved": 0}
+        if disk_dir is not None:
+            self._index_disk_tier()
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached clip for `key` (counts a hit or a miss)."""
+        with self._lock:
+            pcm = self._clips.get(key)
+            if pcm is not None:
+                self._clips.move_to_end(key)
+            else:
+                pcm = self._read_from_disk(key)
+                if pcm is not None:
+                    self.stats["disk_hits"] += 1
+                    self._remember(key, pcm)
+            if pcm is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self.stats["bytes_saved"] += len(pcm)
+            return pcm
+
+    def put(self, key: str, pcm: bytes):
+        """Cache a synthesized clip."""
+        if not pcm:
+            return
+        with self._lock:
+            self._remember(key, pcm)
+            self._write_to_disk(key, pcm)
+            self.stats["stores"] += 1
+
+    def hit_ratio(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    @property
+    def disk_bytes(self) -> int:
+        return self._disk_bytes
+
+    def _remember(self, key: str, pcm: bytes):
+        if len(pcm) > self.max_bytes:
+            return
+        previous = self._clips.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._clips[key] = pcm
+        self._memory_bytes += len(pcm)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._clips.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pcm")
+
+    def _index_disk_tier(self):
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".pcm"):
+                    file_stat = os.stat(os.path.join(self.disk_dir, name))
+                    entries.append((file_stat.st_mtime, name[:-len(".pcm")], file_stat.st_size))
+        except OSError as e:
+            print(f"⚠️ [TTS_CACHE] Disk tier unavailable ({e}). Using memory only.")
+            self.disk_dir = None
+            return
+        for _, key, size in sorted(entries):
+            self._disk_files[key] = size
+            self._disk_bytes += size
+        self._evict_from_disk()
+
+    def _read_from_disk(self, key: str) -> bytes | None:
+        if self.disk_dir is None or key not in self._disk_files:
+            return None
+        try:
+            with open(self._path(key), "rb") as pcm_file:
+                pcm = pcm_file.read()
+            os.utime(self._path(key))  # Recently used files are evicted last, also across restarts
+        except OSError:
+            self._disk_bytes -= self._disk_files.pop(key)
+            return None
+        self._disk_files.move_to_end(key)
+        return pcm
+
+    def _write_to_disk(self, key: str, pcm: bytes):
+        if self.disk_dir is None or len(pcm) > self.disk_max_bytes:
+            return
+        temporary_path = self._path(key) + ".tmp"
+        try:
+            with open(temporary_path, "wb") as pcm_file:
+                pcm_file.write(pcm)
+            os.replace(temporary_path, self._path(key))  # Readers never see a partially written clip
+        except OSError as e:
+            print(f"⚠️ [TTS_CACHE] Could not write clip to disk: {e}")
+            return
+        self._disk_bytes -= self._disk_files.pop(key, 0)
+        self._disk_files[key] = len(pcm)
+        self._disk_bytes += len(pcm)
+        self._evict_from_disk()
+
+    def _evict_from_disk(self):
+        while self._disk_bytes > self.disk_max_bytes and self._disk_files:
+            key, size = self._disk_files.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
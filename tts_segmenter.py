@@ -0,0 +1,89 @@
+"""Splitting of text to speak into clause-sized TTS requests, so the first clause can play early."""
+
+import re
+
+# Sentence and clause ends: punctuation followed by whitespace (so "3.5" never splits),
+# or CJK punctuation, which is not followed by a space
+_BOUNDARY_PATTERN = re.compile(r"[.!?;:,…]+[\"')\]»”’]*(?=\s)|[。！？；：，、]")
+_CJK_PUNCTUATION = "。！？；：，、"
+
+# Words that end in a period without ending the sentence, per TTS language code
+_ABBREVIATIONS = {
+    "en": {"mr", "mrs", "ms", "dr", "prof", "st", "vs", "etc", "e.g", "i.e", "no", "approx"},
+    "pt": {"sr", "sra", "srta", "dr", "dra", "prof", "profa", "av", "etc", "p.ex", "pág", "nº"},
+    "es": {"sr", "sra", "srta", "dr", "dra", "prof", "etc", "ud", "uds", "pág", "núm"},
+    "fr": {"m", "mme", "mlle", "dr", "pr", "etc", "p.ex", "env"},
+    "de": {"hr", "fr", "dr", "prof", "bzw", "usw", "z.b", "d.h", "nr", "ca"},
+    "it": {"sig", "sig.ra", "dott", "prof", "ecc", "pag"},
+}
+
+
+def _ends_with_abbreviation(text_before: str, language_code: str) -> bool:
+    words = text_before.split()
+    if not words:
+        return False
+    abbreviations = _ABBREVIATIONS.get(language_code.split("-")[0].lower(), ())
+    return words[-1].rstrip(".").casefold() in abbreviations
+
+
+def _join(left: str, right: str) -> str:
+    return left + right if left[-1] in _CJK_PUNCTUATION else f"{left} {right}"
+
+
+def _clause_ends(text: str, language_code: str):
+    """End index of every clause boundary in `text`, skipping periods after abbreviations of `language_code`"""
+    clause_start = 0
+    for boundary in _BOUNDARY_PATTERN.finditer(text):
+        if boundary.group().rstrip("\"')]»”’") == "." and \
+           _ends_with_abbreviation(text[clause_start:boundary.start()], language_code):
+            continue
+        yield boundary.end()
+        clause_start = boundary.end()
+
+
+def next_clause_end(text: str, language_code: str, min_chars: int) -> int | None:
+    """
+    End index of the first clause of `text` that is at least `min_chars` long, or None if there is none yet.
+
+    For text that is still streaming in: shorter clauses are merged with the
+    ones after them, and a boundary only counts once the whitespace after it
+    has arrived, so "3.5" or "Dr. Silva" are never split.
+    """
+    for clause_end in _clause_ends(text, language_code):
+        if len(text[:clause_end].strip()) >= min_chars:
+            return clause_end
+    return None
+
+
+def split_text_for_tts(text: str, language_code: str, min_chars: int) -> list[str]:
+    """
+    Split `text` at sentence and clause boundaries into pieces of at least `min_chars`.
+
+    Pieces shorter than `min_chars` are merged with the one that follows (the
+    last one with the one before), since very short TTS requests come out
+    with clipped, unnatural prosody. A period after a known abbreviation of
+    `language_code` ("Dr.", "Sra.") is not a boundary.
+
+    Returns:
+        list[str]: The pieces in order; a single piece when nothing can be split off.
+    """
+    pieces = []
+    piece_start = 0
+    for clause_end in _clause_ends(text, language_code):
+        piece = text[piece_start:clause_end].strip()
+        if piece:
+            pieces.append(piece)
+        piece_start = clause_end
+    if text[piece_start:].strip():
+        pieces.append(text[piece_start:].strip())
+
+    merged = []
+    for piece in pieces:
+        if merged and len(merged[-1]) < min_chars:
+            merged[-1] = _join(merged[-1], piece)
+        else:
+            merged.append(piece)
+    if len(merged) > 1 and len(merged[-1]) < min_chars:
+        tail = merged.pop()
+        merged[-1] = _join(merged[-1], tail)
+    return merged
@@ -0,0 +1,134 @@
+import time
+
+import config as config
+import globals as app_globals
+
+def reset_vad_state():
+    """Reset utterance tracking and the audio buffer at the start of a session"""
+    app_globals.utterance_start_time_monotonic = None
+    app_globals.utterance_audio_start_byte_offset = 0
+    app_globals.last_periodic_scribe_submission_time = 0.0
+    app_globals.last_periodic_scribe_chunk_end_byte_offset = 0
+    app_globals.speech_active.clear()
+    app_globals.final_transcription_pending_for_current_utterance.clear()
+
+    with app_globals.audio_buffer_lock:
+        app_globals.audio_ring_buffer.clear()  # Clear audio buffer for new session (offsets restart at 0)
+    app_globals.transcript_stitcher.reset()  # Its timeline follows the ring buffer offsets
+
+
+def handle_speech_started(event_source: str, pre_roll_ms: int, speech_start_byte_offset: int | None = None):
+    """
+    Start tracking a new utterance.
+
+    Args:
+        event_source: Log tag of the VAD that raised the event (e.g. "WS_VAD_EVENT").
+        pre_roll_ms: Audio kept before the detected speech start.
+        speech_start_byte_offset: Absolute ring buffer offset where speech was detected.
+            Defaults to the newest captured audio (server VAD events carry no local offset).
+    """
+    print(f"\n🟢 [{event_source}] Speech Started")
+    app_globals.speech_active.set()
+    app_globals.schedule_gui_update("speaking_status", True)  # GUI Update
+    app_globals.current_utterance_id += 1
+    app_globals.final_transcription_pending_for_current_utterance.set()
+    app_globals.utterance_start_time_monotonic = time.monotonic()
+
+    with app_globals.audio_buffer_lock:
+        # Calculate pre-roll: audio from a bit before speech started
+        pre_roll_bytes = int(config.PYAUDIO_RATE * (pre_roll_ms / 1000) *
+                            config.PYAUDIO_SAMPLE_WIDTH * config.PYAUDIO_CHANNELS)
+        if speech_start_byte_offset is None:
+            speech_start_byte_offset = app_globals.audio_ring_buffer.end_offset
+        app_globals.utterance_audio_start_byte_offset = max(app_globals.audio_ring_buffer.oldest_offset,
+                                                            speech_start_byte_offset - pre_roll_bytes)
+
+        # Reset last_periodic_scribe_chunk_end_byte_offset to the start of the new utterance
+        app_globals.last_periodic_scribe_chunk_end_byte_offset = app_globals.utterance_audio_start_byte_offset
+
+    # Reset periodic scribe tracking for new utterance
+    app_globals.last_periodic_scribe_submission_time = app_globals.utterance_start_time_monotonic
+    app_globals.notify_pipeline_state_changed()  # Start the periodic Scribe deadline timer
+
+
+def handle_speech_stopped(event_source: str, speech_end_byte_offset: int | None = None):
+    """
+    Close the current utterance and queue its final segment for Scribe.
+
+    Args:
+        event_source: Log tag of the VAD that raised the event (e.g. "WS_VAD_EVENT").
+        speech_end_byte_offset: Absolute ring buffer offset where the utterance ends.
+            Defaults to the newest captured audio.
+    """
+    speech_duration_s = 0.0
+    if app_globals.utterance_start_time_monotonic is not None:
+        speech_duration_s = time.monotonic() - app_globals.utterance_start_time_monotonic
+    print(f"\n🔴 [{event_source}] Speech Stopped (Duration: {speech_duration_s:.2f}s)")
+
+    app_globals.schedule_gui_update("speaking_status", False)  # GUI Update
+
+    if not app_globals.final_transcription_pending_for_current_utterance.is_set():
+        print("ℹ️ [SCRIBE_FINAL_TASK] Final transcription for this utterance already processed or not pending. Skipping.")
+        app_globals.speech_active.clear()
+        app_globals.notify_pipeline_state_changed()
+        return
+
+    app_globals.final_transcription_pending_for_current_utterance.clear()
+    app_globals.speech_active.clear()
+
+    final_segment_range = None
+    current_buffer_len = 0
+
+    with app_globals.audio_buffer_lock:
+        current_buffer_len = app_globals.audio_ring_buffer.end_offset
+    if speech_end_byte_offset is not None:
+        current_buffer_len = min(speech_end_byte_offset, current_buffer_len)
+
+    if app_globals.utterance_start_time_monotonic is not None and current_buffer_len > 0:
+        # Calculate the pre-roll for the final segment based on FINAL_SCRIBE_PRE_ROLL_MS
+        # (when stitching, it must also cover words the last periodic chunk held back)
+        final_pre_roll_ms = config.FINAL_SCRIBE_PRE_ROLL_MS
+        if config.TRANSCRIPT_STITCHING_ENABLED:
+            final_pre_roll_ms = max(final_pre_roll_ms, config.TRANSCRIPT_STITCH_OVERLAP_MS)
+        final_segment_overlap_bytes = int(config.PYAUDIO_RATE *
+                                          (final_pre_roll_ms / 1000) *
+                                          config.PYAUDIO_SAMPLE_WIDTH *
+                                          config.PYAUDIO_CHANNELS)
+
+        # Determine the start byte for the final transcription segment
+        if config.TRANSCRIPT_STITCHING_ENABLED:
+            # Start at the stitched text, not at the last submitted periodic chunk: chunks still in flight
+            # can return after the final, and their words would be dropped once the final has committed
+            frame_width = config.PYAUDIO_SAMPLE_WIDTH * config.PYAUDIO_CHANNELS
+            bytes_per_second = config.PYAUDIO_RATE * frame_width
+            start_s = app_globals.transcript_stitcher.final_chunk_start_s(
+                utterance_start_s=app_globals.utterance_audio_start_byte_offset / bytes_per_second,
+                pre_roll_s=final_pre_roll_ms / 1000
+            )
+            start_byte_final = max(app_globals.utterance_audio_start_byte_offset,
+                                   round(start_s * config.PYAUDIO_RATE) * frame_width)
+        else:
+            start_byte_final = max(
+                app_globals.utterance_audio_start_byte_offset,
+                app_globals.last_periodic_scribe_chunk_end_byte_offset - final_segment_overlap_bytes
+            )
+        start_byte_final = max(0, start_byte_final)
+        start_byte_final = min(start_byte_final, current_buffer_len)
+
+        if start_byte_final >= current_buffer_len and \
+           app_globals.last_periodic_scribe_chunk_end_byte_offset == app_globals.utterance_audio_start_byte_offset:
+            start_byte_final = app_globals.utterance_audio_start_byte_offset
+
+        if start_byte_final < current_buffer_len:
+            final_segment_range = (start_byte_final, current_buffer_len)
+
+    if final_segment_range:
+        # Hand the byte range to the final Scribe worker so the VAD event source returns immediately
+        print(f"🎤 [SCRIBE_FINAL_TASK] Queueing final audio segment ({final_segment_range[1] - final_segment_range[0]} bytes).")
+        app_globals.final_scribe_request_queue.put((*final_segment_range, app_globals.current_utterance_id))
+    else:
+        print("ℹ️ [SCRIBE_FINAL_TASK] No audio segment captured for final Scribe transcription.")
+
+    app_globals.utterance_start_time_monotonic = None
+    app_globals.utterance_audio_start_byte_offset = 0
+    app_globals.notify_pipeline_state_changed()
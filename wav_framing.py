@@ -0,0 +1,97 @@
+"""WAV container framing for raw PCM without intermediate copies."""
+
+import struct
+from functools import lru_cache
+
+WAV_HEADER_SIZE = 44
+
+
+@lru_cache(maxsize=8)
+def _wav_fmt_chunk(rate: int, channels: int, sample_width: int) -> bytes:
+    """Return the constant 'fmt ' chunk for a PCM format (cached per format)."""
+    block_align = channels * sample_width
+    return struct.pack(
+        "<4sIHHIIHH",
+        b"fmt ", 16,  # Chunk id, chunk size
+        1,  # PCM
+        channels,
+        rate,
+        rate * block_align,  # Byte rate
+        block_align,
+        sample_width * 8  # Bits per sample
+    )
+
+
+def build_wav_header(pcm_length: int, rate: int, channels: int, sample_width: int) -> bytes:
+    """Return the 44-byte canonical WAV header for `pcm_length` bytes of PCM."""
+    return (struct.pack("<4sI4s", b"RIFF", 36 + pcm_length, b"WAVE") +
+            _wav_fmt_chunk(rate, channels, sample_width) +
+            struct.pack("<4sI", b"data", pcm_length))
+
+
+def frame_pcm_as_wav(pcm_parts: list, rate: int, channels: int, sample_width: int) -> bytes:
+    """
+    Build a WAV file from a header and one or more PCM buffers in a single copy.
+
+    Args:
+        pcm_parts: Bytes-like PCM pieces in order, e.g. memoryviews from
+            AudioRingBuffer.read_views.
+        rate: Sample rate in Hz.
+        channels: Channel count.
+        sample_width: Bytes per sample.
+
+    Returns:
+        bytes: The complete WAV file. Each PCM byte is copied exactly once.
+    """
+    pcm_length = sum(len(part) for part in pcm_parts)
+    return b"".join([build_wav_header(pcm_length, rate, channels, sample_width), *pcm_parts])
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: bytes copied per Scribe upload, old path vs zero-copy framing
+    import io
+    import time
+    import tracemalloc
+    import wave
+
+    from audio_buffer import AudioRingBuffer
+
+    RATE, CHANNELS, WIDTH = 16000, 1, 2
+    SEGMENT_SECONDS = 5
+    ITERATIONS = 50
+
+    ring = AudioRingBuffer(capacity_bytes=RATE * WIDTH * 60, frame_width=WIDTH)
+    ring.append(bytes(range(256)) * (RATE * WIDTH * 70 // 256))  # Wrapped at least once
+    end = ring.end_offset
+    start = end - RATE * WIDTH * SEGMENT_SECONDS
+    segment_bytes = end - start
+
+    def legacy_upload_body() -> bytes:
+        pcm = ring.read(start, end)  # Stand-in for the old bytearray slice
+        with io.BytesIO() as wav_file_stream:
+            with wave.open(wav_file_stream, "wb") as wf:
+                wf.setnchannels(CHANNELS)
+                wf.setsampwidth(WIDTH)
+                wf.setframerate(RATE)
+                wf.writeframes(pcm)
+            return wav_file_stream.getvalue()
+
+    def zero_copy_upload_body() -> bytes:
+        return frame_pcm_as_wav(ring.read_views(start, end), RATE, CHANNELS, WIDTH)
+
+    assert legacy_upload_body() == zero_copy_upload_body()
+
+    print(f"Segment: {SEGMENT_SECONDS}s ({segment_bytes} PCM bytes), {ITERATIONS} iterations")
+    for label, body_fn in (("slice + wave + getvalue", legacy_upload_body),
+                           ("views + precomputed header", zero_copy_upload_body)):
+        tracemalloc.start()
+        body_fn()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        started = time.perf_counter()
+        for _ in range(ITERATIONS):
+            body_fn()
+        elapsed_us = (time.perf_counter() - started) / ITERATIONS * 1e6
+        print(f"  {label:<28} peak allocated: {peak_bytes:>9} bytes "
+              f"({peak_bytes / segment_bytes:.2f}x segment), {elapsed_us:8.1f} us/upload")
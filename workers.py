@@ -1,26 +1,307 @@
 import time
 import queue  # For queue.Empty
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import config as config
 import globals as app_globals
-from audio_utils import transcribe_with_scribe, generate_audio_elevenlabs, play_audio_pygame, validate_transcription
+from audio_utils import transcribe_with_scribe, transcribe_words_with_scribe, generate_audio_elevenlabs, play_audio_pygame, StreamingTtsAudio, stream_audio_elevenlabs, play_audio_stream_pygame, play_audio_continuous, tts_cache_key, validate_transcription, send_audio_to_websocket
 from llm_utils import llm_translate_and_decide_speech
+from audio_buffer import AudioRangeOverwrittenError
+from wav_framing import frame_pcm_as_wav, WAV_HEADER_SIZE
+from local_vad import EnergyZcrVad, SPEECH_STARTED
+from vad_handler import handle_speech_started, handle_speech_stopped
+from history_store import select_translator_context
+from priority_lanes import ScribeTranscription
+from translation_memory import TranslationMemory, normalize_source_segment
+from continuity_trimmer import trim_continuity_overlap
+from transcript_stitcher import join_words
+from tts_segmenter import split_text_for_tts
+from playback_engine import ContinuousOutputStream
+from latency_slo import choose_lag_action, compress_pauses, PauseCompressor, SKIP, COMPRESS
+from time_stretch import WsolaTimeStretcher
+
+def _send_uplink_batch(pcm_data: bytes, frame_count: int, first_capture_time: float, count_late: bool = True):
+    """Send one coalesced uplink message and update the uplink counters"""
+    stats = app_globals.audio_uplink_stats
+    if send_audio_to_websocket(pcm_data):
+        stats["messages_sent"] += 1
+        stats["frames_sent"] += frame_count
+        stats["bytes_sent"] += len(pcm_data)
+        if count_late and (time.monotonic() - first_capture_time) * 1000 > config.AUDIO_UPLINK_LATE_FRAME_MS:
+            stats["frames_late"] += frame_count
+    else:
+        stats["frames_discarded_disconnected"] += frame_count
+
+
+def audio_uplink_sender_worker_new():
+    """Worker thread that coalesces captured audio and streams it to the realtime WebSocket"""
+    batch_bytes = int(config.PYAUDIO_RATE * (config.AUDIO_UPLINK_BATCH_MS / 1000) *
+                      config.PYAUDIO_SAMPLE_WIDTH * config.PYAUDIO_CHANNELS)
+    print(f"📡 [AUDIO_UPLINK] Worker: Started. Batch: {config.AUDIO_UPLINK_BATCH_MS}ms, Max Backlog: {config.AUDIO_UPLINK_MAX_BACKLOG_MS}ms.")
+    stats = app_globals.audio_uplink_stats
+    last_reported_losses = 0
+    last_report_time = 0.0
+
+    # Optional silence gate: only speech-adjacent audio is streamed to Azure
+    silence_gate = None
+    gate_pre_roll = deque()  # Held-back batches: (first_capture_time, pcm_bytes, frame_count)
+    gate_pre_roll_batches = 0
+    if config.AUDIO_UPLINK_SILENCE_GATING_ENABLED:
+        # Azure's server VAD must still receive enough silence to emit speech_stopped
+        hangover_ms = max(config.AUDIO_UPLINK_GATE_HANGOVER_MS, config.AZ_VAD_SILENCE_TIMEOUT_MS + config.AUDIO_UPLINK_BATCH_MS)
+        silence_gate = EnergyZcrVad(
+            sample_rate=config.PYAUDIO_RATE,
+            frame_ms=config.LOCAL_VAD_FRAME_MS,
+            energy_threshold_db=config.LOCAL_VAD_ENERGY_THRESHOLD_DB,
+            noise_margin_db=config.LOCAL_VAD_NOISE_MARGIN_DB,
+            max_zero_crossing_rate=1.0,  # Energy only: err on the side of streaming
+            min_speech_ms=config.LOCAL_VAD_FRAME_MS,
+            silence_timeout_ms=hangover_ms
+        )
+        gate_pre_roll_batches = max(1, -(-config.AUDIO_UPLINK_GATE_PRE_ROLL_MS // config.AUDIO_UPLINK_BATCH_MS))
+        print(f"📡 [AUDIO_UPLINK] Silence gating enabled. Hangover: {hangover_ms}ms, Pre-roll: {config.AUDIO_UPLINK_GATE_PRE_ROLL_MS}ms.")
+
+    while not app_globals.done.is_set():
+        item = app_globals.audio_uplink_queue.get()
+        if item is None:  # Sentinel for shutdown
+            break
+        first_capture_time, pcm_data = item
+
+        # Coalesce further buffers until the batch is full or the first buffer has waited a whole batch period
+        batch = [pcm_data]
+        batch_len = len(pcm_data)
+        batch_deadline = first_capture_time + config.AUDIO_UPLINK_BATCH_MS / 1000
+        while batch_len < batch_bytes:
+            remaining_s = batch_deadline - time.monotonic()
+            try:
+                if remaining_s > 0:
+                    item = app_globals.audio_uplink_queue.get(timeout=remaining_s)
+                else:
+                    item = app_globals.audio_uplink_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                app_globals.audio_uplink_queue.put(None)  # Send this batch first, then see the sentinel again
+                break
+            _, pcm_data = item
+            batch.append(pcm_data)
+            batch_len += len(pcm_data)
+        batch_pcm = b"".join(batch)
+
+        if silence_gate is not None:
+            gate_events = silence_gate.process(batch_pcm)
+            if not silence_gate.in_speech and not gate_events:
+                # Silence: hold the batch back as pre-roll instead of sending it
+                if len(gate_pre_roll) >= gate_pre_roll_batches:
+                    _, gated_pcm, gated_frames = gate_pre_roll.popleft()
+                    stats["frames_gated"] += gated_frames
+                    stats["bytes_gated"] += len(gated_pcm)
+                gate_pre_roll.append((first_capture_time, batch_pcm, len(batch)))
+                continue
+            while gate_pre_roll:
+                pre_roll_capture_time, pre_roll_pcm, pre_roll_frames = gate_pre_roll.popleft()
+                _send_uplink_batch(pre_roll_pcm, pre_roll_frames, pre_roll_capture_time, count_late=False)
+
+        _send_uplink_batch(batch_pcm, len(batch), first_capture_time)
+
+        losses = stats["frames_dropped"] + stats["frames_late"]
+        if losses > last_reported_losses and time.monotonic() - last_report_time >= 5.0:
+            last_reported_losses = losses
+            last_report_time = time.monotonic()
+            print(f"⚠️ [AUDIO_UPLINK] Uplink falling behind. Dropped: {stats['frames_dropped']}, Late: {stats['frames_late']} frames.")
+
+    for _, gated_pcm, gated_frames in gate_pre_roll:
+        stats["frames_gated"] += gated_frames
+        stats["bytes_gated"] += len(gated_pcm)
+
+    print(f"📡 [AUDIO_UPLINK] Worker: Stopped. Sent {stats['frames_sent']} frames in {stats['messages_sent']} messages "
+          f"({stats['bytes_sent']} bytes), Dropped: {stats['frames_dropped']}, Late: {stats['frames_late']}.")
+    if silence_gate is not None:
+        # Base64 inflates every PCM byte by 4/3 on the wire
+        print(f"📡 [AUDIO_UPLINK] Silence gating withheld {stats['frames_gated']} frames "
+              f"({stats['bytes_gated']} PCM bytes, ~{stats['bytes_gated'] * 4 // 3} bytes on the wire).")
+
+
+def local_vad_worker_new():
+    """Worker thread that runs the on-device VAD over captured audio and raises speech events"""
+    vad = EnergyZcrVad(
+        sample_rate=config.PYAUDIO_RATE,
+        frame_ms=config.LOCAL_VAD_FRAME_MS,
+        energy_threshold_db=config.LOCAL_VAD_ENERGY_THRESHOLD_DB,
+        noise_margin_db=config.LOCAL_VAD_NOISE_MARGIN_DB,
+        max_zero_crossing_rate=config.LOCAL_VAD_MAX_ZERO_CROSSING_RATE,
+        min_speech_ms=config.LOCAL_VAD_MIN_SPEECH_MS,
+        silence_timeout_ms=config.LOCAL_VAD_SILENCE_TIMEOUT_MS
+    )
+    frame_width = config.PYAUDIO_SAMPLE_WIDTH * config.PYAUDIO_CHANNELS
+    print(f"🎙️ [LOCAL_VAD] Worker: Started. Threshold: {config.LOCAL_VAD_ENERGY_THRESHOLD_DB}dBFS, Silence Timeout: {config.LOCAL_VAD_SILENCE_TIMEOUT_MS}ms.")
+
+    with app_globals.audio_buffer_lock:
+        read_offset = app_globals.audio_ring_buffer.end_offset
+    vad.samples_processed = read_offset // frame_width
+
+    while not app_globals.done.is_set():
+        with app_globals.audio_data_available:
+            app_globals.audio_data_available.wait_for(
+                lambda: app_globals.audio_ring_buffer.end_offset > read_offset or app_globals.done.is_set()
+            )
+            end_offset = app_globals.audio_ring_buffer.end_offset
+            if end_offset <= read_offset:
+                continue
+            if read_offset < app_globals.audio_ring_buffer.oldest_offset:
+                print(f"⚠️ [LOCAL_VAD] Fell behind capture; skipping to the oldest available audio.")
+                read_offset = app_globals.audio_ring_buffer.oldest_offset
+                vad.reset()
+                vad.samples_processed = read_offset // frame_width
+            pcm_data = app_globals.audio_ring_buffer.read(read_offset, end_offset)
+        read_offset = end_offset
+
+        for event, sample_offset in vad.process(pcm_data):
+            if event == SPEECH_STARTED:
+                handle_speech_started("LOCAL_VAD_EVENT", pre_roll_ms=config.LOCAL_VAD_PRE_ROLL_MS,
+                                      speech_start_byte_offset=sample_offset * frame_width)
+            else:
+                handle_speech_stopped("LOCAL_VAD_EVENT", speech_end_byte_offset=sample_offset * frame_width)
+
+    print("🎙️ [LOCAL_VAD] Worker: Stopped.")
+
+
+class _PeriodicScribeResequencer:
+    """Releases concurrently transcribed periodic chunks to the pipeline in chunk index order"""
+
+    def __init__(self, release_chunk):
+        self._lock = threading.Lock()
+        self._completed = {}  # {chunk_index: chunk_result}
+        self._next_chunk_index = 0
+        self._release_chunk = release_chunk
+
+    def complete(self, chunk_index: int, chunk_result):
+        """Record a finished chunk and release every chunk that is now in order"""
+        with self._lock:
+            self._completed[chunk_index] = chunk_result
+            while self._next_chunk_index in self._completed:
+                ready_result = self._completed.pop(self._next_chunk_index)
+                if self._next_chunk_index != chunk_index:
+                    print(f"⏱️ [SCRIBE_PERIODIC_ORDER] Releasing chunk {self._next_chunk_index} held for ordering.")
+                self._next_chunk_index += 1
+                self._release_chunk(ready_result)
+
+
+def _stitch_scribe_words(words, chunk_end_s: float, is_final: bool, log_tag: str) -> tuple:
+    """Merge a timestamped Scribe chunk into the running transcript; returns (new text, its audio start, its audio end)"""
+    if words is None:
+        return "[Scribe Error: Word timestamps unavailable]", None, None
+    new_words = app_globals.transcript_stitcher.add_chunk_words(words, chunk_end_s, is_final=is_final)
+    if not new_words:
+        print(f"ℹ️ [{log_tag}] No new stable words in this chunk ({len(words)} recognized).")
+        return "", None, None
+    return join_words(new_words), new_words[0].start_s, new_words[-1].end_s
+
+
+def _publish_periodic_transcription(transcribed_text_periodic: str, utterance_id: int,
+                                    audio_start_s: float | None, audio_end_s: float | None):
+    """Forward a periodic Scribe result to the translator and the GUI"""
+    periodic_item = ScribeTranscription("periodic", utterance_id, transcribed_text_periodic,
+                                        audio_start_s, audio_end_s)
+    if app_globals.scribe_to_translator_llm_queue.discard_if_superseded(periodic_item):
+        # Arrived after a final transcription of the same audio; keep it away from the LLM entirely
+        print(f"⏱️ [SCRIBE_PERIODIC_STALE] Utterance {utterance_id} already has a final transcription of this audio. Dropping: \"{transcribed_text_periodic}\"")
+        return
+    if validate_transcription(transcribed_text_periodic):
+        print(f"⏱️ [SCRIBE_PERIODIC_RESULT] Transcription: \"{transcribed_text_periodic}\"")
+        # Store in recent transcriptions deque (before queueing, so the translator's context includes it)
+        with app_globals.recent_scribe_transcriptions_lock:
+            app_globals.recent_scribe_transcriptions.append(transcribed_text_periodic)
+        app_globals.scribe_to_translator_llm_queue.put(periodic_item)
+        app_globals.schedule_gui_update("transcription", f"[Periodic] {transcribed_text_periodic}")  # GUI Update
+        if app_globals.all_scribe_transcriptions_log is not None:
+            app_globals.all_scribe_transcriptions_log.append(f"[PERIODIC] {transcribed_text_periodic}")
+    else:
+        if transcribed_text_periodic:  # Log if it was invalid but not empty
+            print(f"⚠️ [SCRIBE_PERIODIC_INVALID] Invalid or filtered periodic transcription: \"{transcribed_text_periodic}\"")
+
 
 def periodic_scribe_transcription_worker_new():
     """Worker thread that periodically sends audio chunks to Scribe for transcription"""
-    print(f"⏱️ [SCRIBE_PERIODIC] Worker: Started. Interval: {config.PERIODIC_SCRIBE_INTERVAL_S}s, Inter-Chunk Overlap: {config.PERIODIC_SCRIBE_INTER_CHUNK_OVERLAP_MS}ms.")
-    last_debug_time = time.monotonic()
+    print(f"⏱️ [SCRIBE_PERIODIC] Worker: Started. Interval: {config.PERIODIC_SCRIBE_INTERVAL_S}s, Inter-Chunk Overlap: {config.PERIODIC_SCRIBE_INTER_CHUNK_OVERLAP_MS}ms, Max In-Flight: {config.PERIODIC_SCRIBE_MAX_IN_FLIGHT}.")
+
+    interval_controller = app_globals.periodic_scribe_interval_controller
+    interval_controller.reset()
+    if config.PERIODIC_SCRIBE_ADAPTIVE_INTERVAL_ENABLED:
+        print(f"⏱️ [SCRIBE_PERIODIC] Adaptive interval enabled: {config.PERIODIC_SCRIBE_MIN_INTERVAL_S}s - {config.PERIODIC_SCRIBE_MAX_INTERVAL_S}s.")
+    periodic_interval_s = interval_controller.interval_s if config.PERIODIC_SCRIBE_ADAPTIVE_INTERVAL_ENABLED \
+        else config.PERIODIC_SCRIBE_INTERVAL_S
+    app_globals.pipeline_metrics["periodic_scribe_interval_s"] = periodic_interval_s
+    last_logged_interval_s = periodic_interval_s
+
+    # Chunks are transcribed concurrently; results are re-sequenced before they reach the translator
+    scribe_executor = ThreadPoolExecutor(max_workers=config.PERIODIC_SCRIBE_MAX_IN_FLIGHT, thread_name_prefix="ScribePeriodic")
+    in_flight_slots = threading.BoundedSemaphore(config.PERIODIC_SCRIBE_MAX_IN_FLIGHT)
+    next_chunk_index = 0
+    waiting_for_slot = False
+    bytes_per_second = config.PYAUDIO_RATE * config.PYAUDIO_SAMPLE_WIDTH * config.PYAUDIO_CHANNELS
+
+    def release_chunk(chunk_result):
+        utterance_id, chunk_start_s, chunk_end_s, chunk_result = chunk_result
+        if config.TRANSCRIPT_STITCHING_ENABLED:
+            # The stitched text spans only its new words, not the whole chunk
+            transcribed_text, audio_start_s, audio_end_s = _stitch_scribe_words(
+                chunk_result, chunk_end_s, is_final=False, log_tag="SCRIBE_PERIODIC_STITCH")
+        else:
+            transcribed_text, audio_start_s, audio_end_s = chunk_result, chunk_start_s, chunk_end_s
+        _publish_periodic_transcription(transcribed_text, utterance_id, audio_start_s, audio_end_s)
+
+    resequencer = _PeriodicScribeResequencer(release_chunk)
+
+    def transcribe_chunk(chunk_index: int, utterance_id: int, audio_segment: bytes, chunk_start_byte: int, chunk_end_byte: int):
+        request_start_time = time.monotonic()
+        try:
+            if config.TRANSCRIPT_STITCHING_ENABLED:
+                chunk_result = transcribe_words_with_scribe(audio_segment, segment_start_s=chunk_start_byte / bytes_per_second)
+            else:
+                chunk_result = transcribe_with_scribe(audio_segment, is_final_segment=False)
+        except Exception as e:
+            print(f"⚠️ [SCRIBE_PERIODIC] Error in chunk {chunk_index}: {e} (Type: {type(e).__name__})")
+            chunk_result = None if config.TRANSCRIPT_STITCHING_ENABLED else \
+                f"[Scribe Error: {type(e).__name__} - {str(e)}]"
+        finally:
+            in_flight_slots.release()
+            app_globals.notify_pipeline_state_changed()  # Wake the scheduler if it was waiting for a slot
+        scribe_rtt_s = time.monotonic() - request_start_time
+        interval_controller.observe_scribe_rtt(scribe_rtt_s)
+        app_globals.pipeline_metrics["periodic_scribe_rtt_s"] = scribe_rtt_s
+        resequencer.complete(chunk_index, (utterance_id, chunk_start_byte / bytes_per_second,
+                                           chunk_end_byte / bytes_per_second, chunk_result))
     
     while not app_globals.done.is_set():
+        with app_globals.pipeline_state_changed:
+            observed_generation = app_globals.pipeline_state_generation
         current_time = time.monotonic()
-        
-        # Print periodic debug info even when speech is not active
-        if current_time - last_debug_time >= 10.0:  # Every 10 seconds
-            last_debug_time = current_time
+
+        if config.PERIODIC_SCRIBE_ADAPTIVE_INTERVAL_ENABLED:
+            periodic_interval_s = interval_controller.update(app_globals.pipeline_metrics.get("translator_pending_items", 0))
+            app_globals.pipeline_metrics["periodic_scribe_interval_s"] = periodic_interval_s
+            if abs(periodic_interval_s - last_logged_interval_s) >= 0.25:
+                print(f"⏱️ [SCRIBE_PERIODIC_INTERVAL] {last_logged_interval_s:.2f}s -> {periodic_interval_s:.2f}s "
+                      f"(Scribe RTT: {interval_controller.scribe_rtt_s or 0.0:.2f}s, "
+                      f"Translator: {interval_controller.translator_time_s or 0.0:.2f}s, "
+                      f"Translator Backlog: {app_globals.pipeline_metrics.get('translator_pending_items', 0)})")
+                last_logged_interval_s = periodic_interval_s
             
-        if app_globals.speech_active.is_set():
-            if app_globals.utterance_start_time_monotonic is not None and \
-               (current_time - app_globals.last_periodic_scribe_submission_time >= config.PERIODIC_SCRIBE_INTERVAL_S):
+        wait_timeout_s = None  # Not speaking: sleep until a speech event or shutdown
+        if app_globals.speech_active.is_set() and app_globals.utterance_start_time_monotonic is not None:
+            next_submission_time = app_globals.last_periodic_scribe_submission_time + periodic_interval_s
+            if current_time < next_submission_time:
+                wait_timeout_s = next_submission_time - current_time  # Deadline timer for the next chunk
+            elif not in_flight_slots.acquire(blocking=False):
+                # Respect the in-flight cap; the chunk keeps growing until a finished request frees a slot
+                if not waiting_for_slot:
+                    print(f"⏱️ [SCRIBE_PERIODIC_BUSY] {config.PERIODIC_SCRIBE_MAX_IN_FLIGHT} requests in flight. Waiting for a free slot.")
+                    waiting_for_slot = True
+            else:
+                waiting_for_slot = False
                 
                 print(f"⏱️ [SCRIBE_PERIODIC_TIME] Time to transcribe! Last transcription was {current_time - app_globals.last_periodic_scribe_submission_time:.2f}s ago")
                 
@@ -29,10 +310,13 @@ def periodic_scribe_transcription_worker_new():
                 end_byte_current_chunk = 0
 
                 with app_globals.audio_buffer_lock:
-                    current_buffer_len = len(app_globals.full_audio_data)
+                    current_buffer_len = app_globals.audio_ring_buffer.end_offset
                     
+                    # When stitching, the overlap must cover words the previous chunk held back
+                    inter_chunk_overlap_ms = config.TRANSCRIPT_STITCH_OVERLAP_MS if config.TRANSCRIPT_STITCHING_ENABLED \
+                        else config.PERIODIC_SCRIBE_INTER_CHUNK_OVERLAP_MS
                     inter_chunk_overlap_bytes = int(config.PYAUDIO_RATE * 
-                                                     (config.PERIODIC_SCRIBE_INTER_CHUNK_OVERLAP_MS / 1000) * 
+                                                     (inter_chunk_overlap_ms / 1000) * 
                                                      config.PYAUDIO_SAMPLE_WIDTH * config.PYAUDIO_CHANNELS)
                     
                     # Determine the start byte for the current periodic segment
@@ -45,8 +329,18 @@ def periodic_scribe_transcription_worker_new():
                     start_byte = min(start_byte, current_buffer_len)
                     end_byte = current_buffer_len
 
+                    if start_byte < app_globals.audio_ring_buffer.oldest_offset:
+                        print(f"⚠️ [SCRIBE_PERIODIC_ERROR] {AudioRangeOverwrittenError(start_byte, end_byte, app_globals.audio_ring_buffer.oldest_offset)} Starting from the oldest available audio.")
+                        start_byte = app_globals.audio_ring_buffer.oldest_offset
+
                     if start_byte < end_byte and end_byte > 0:
-                        audio_segment_periodic = app_globals.full_audio_data[start_byte:end_byte]
+                        # Frame the ring buffer views straight into the upload body (single copy, under the lock)
+                        audio_segment_periodic = frame_pcm_as_wav(
+                            app_globals.audio_ring_buffer.read_views(start_byte, end_byte),
+                            rate=config.PYAUDIO_RATE,
+                            channels=config.PYAUDIO_CHANNELS,
+                            sample_width=config.PYAUDIO_SAMPLE_WIDTH
+                        )
                         start_byte_this_chunk = start_byte
                         end_byte_current_chunk = end_byte
                         app_globals.last_periodic_scribe_chunk_end_byte_offset = end_byte  # Update immediately
@@ -56,34 +350,260 @@ def periodic_scribe_transcription_worker_new():
                 app_globals.last_periodic_scribe_submission_time = current_time  # Update submission time
 
                 if audio_segment_periodic:
-                    transcribed_text_periodic = transcribe_with_scribe(
-                        audio_segment_periodic, 
-                        is_final_segment=False
-                    )
-                    
-                    if validate_transcription(transcribed_text_periodic):
-                        print(f"⏱️ [SCRIBE_PERIODIC_RESULT] Transcription: \"{transcribed_text_periodic}\"")
-                        app_globals.scribe_to_translator_llm_queue.put(transcribed_text_periodic)
-                        app_globals.schedule_gui_update("transcription", f"[Periodic] {transcribed_text_periodic}")  # GUI Update
-                        if app_globals.all_scribe_transcriptions_log is not None:
-                            app_globals.all_scribe_transcriptions_log.append(f"[PERIODIC] {transcribed_text_periodic}")
-                            
-                        # Store in recent transcriptions deque
-                        with app_globals.recent_scribe_transcriptions_lock:
-                            app_globals.recent_scribe_transcriptions.append(transcribed_text_periodic)
-                    else:
-                        if transcribed_text_periodic:  # Log if it was invalid but not empty
-                            print(f"⚠️ [SCRIBE_PERIODIC_INVALID] Invalid or filtered periodic transcription: \"{transcribed_text_periodic}\"")
+                    scribe_executor.submit(transcribe_chunk, next_chunk_index, app_globals.current_utterance_id, audio_segment_periodic,
+                                           start_byte_this_chunk, end_byte_current_chunk)
+                    next_chunk_index += 1
                 else:
+                    in_flight_slots.release()
                     print("⚠️ [SCRIBE_PERIODIC_SKIP] No audio data to transcribe")
-            
-            time.sleep(0.1)
-        else:
-            time.sleep(0.2)
+                continue
+
+        with app_globals.pipeline_state_changed:
+            app_globals.pipeline_state_changed.wait_for(
+                lambda: app_globals.pipeline_state_generation != observed_generation or app_globals.done.is_set(),
+                timeout=wait_timeout_s
+            )
 
+    scribe_executor.shutdown(wait=False, cancel_futures=True)
     print(f"⏱️ [SCRIBE_PERIODIC] Worker: Stopped.")
 
 
+def final_scribe_transcription_worker_new():
+    """Worker thread that transcribes final utterance segments queued by the VAD event handler"""
+    print("🎤 [SCRIBE_FINAL] Worker: Started.")
+
+    while not app_globals.done.is_set():
+        try:
+            item = app_globals.final_scribe_request_queue.get()
+            if item is None:  # Sentinel for shutdown
+                app_globals.final_scribe_request_queue.task_done()
+                break
+
+            start_byte_final, end_byte_final, utterance_id = item
+
+            final_audio_segment_wav = b""
+            with app_globals.audio_buffer_lock:
+                try:
+                    final_audio_views = app_globals.audio_ring_buffer.read_views(start_byte_final, end_byte_final)
+                except AudioRangeOverwrittenError as e:
+                    # Utterance outlived the ring buffer: transcribe what is still held
+                    print(f"⚠️ [SCRIBE_FINAL_TASK] {e} Transcribing the oldest available audio instead.")
+                    start_byte_final = min(e.oldest_available_offset, end_byte_final)
+                    final_audio_views = app_globals.audio_ring_buffer.read_views(start_byte_final, end_byte_final)
+                if final_audio_views:
+                    # Frame the ring buffer views straight into the upload body (single copy, under the lock)
+                    final_audio_segment_wav = frame_pcm_as_wav(
+                        final_audio_views,
+                        rate=config.PYAUDIO_RATE,
+                        channels=config.PYAUDIO_CHANNELS,
+                        sample_width=config.PYAUDIO_SAMPLE_WIDTH
+                    )
+
+            if final_audio_segment_wav:
+                print(f"🎤 [SCRIBE_FINAL_TASK] Transcribing final audio segment ({len(final_audio_segment_wav) - WAV_HEADER_SIZE} bytes).")
+                bytes_per_second = config.PYAUDIO_RATE * config.PYAUDIO_SAMPLE_WIDTH * config.PYAUDIO_CHANNELS
+                if config.TRANSCRIPT_STITCHING_ENABLED:
+                    final_words = transcribe_words_with_scribe(final_audio_segment_wav, segment_start_s=start_byte_final / bytes_per_second)
+                    transcribed_text_final, audio_start_s, audio_end_s = _stitch_scribe_words(
+                        final_words, end_byte_final / bytes_per_second, is_final=True, log_tag="SCRIBE_FINAL_STITCH")
+                else:
+                    transcribed_text_final = transcribe_with_scribe(
+                        final_audio_segment_wav, 
+                        is_final_segment=True
+                    )
+                    audio_start_s, audio_end_s = start_byte_final / bytes_per_second, end_byte_final / bytes_per_second
+                
+                if validate_transcription(transcribed_text_final):
+                    print(f"🎤 [SCRIBE_FINAL_RESULT] Final transcription: \"{transcribed_text_final}\"")
+                    with app_globals.recent_scribe_transcriptions_lock:
+                        app_globals.recent_scribe_transcriptions.append(transcribed_text_final)
+                    app_globals.scribe_to_translator_llm_queue.put(
+                        ScribeTranscription("final", utterance_id, transcribed_text_final, audio_start_s, audio_end_s))
+                    app_globals.schedule_gui_update("transcription", f"[Final] {transcribed_text_final}")  # GUI Update
+                    if app_globals.all_scribe_transcriptions_log is not None:
+                        app_globals.all_scribe_transcriptions_log.append(f"[FINAL] {transcribed_text_final}")
+                else:
+                    print(f"⚠️ [SCRIBE_FINAL_RESULT] Invalid or empty final transcription: \"{transcribed_text_final}\". Not queueing for LLM.")
+            else:
+                print("ℹ️ [SCRIBE_FINAL_TASK] No audio segment captured for final Scribe transcription.")
+
+            app_globals.final_scribe_request_queue.task_done()
+
+        except Exception as e:
+            print(f"⚠️ [SCRIBE_FINAL] Error: {e} (Type: {type(e).__name__})")
+            if 'item' in locals() and item is not None:
+                app_globals.final_scribe_request_queue.task_done()
+            time.sleep(1)
+
+    print("🎤 [SCRIBE_FINAL] Worker: Stopped.")
+
+
+class _TranslatorCall:
+    """One in-flight translator LLM request; it can be cancelled until it starts speaking"""
+
+    def __init__(self, batch: list, memory_key: str | None = None):
+        self.batch = batch  # ScribeTranscription items that triggered this call
+        self.memory_key = memory_key  # Set when the batch is one whole utterance the translation memory may learn
+        self.cancel_event = threading.Event()
+        self.spoken_chunks = []  # Clauses already queued for TTS (streaming)
+        self.answer_segment_id = None  # Segment ID of the first spoken clause; later clauses continue its answer
+        self.response = None
+        self.failed = False
+        self.start_time = time.monotonic()
+        self.elapsed_s = 0.0
+        self._continuity_checked = False
+        self._lock = threading.Lock()
+
+    def is_superseded_by(self, finals: list) -> bool:
+        """True if the call only saw periodic text whose audio the given final transcriptions all cover"""
+        return bool(self.batch) and all(
+            item.kind == "periodic" and any(final.covers(item) for final in finals) for item in self.batch)
+
+    def try_cancel(self) -> bool:
+        """Cancel the call unless it has already spoken; returns True if it was cancelled"""
+        with self._lock:
+            if self.spoken_chunks:
+                return False
+            self.cancel_event.set()
+            return True
+
+    def speak(self, text_chunk: str):
+        """Queue a streamed clause for TTS, unless the call has been cancelled"""
+        with self._lock:
+            if self.cancel_event.is_set():
+                return
+            if not self._continuity_checked:
+                # Only the opening clause can repeat the end of what was already spoken
+                self._continuity_checked = True
+                text_chunk = _trim_against_spoken_history(text_chunk)
+                if not text_chunk:
+                    return
+            self.spoken_chunks.append(text_chunk)
+            if len(self.spoken_chunks) == 1:
+                app_globals.pipeline_metrics["translator_llm_first_speech_s"] = time.monotonic() - self.start_time
+            print(f"🗣️ [TRANSLATOR_LLM_STREAM]: \"{text_chunk}\"")
+            segment_id = app_globals.get_new_segment_id(answer_segment_id=self.answer_segment_id)
+            if self.answer_segment_id is None:
+                self.answer_segment_id = segment_id
+            app_globals.llm_to_tts_queue.put((segment_id, text_chunk))
+
+
+def _trim_against_spoken_history(text_to_speak: str) -> str:
+    """Drop leading words of a translation that repeat the end of the last spoken translation"""
+    with app_globals.translated_speech_history_lock:
+        last_spoken = app_globals.translated_speech_history[-1] if len(app_globals.translated_speech_history) else ""
+    trimmed_text = trim_continuity_overlap(
+        last_spoken, text_to_speak,
+        min_overlap_tokens=config.CONTINUITY_TRIM_MIN_OVERLAP_TOKENS,
+        max_overlap_tokens=config.CONTINUITY_TRIM_MAX_OVERLAP_TOKENS,
+        fuzzy_ratio=config.CONTINUITY_TRIM_FUZZY_RATIO
+    )
+    if trimmed_text != text_to_speak:
+        print(f"✂️ [CONTINUITY_TRIM] \"{text_to_speak}\" -> \"{trimmed_text}\" (repeated the end of \"{last_spoken[-40:]}\")")
+    return trimmed_text
+
+
+def _run_translator_call(call: _TranslatorCall, translator_context):
+    """Executor task: run one translator LLM call, then post it back to the translator agent"""
+    try:
+        call.response = llm_translate_and_decide_speech(
+            recent_scribe_fragments=translator_context.recent_fragments,
+            current_translated_speech_history=translator_context.translated_history,
+            current_native_speech_history_processed_by_llm=translator_context.native_history,
+            on_speech_chunk=call.speak,
+            cancel_event=call.cancel_event
+        )
+    except Exception as e:
+        print(f"⚠️ [TRANSLATOR_LLM_AGENT] Error in LLM call: {e} (Type: {type(e).__name__})")
+        call.failed = True
+    finally:
+        call.elapsed_s = time.monotonic() - call.start_time
+        app_globals.scribe_to_translator_llm_queue.put(call)  # Wakes the agent, which applies the result
+
+
+def _translation_memory_key(batch: list) -> str | None:
+    """Translation memory key for a batch that is exactly one whole utterance, else None"""
+    if not config.TRANSLATION_MEMORY_ENABLED or len(batch) != 1:
+        return None
+    item = batch[0]
+    # A final transcription covers the whole utterance only if no periodic text preceded it
+    if item.kind != "final" or app_globals.scribe_to_translator_llm_queue.had_periodic(item.utterance_id):
+        return None
+    return TranslationMemory.make_key(item.text, config.INPUT_LANGUAGE_NAME_FOR_PROMPT,
+                                      config.OUTPUT_LANGUAGE_NAME_FOR_PROMPT, config.AZ_TRANSLATOR_LLM_DEPLOYMENT_NAME)
+
+
+def _speak_from_translation_memory(item, translation: str):
+    """Handle a whole utterance with a remembered translation, exactly as if the LLM had returned it"""
+    print(f"📚 [TRANSLATION_MEMORY_HIT] \"{item.text}\" -> \"{translation}\" (LLM call skipped)")
+    with app_globals.native_speech_history_processed_by_llm_lock:
+        app_globals.native_speech_history_processed_by_llm.append(item.text)
+    translation = _trim_against_spoken_history(translation)
+    if not translation:
+        return
+    with app_globals.translated_speech_history_lock:
+        app_globals.translated_speech_history.append(translation)
+    app_globals.schedule_gui_update("translation", translation)  # GUI Update
+    app_globals.llm_to_tts_queue.put((app_globals.get_new_segment_id(), translation))
+
+
+def _learn_translation(call: _TranslatorCall, llm_response: dict):
+    """Store a whole-utterance translation in the translation memory if the LLM translated exactly that utterance"""
+    text_to_speak = llm_response.get("text_to_speak", "")
+    if not (call.memory_key and llm_response.get("should_speak") and text_to_speak):
+        return
+    processed_source = llm_response.get("newly_transcribed_segment_processed", "")
+    if normalize_source_segment(processed_source) != normalize_source_segment(call.batch[0].text):
+        return
+    app_globals.translation_memory.record(call.memory_key, text_to_speak)
+
+
+def _apply_translator_response(call: _TranslatorCall):
+    """Record a finished call's decision in the histories and send its speech to TTS"""
+    stats = app_globals.translator_call_stats
+    app_globals.periodic_scribe_interval_controller.observe_translator_time(call.elapsed_s)
+    app_globals.pipeline_metrics["translator_llm_time_s"] = call.elapsed_s
+
+    llm_response = call.response
+    if not llm_response and not call.spoken_chunks:
+        stats["calls_failed"] += 1
+        return
+    llm_response = llm_response or {}
+    newly_processed_original = llm_response.get("newly_transcribed_segment_processed", "")
+    text_to_speak = llm_response.get("text_to_speak", "")
+    should_speak = llm_response.get("should_speak", False)
+    if should_speak and text_to_speak and not call.spoken_chunks:
+        text_to_speak = _trim_against_spoken_history(text_to_speak)
+
+    if newly_processed_original:
+        with app_globals.native_speech_history_processed_by_llm_lock:
+            app_globals.native_speech_history_processed_by_llm.append(newly_processed_original)
+    
+    if call.spoken_chunks:
+        # Already queued for TTS; record what was actually spoken, even if the response was malformed
+        spoken_text = " ".join(call.spoken_chunks)
+        print(f"🗣️ [TRANSLATOR_LLM_SAYS]: \"{spoken_text}\" (streamed in {len(call.spoken_chunks)} chunks)")
+        with app_globals.translated_speech_history_lock:
+            app_globals.translated_speech_history.append(spoken_text)
+        app_globals.schedule_gui_update("translation", spoken_text)  # GUI Update
+    elif should_speak and text_to_speak:
+        print(f"🗣️ [TRANSLATOR_LLM_SAYS]: \"{text_to_speak}\"")
+        with app_globals.translated_speech_history_lock:
+            app_globals.translated_speech_history.append(text_to_speak)
+        
+        app_globals.schedule_gui_update("translation", text_to_speak)  # GUI Update
+        # --- Send to TTS queue ---
+        segment_id = app_globals.get_new_segment_id()
+        app_globals.llm_to_tts_queue.put((segment_id, text_to_speak))
+
+    _learn_translation(call, llm_response)
+
+    if call.spoken_chunks or (should_speak and text_to_speak) or newly_processed_original:
+        stats["calls_useful"] += 1
+    else:
+        stats["calls_idle"] += 1
+
+
 def translator_llm_agent_worker_new():
     """Worker thread that processes transcriptions and decides when and what to translate"""
     print("🤖 [TRANSLATOR_LLM_AGENT] Worker: Started.")
@@ -92,79 +612,160 @@ def translator_llm_agent_worker_new():
        app_globals.recent_scribe_transcriptions.maxlen != config.LLM_TRANSLATOR_CONTEXT_WINDOW_SIZE:
         app_globals.recent_scribe_transcriptions = queue.deque(maxlen=config.LLM_TRANSLATOR_CONTEXT_WINDOW_SIZE)
 
+    stats = app_globals.translator_call_stats
+    for counter_name in stats:
+        stats[counter_name] = 0
+
+    # One live call at a time, so every call sees the histories its predecessor produced.
+    # The second thread lets a fresh call start while a superseded, non-streamed one is still waiting for its response.
+    llm_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="TranslatorLLM")
+    active_call = None
+    pending_items = []  # Transcriptions that arrived while a call was in flight
+
+    def start_call(memory_key: str | None) -> _TranslatorCall:
+        # Publishers add every fragment to recent_scribe_transcriptions before queueing it,
+        # so this snapshot is the freshest context available
+        with app_globals.recent_scribe_transcriptions_lock:
+            llm_input_fragments = list(app_globals.recent_scribe_transcriptions)
+        with app_globals.translated_speech_history_lock:
+            current_translated_history = list(app_globals.translated_speech_history)
+        with app_globals.native_speech_history_processed_by_llm_lock:
+            current_native_history = list(app_globals.native_speech_history_processed_by_llm)
+
+        # Keep the volatile part of the prompt within its token budget (newest entries win)
+        translator_context = select_translator_context(
+            llm_input_fragments, current_native_history, current_translated_history,
+            token_budget=config.LLM_TRANSLATOR_CONTEXT_TOKEN_BUDGET,
+            chars_per_token=config.LLM_CHARS_PER_TOKEN
+        )
+        app_globals.pipeline_metrics["translator_context_estimated_tokens"] = translator_context.estimated_tokens
+
+        call = _TranslatorCall(pending_items, memory_key)
+        stats["calls_started"] += 1
+        llm_executor.submit(_run_translator_call, call, translator_context)
+        return call
+
     while not app_globals.done.is_set():
         try:
-            # Get all available transcriptions from the queue to form a batch
-            current_transcriptions_batch = []
-            while not app_globals.scribe_to_translator_llm_queue.empty():
-                transcription = app_globals.scribe_to_translator_llm_queue.get_nowait()
-                if transcription is None:  # Sentinel for shutdown
-                    app_globals.done.set()  # Propagate shutdown signal
+            # Block until a transcription or a finished call arrives, then drain everything else already queued
+            received_items = [app_globals.scribe_to_translator_llm_queue.get()]
+            while True:
+                try:
+                    received_items.append(app_globals.scribe_to_translator_llm_queue.get_nowait())
+                except queue.Empty:
                     break
-                current_transcriptions_batch.append(transcription)
-            
-            if app_globals.done.is_set() and not current_transcriptions_batch:  # Check again if shutdown was signaled by None
+
+            if None in received_items:  # Sentinel for shutdown
+                app_globals.request_shutdown()  # Propagate shutdown signal
                 break
 
-            if not current_transcriptions_batch:
-                time.sleep(0.1)  # Wait if no new transcriptions
-                continue
+            for item in received_items:
+                if isinstance(item, _TranslatorCall):
+                    if item is active_call:
+                        active_call = None
+                        _apply_translator_response(item)
+                    # Otherwise it is a superseded call finishing late; it was already counted
+                else:
+                    pending_items.append(item)
 
-            # Update recent transcriptions deque
-            with app_globals.recent_scribe_transcriptions_lock:
-                for trans in current_transcriptions_batch:
-                    app_globals.recent_scribe_transcriptions.append(trans)
-                
-                # Convert deque to list for the LLM
-                llm_input_fragments = list(app_globals.recent_scribe_transcriptions)
-
-            # Get current history (thread-safe copies within the call if needed, or manage here)
-            with app_globals.translated_speech_history_lock:
-                current_translated_history = list(app_globals.translated_speech_history)
-            with app_globals.native_speech_history_processed_by_llm_lock:
-                current_native_history = list(app_globals.native_speech_history_processed_by_llm)
-
-            llm_response = llm_translate_and_decide_speech(
-                recent_scribe_fragments=llm_input_fragments,
-                current_translated_speech_history=current_translated_history,
-                current_native_speech_history_processed_by_llm=current_native_history
-            )
+            # Periodic items whose audio a queued final also transcribed do not need a call of their own
+            # (their text is still in the recent fragments the final's call will see)
+            pending_items = [item for item in pending_items
+                             if not app_globals.scribe_to_translator_llm_queue.discard_if_superseded(item)]
 
-            if llm_response:
-                newly_processed_original = llm_response.get("newly_transcribed_segment_processed", "")
-                text_to_speak = llm_response.get("text_to_speak", "")
-                should_speak = llm_response.get("should_speak", False)
-
-                if newly_processed_original:
-                    with app_globals.native_speech_history_processed_by_llm_lock:
-                        app_globals.native_speech_history_processed_by_llm.append(newly_processed_original)
-                        # Optional: Truncate history if it gets too long
-                        if len(app_globals.native_speech_history_processed_by_llm) > config.LLM_TRANSLATOR_CONTEXT_WINDOW_SIZE * 5:  # Example limit
-                            app_globals.native_speech_history_processed_by_llm.pop(0)
-                
-                if should_speak and text_to_speak:
-                    print(f"🗣️ [TRANSLATOR_LLM_SAYS]: \"{text_to_speak}\"")
-                    with app_globals.translated_speech_history_lock:
-                        app_globals.translated_speech_history.append(text_to_speak)
-                        # Optional: Truncate history
-                        if len(app_globals.translated_speech_history) > config.LLM_TRANSLATOR_CONTEXT_WINDOW_SIZE * 5:
-                            app_globals.translated_speech_history.pop(0)
-                    
-                    app_globals.schedule_gui_update("translation", text_to_speak)  # GUI Update
-                    # --- Send to TTS queue ---
-                    segment_id = app_globals.get_new_segment_id()
-                    app_globals.llm_to_tts_queue.put((segment_id, text_to_speak))
+            # A final transcription of the same audio makes an in-flight call on periodic text stale
+            pending_finals = [item for item in pending_items if item.kind == "final"]
+            if active_call is not None and pending_finals and active_call.is_superseded_by(pending_finals):
+                if active_call.try_cancel():
+                    stats["calls_superseded"] += 1
+                    print(f"🤖 [TRANSLATOR_LLM_SUPERSEDED] Final transcription arrived; abandoning the call started "
+                          f"{time.monotonic() - active_call.start_time:.2f}s ago on periodic input.")
+                    active_call = None
+
+            if active_call is None and pending_items:
+                memory_key = _translation_memory_key(pending_items)
+                remembered_translation = None
+                if memory_key:
+                    remembered_translation = app_globals.translation_memory.lookup(memory_key)
+                    app_globals.pipeline_metrics["translation_memory_hit_ratio"] = app_globals.translation_memory.hit_ratio()
+                if remembered_translation is not None:
+                    _speak_from_translation_memory(pending_items[0], remembered_translation)
+                else:
+                    active_call = start_call(memory_key)
+                pending_items = []
+            app_globals.pipeline_metrics["translator_pending_items"] = len(pending_items)
 
-        except queue.Empty:
-            if app_globals.done.is_set():
-                break
-            time.sleep(0.1)  # Wait if queue is empty
-            continue
         except Exception as e:
             print(f"⚠️ [TRANSLATOR_LLM_AGENT] Error: {e} (Type: {type(e).__name__})")
             time.sleep(1)  # Avoid rapid error looping
 
-    print("🤖 [TRANSLATOR_LLM_AGENT] Worker: Stopped.")
+    if active_call is not None:
+        active_call.try_cancel()
+    llm_executor.shutdown(wait=False, cancel_futures=True)
+
+    # Signal TTS worker to shut down
+    app_globals.llm_to_tts_queue.put(None)
+    print(f"🤖 [TRANSLATOR_LLM_AGENT] Worker: Stopped. LLM calls: {stats['calls_started']} started, "
+          f"{stats['calls_useful']} useful, {stats['calls_idle']} idle, "
+          f"{stats['calls_superseded']} superseded (wasted), {stats['calls_failed']} failed. "
+          f"Stale periodic transcriptions dropped: {app_globals.scribe_to_translator_llm_queue.dropped_periodic_count}.")
+    if config.TRANSLATION_MEMORY_ENABLED:
+        memory_stats = app_globals.translation_memory.stats
+        print(f"📚 [TRANSLATION_MEMORY] Hits: {memory_stats['hits']}, Misses: {memory_stats['misses']} "
+              f"(hit ratio {app_globals.translation_memory.hit_ratio():.0%}), Stored: {memory_stats['stores']}, "
+              f"Loaded from disk: {memory_stats['disk_hits']}.")
+        app_globals.translation_memory.close()
+
+
+def _queue_for_playback(position: tuple, audio):
+    """Hand a (segment_id, sub_index, sub_count) position's audio to the playback worker"""
+    app_globals.tts_to_playback_queue.put((*position, audio, time.monotonic()))
+
+
+def _synthesize_segment(position: tuple, text_to_speak: str, streaming_audio: StreamingTtsAudio | None,
+                        in_flight_slots: threading.BoundedSemaphore, cache_key: str | None):
+    """Run one TTS request on the pool and hand its audio to playback (the stream was queued at submit time)"""
+    segment_id = position[0]
+    synthesis_start = time.monotonic()
+    try:
+        if streaming_audio is not None:
+            audio_bytes = stream_audio_elevenlabs(text_to_speak, segment_id, streaming_audio)
+        else:
+            audio_bytes = generate_audio_elevenlabs(text_to_speak, segment_id)
+            _queue_for_playback(position, audio_bytes)
+        if cache_key is not None and audio_bytes:
+            app_globals.tts_audio_cache.put(cache_key, audio_bytes)
+    except Exception as e:
+        print(f"⚠️ [TTS_WORKER ({segment_id})] Synthesis error: {e}")
+        if streaming_audio is None:
+            _queue_for_playback(position, None)  # Playback must not wait for this segment forever
+    finally:
+        app_globals.tts_playback_overlap.add_synthesis(synthesis_start, time.monotonic())
+        app_globals.pipeline_metrics["tts_playback_overlap_ratio"] = app_globals.tts_playback_overlap.overlap_ratio()
+        in_flight_slots.release()
+
+
+def _submit_tts_piece(position: tuple, text_to_speak: str, tts_executor: ThreadPoolExecutor,
+                      in_flight_slots: threading.BoundedSemaphore):
+    """Queue one (sub-)segment's audio for playback: from the TTS cache, or from a pooled synthesis"""
+    segment_id = position[0]
+    cache_key = None
+    if config.TTS_CACHE_ENABLED:
+        cache_key = tts_cache_key(text_to_speak)
+        cached_audio = app_globals.tts_audio_cache.get(cache_key)
+        app_globals.pipeline_metrics["tts_cache_hit_ratio"] = app_globals.tts_audio_cache.hit_ratio()
+        if cached_audio is not None:
+            print(f"💾 [TTS_WORKER ({segment_id})] Cache hit ({len(cached_audio)} bytes): \"{text_to_speak[:30]}...\"")
+            _queue_for_playback(position, cached_audio)
+            return
+
+    in_flight_slots.acquire()  # Wait for a free slot; bounds concurrent ElevenLabs requests
+    streaming_audio = None
+    if config.TTS_STREAMING_PLAYBACK_ENABLED:
+        # Hand the stream to playback first, so it can start on the first chunk
+        streaming_audio = StreamingTtsAudio(segment_id)
+        _queue_for_playback(position, streaming_audio)
+    tts_executor.submit(_synthesize_segment, position, text_to_speak, streaming_audio, in_flight_slots, cache_key)
 
 
 def tts_worker_new():
@@ -172,9 +773,14 @@ def tts_worker_new():
     print("🎶 [TTS_WORKER] Worker: Started.")
     app_globals.initialize_pygame_mixer_if_needed()  # Ensure mixer is ready for playback worker
 
+    # Segments are synthesized concurrently; the playback worker restores their order by segment_id
+    max_in_flight = max(1, config.TTS_MAX_IN_FLIGHT)
+    tts_executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="TTS")
+    in_flight_slots = threading.BoundedSemaphore(max_in_flight)
+
     while not app_globals.done.is_set():
         try:
-            item = app_globals.llm_to_tts_queue.get(timeout=0.5)
+            item = app_globals.llm_to_tts_queue.get()
             if item is None:  # Sentinel for shutdown
                 app_globals.llm_to_tts_queue.task_done()
                 break
@@ -185,24 +791,24 @@ def tts_worker_new():
             if not config.TTS_OUTPUT_ENABLED:
                 print(f"ℹ️ [TTS_WORKER] TTS output is disabled. Skipping audio generation for: \"{text_to_speak[:30]}...\"")
                 # Still pass along the segment_id with None audio to maintain sequence
-                app_globals.tts_to_playback_queue.put((segment_id, None))
+                _queue_for_playback((segment_id, 0, 1), None)
                 app_globals.llm_to_tts_queue.task_done()
                 continue
             
             if text_to_speak and text_to_speak.strip():
-                audio_bytes = generate_audio_elevenlabs(text_to_speak, segment_id)
-                app_globals.tts_to_playback_queue.put((segment_id, audio_bytes))
+                pieces = [text_to_speak]
+                if config.TTS_CLAUSE_CHUNKING_ENABLED:
+                    # Clause-sized sub-segments: the first one plays while the rest are synthesized
+                    pieces = split_text_for_tts(text_to_speak, config.TTS_LANGUAGE_CODE, config.TTS_CHUNK_MIN_CHARS)
+                for sub_index, piece in enumerate(pieces):
+                    _submit_tts_piece((segment_id, sub_index, len(pieces)), piece, tts_executor, in_flight_slots)
             else:
                 # If text is empty, still pass along the segment_id with None audio
                 # to maintain sequence in playback worker.
-                app_globals.tts_to_playback_queue.put((segment_id, None))
+                _queue_for_playback((segment_id, 0, 1), None)
             
             app_globals.llm_to_tts_queue.task_done()
 
-        except queue.Empty:
-            if app_globals.done.is_set():
-                break
-            continue
         except Exception as e:
             print(f"⚠️ [TTS_WORKER] Error: {e}")
             # Ensure task_done is called if item was dequeued
@@ -210,71 +816,268 @@ def tts_worker_new():
                  app_globals.llm_to_tts_queue.task_done()
             time.sleep(1)
 
+    tts_executor.shutdown(wait=True)  # In-flight segments still reach playback before the sentinel
+    overlap = app_globals.tts_playback_overlap
+    print(f"📊 [TTS_WORKER] Synthesis: {overlap.synthesis_s:.1f}s total, "
+          f"{overlap.overlapped_s:.1f}s ({overlap.overlap_ratio():.0%}) overlapped with playback.")
+    if config.TTS_CACHE_ENABLED:
+        cache_stats = app_globals.tts_audio_cache.stats
+        print(f"📊 [TTS_WORKER] Audio cache: Hits: {cache_stats['hits']} (hit ratio {app_globals.tts_audio_cache.hit_ratio():.0%}, "
+              f"{cache_stats['disk_hits']} from disk), Stored: {cache_stats['stores']}, "
+              f"Bytes saved: {cache_stats['bytes_saved']}")
     # Signal playback worker to shut down
     app_globals.tts_to_playback_queue.put(None)
     print("🎶 [TTS_WORKER] Worker: Stopped.")
 
 
+def _play_segment_audio(audio, segment_id: int):
+    """Play a whole clip, or a StreamingTtsAudio as its chunks arrive"""
+    if app_globals.playback_output_stream is not None:
+        play_audio_continuous(audio, segment_id)  # Returns once written; the output stream plays it gaplessly
+        return
+    try:
+        if isinstance(audio, StreamingTtsAudio):
+            play_audio_stream_pygame(audio, segment_id)
+        else:
+            play_audio_pygame(audio, segment_id)
+    finally:
+        app_globals.tts_playback_overlap.playback_stopped()
+
+
+def _open_playback_output_stream():
+    """Open the continuous output stream; on failure playback falls back to one mixer Sound per clip"""
+    def on_playing_changed(playing: bool, now: float):
+        if playing:
+            app_globals.tts_playback_overlap.playback_started(now)
+        else:
+            app_globals.tts_playback_overlap.playback_stopped(now)
+
+    output = ContinuousOutputStream(
+        device_name=config.PYAUDIO_OUTPUT_DEVICE_NAME,
+        sample_rate=config.PYAUDIO_RATE,
+        prebuffer_ms=config.PLAYBACK_PREBUFFER_MS,
+        max_buffer_ms=config.PLAYBACK_MAX_BUFFER_MS,
+        chunk_frames=config.PLAYBACK_CALLBACK_FRAMES,
+        on_playing_changed=on_playing_changed
+    )
+    try:
+        output.open()
+        app_globals.playback_output_stream = output
+    except Exception as e:
+        print(f"⚠️ [PLAYBACK_WORKER] Could not open continuous output stream ({e}). Falling back to per-clip playback.")
+
+
+def _next_playback_position(segment_id: int, sub_index: int, sub_count: int) -> tuple:
+    """Playback position after (segment_id, sub_index): the next sub-segment, or the next segment's first"""
+    return (segment_id, sub_index + 1) if sub_index + 1 < sub_count else (segment_id + 1, 0)
+
+
+def _playback_start_time() -> float:
+    """When audio handed to playback now starts playing: after what the output stream still holds"""
+    start_at = time.monotonic()
+    if app_globals.playback_output_stream is not None:
+        start_at += app_globals.playback_output_stream.buffer.buffered_ms / 1000
+    return start_at
+
+
+def _played_duration_s(audio) -> float:
+    """Duration of the TTS PCM (16-bit mono) a segment handed to playback"""
+    played_bytes = audio.output_bytes if isinstance(audio, StreamingTtsAudio) else len(audio)
+    return played_bytes / (2 * config.PYAUDIO_RATE)
+
+
+def _queued_audio_s(pending_playback_buffer: dict, answer_id: int) -> float:
+    """Audio of other answers already waiting in the buffer behind the answer now playing"""
+    queued_bytes = 0
+    for (segment_id, _), (_, audio, _) in pending_playback_buffer.items():
+        if audio and app_globals.segment_answer_id(segment_id) != answer_id:
+            queued_bytes += audio.total_bytes if isinstance(audio, StreamingTtsAudio) else len(audio)
+    return queued_bytes / (2 * config.PYAUDIO_RATE)
+
+
+def _forget_segments_before(segment_id: int):
+    """Drop the playback bookkeeping of the segments before segment_id (played or skipped)"""
+    app_globals.playback_lag_tracker.forget_answers_before(app_globals.segment_answer_id(segment_id))
+    app_globals.forget_segments_before(segment_id)
+
+
+def _time_stretch_segment(audio, speed: float):
+    """Speed a segment up without changing its pitch; a stream is stretched chunk by chunk as it plays"""
+    stretcher = WsolaTimeStretcher(config.PYAUDIO_RATE)
+    if isinstance(audio, StreamingTtsAudio):
+        audio.add_transform(lambda chunk: stretcher.process(chunk, speed), stretcher.flush)
+        return audio
+    return stretcher.convert(audio, speed)
+
+
+def _play_in_order(position: tuple, sub_count: int, audio, queued_at: float, slo_stats: dict,
+                   queued_behind_s: float = 0.0) -> tuple:
+    """
+    Play the next (sub-)segment in sequence, skipping or compressing it if it breaks the latency SLO.
+    It is sped up by how far behind the audio queued after it will play: its own lag plus queued_behind_s.
+    """
+    segment_id, sub_index = position
+    if audio:
+        answer_id = app_globals.segment_answer_id(segment_id)
+        ready_at = queued_at
+        if isinstance(audio, StreamingTtsAudio):
+            # A stream is queued when synthesis starts; it is ready once audio arrives
+            ready_at = audio.first_chunk_time if audio.first_chunk_time is not None else time.monotonic()
+        lag_s = app_globals.playback_lag_tracker.lag_s(answer_id, ready_at, _playback_start_time())
+        action = choose_lag_action(lag_s, config.PLAYBACK_MAX_LAG_S, config.PLAYBACK_SKIP_LAG_S, config.PLAYBACK_LAG_POLICY)
+        app_globals.pipeline_metrics["playback_lag_s"] = lag_s
+        app_globals.playback_lag_recorder.record(segment_id, sub_index, lag_s, action)
+        if action == SKIP:
+            slo_stats["skipped"] += 1
+            print(f"⏭️ [PLAYBACK_WORKER ({segment_id})] Skipped: {lag_s:.1f}s behind (max {config.PLAYBACK_MAX_LAG_S}s).")
+        else:
+            backlog_s = lag_s + queued_behind_s
+            speed = app_globals.playback_speed_controller.update(backlog_s) if config.PLAYBACK_TIME_STRETCH_ENABLED else 1.0
+            app_globals.pipeline_metrics["playback_backlog_s"] = backlog_s
+            app_globals.pipeline_metrics["playback_speed"] = speed
+            if action == COMPRESS:
+                slo_stats["compressed"] += 1
+                if isinstance(audio, StreamingTtsAudio):
+                    # Shorten pauses chunk by chunk as it plays, rather than waiting for the whole synthesis
+                    compressor = PauseCompressor(config.PYAUDIO_RATE, config.PLAYBACK_CATCHUP_MAX_PAUSE_MS,
+                                                 config.PLAYBACK_SILENCE_THRESHOLD)
+                    audio.add_transform(compressor.process, compressor.flush)
+                    print(f"⏩ [PLAYBACK_WORKER ({segment_id})] {lag_s:.1f}s behind: shortening pauses as it streams.")
+                else:
+                    pcm = audio
+                    audio = compress_pauses(pcm, config.PYAUDIO_RATE, config.PLAYBACK_CATCHUP_MAX_PAUSE_MS,
+                                            config.PLAYBACK_SILENCE_THRESHOLD)
+                    saved_ms = (len(pcm) - len(audio)) / 2 / config.PYAUDIO_RATE * 1000
+                    print(f"⏩ [PLAYBACK_WORKER ({segment_id})] {lag_s:.1f}s behind: pauses shortened by {saved_ms:.0f} ms.")
+            if speed > 1.0:
+                audio = _time_stretch_segment(audio, speed)
+                slo_stats["stretched"] += 1
+                print(f"⏩ [PLAYBACK_WORKER ({segment_id})] {backlog_s:.1f}s of audio backed up: playing at {speed:.2f}x.")
+            _play_segment_audio(audio, segment_id)
+            app_globals.playback_lag_tracker.played(answer_id, _played_duration_s(audio))
+    if sub_index + 1 >= sub_count:
+        _forget_segments_before(segment_id + 1)
+    return _next_playback_position(segment_id, sub_index, sub_count)
+
+
+def _play_ready_segments(expected_position: tuple, pending_playback_buffer: dict, slo_stats: dict) -> tuple:
+    """Play buffered segments for as long as the next one in sequence is there"""
+    while expected_position in pending_playback_buffer:
+        buffered_sub_count, buffered_audio, queued_at = pending_playback_buffer.pop(expected_position)
+        queued_behind_s = _queued_audio_s(pending_playback_buffer, app_globals.segment_answer_id(expected_position[0]))
+        expected_position = _play_in_order(expected_position, buffered_sub_count, buffered_audio, queued_at, slo_stats,
+                                           queued_behind_s)
+    return expected_position
+
+
+def _buffer_playback_item(item: tuple, expected_position: tuple, pending_playback_buffer: dict):
+    """Buffer a queued (sub-)segment until its turn, unless it was already played or skipped"""
+    segment_id, sub_index, sub_count, audio_bytes, queued_at = item
+    position = (segment_id, sub_index)
+    if position < expected_position:
+        print(f"⚠️ [PLAYBACK_WORKER] Received old segment {position}, expected {expected_position}. Discarding.")
+        return
+    pending_playback_buffer[position] = (sub_count, audio_bytes, queued_at)
+
+
+def _drain_playback_queue(expected_position: tuple, pending_playback_buffer: dict) -> bool:
+    """
+    Buffer everything else already queued for playback, so the audio waiting behind playback is known.
+    Returns True if the shutdown sentinel came through.
+    """
+    while True:
+        try:
+            item = app_globals.tts_to_playback_queue.get_nowait()
+        except queue.Empty:
+            return False
+        app_globals.tts_to_playback_queue.task_done()
+        if item is None:  # Sentinel
+            return True
+        _buffer_playback_item(item, expected_position, pending_playback_buffer)
+
+
+def _skip_playback_hole(expected_position: tuple, pending_playback_buffer: dict, slo_stats: dict, reason: str) -> tuple:
+    """Give up on a (sub-)segment that never arrived and continue with the earliest buffered one"""
+    next_position = min(pending_playback_buffer)
+    print(f"⚠️ [PLAYBACK_WORKER] Segment {expected_position} missing ({reason}). Skipping to {next_position}.")
+    slo_stats["holes_skipped"] += 1
+    _forget_segments_before(next_position[0])
+    return next_position
+
+
 def playback_worker_new():
     """Worker to play audio segments in order."""
     print("🔊 [PLAYBACK_WORKER] Worker: Started.")
     app_globals.initialize_pygame_mixer_if_needed()
+    if config.PLAYBACK_CONTINUOUS_STREAM_ENABLED:
+        _open_playback_output_stream()
 
-    expected_segment_id = 0
-    pending_playback_buffer = {}  # Stores {segment_id: audio_bytes}
+    # Positions are (segment_id, sub_index); tuples order segments first, then their sub-segments
+    expected_position = (0, 0)
+    pending_playback_buffer = {}  # Stores {(segment_id, sub_index): (sub_count, audio_bytes or StreamingTtsAudio, queued_at)}
+    hole_since = None  # When playback started waiting for expected_position while later segments were ready
+    slo_stats = {"skipped": 0, "compressed": 0, "stretched": 0, "holes_skipped": 0}
 
-    while not app_globals.done.is_set():
+    stopping = False
+    while not stopping and not app_globals.done.is_set():
+        item = None
         try:
-            item = app_globals.tts_to_playback_queue.get(timeout=0.5)
+            timeout = None
+            if pending_playback_buffer:
+                if hole_since is None:
+                    hole_since = time.monotonic()
+                timeout = max(0.0, hole_since + config.PLAYBACK_HOLE_TIMEOUT_S - time.monotonic())
+            try:
+                item = app_globals.tts_to_playback_queue.get(timeout=timeout)
+            except queue.Empty:
+                expected_position = _skip_playback_hole(expected_position, pending_playback_buffer, slo_stats,
+                                                        f"not received within {config.PLAYBACK_HOLE_TIMEOUT_S}s")
+                expected_position = _play_ready_segments(expected_position, pending_playback_buffer, slo_stats)
+                hole_since = None
+                continue
             if item is None:  # Sentinel
                 app_globals.tts_to_playback_queue.task_done()
                 break
             
-            segment_id, audio_bytes = item
-
-            if segment_id == expected_segment_id:
-                if audio_bytes:
-                    play_audio_pygame(audio_bytes, segment_id)
-                expected_segment_id += 1
-                
-                # Play any buffered segments that are now in order
-                while expected_segment_id in pending_playback_buffer:
-                    buffered_audio = pending_playback_buffer.pop(expected_segment_id)
-                    if buffered_audio:
-                        play_audio_pygame(buffered_audio, expected_segment_id)
-                    expected_segment_id += 1
-            elif segment_id > expected_segment_id:
-                # print(f"ℹ️ [PLAYBACK_WORKER] Buffering segment {segment_id}, expecting {expected_segment_id}.")
-                pending_playback_buffer[segment_id] = audio_bytes
-            else:  # segment_id < expected_segment_id (already played or skipped)
-                print(f"⚠️ [PLAYBACK_WORKER] Received old segment {segment_id}, expected {expected_segment_id}. Discarding.")
-            
+            _buffer_playback_item(item, expected_position, pending_playback_buffer)
             app_globals.tts_to_playback_queue.task_done()
+            item = None
+            stopping = _drain_playback_queue(expected_position, pending_playback_buffer)
+
+            # Play any buffered segments that are now in order
+            played_up_to = _play_ready_segments(expected_position, pending_playback_buffer, slo_stats)
+            if played_up_to != expected_position:
+                expected_position = played_up_to
+                hole_since = None
+            if len(pending_playback_buffer) > config.PLAYBACK_MAX_PENDING_SEGMENTS:
+                expected_position = _skip_playback_hole(expected_position, pending_playback_buffer, slo_stats,
+                                                        f"{len(pending_playback_buffer)} later segments waiting")
+                expected_position = _play_ready_segments(expected_position, pending_playback_buffer, slo_stats)
+                hole_since = None
+            app_globals.pipeline_metrics["playback_pending_segments"] = len(pending_playback_buffer)
 
-        except queue.Empty:
-            if app_globals.done.is_set():
-                break
-            continue
         except Exception as e:
             print(f"⚠️ [PLAYBACK_WORKER] Error: {e}")
-            if 'item' in locals() and item is not None:
+            if item is not None:
                 app_globals.tts_to_playback_queue.task_done()
             time.sleep(1)
             
     # Attempt to play any remaining items in buffer if they are in order
     print("🔊 [PLAYBACK_WORKER] Shutdown: Processing remaining buffer...")
-    sorted_pending_ids = sorted(pending_playback_buffer.keys())
-    for seg_id in sorted_pending_ids:
-        if seg_id == expected_segment_id:
-            buffered_audio = pending_playback_buffer.pop(seg_id)
-            if buffered_audio:
-                play_audio_pygame(buffered_audio, seg_id)
-            expected_segment_id += 1
-        elif seg_id > expected_segment_id:
-            print(f"⚠️ [PLAYBACK_WORKER] Shutdown: Gap detected. Cannot play segment {seg_id}, expected {expected_segment_id}.")
-            break  # Stop if there's a gap
-
+    expected_position = _play_ready_segments(expected_position, pending_playback_buffer, slo_stats)
     if pending_playback_buffer:
+        print(f"⚠️ [PLAYBACK_WORKER] Shutdown: Gap detected. Cannot play segment {min(pending_playback_buffer)}, expected {expected_position}.")
         print(f"⚠️ [PLAYBACK_WORKER] Shutdown: Discarded out-of-order segments: {list(pending_playback_buffer.keys())}")
 
+    if app_globals.playback_output_stream is not None:
+        output = app_globals.playback_output_stream
+        output.wait_until_drained(timeout=config.PLAYBACK_MAX_BUFFER_MS / 1000 + 1.0)
+        print(f"📊 [PLAYBACK_WORKER] Output stream: {output.buffer.underrun_count} underruns.")
+        app_globals.playback_output_stream = None
+        output.close()
+    print(f"📊 [PLAYBACK_WORKER] Latency SLO: Skipped: {slo_stats['skipped']}, Compressed: {slo_stats['compressed']}, "
+          f"Sped up: {slo_stats['stretched']}, "
+          f"Missing segments skipped: {slo_stats['holes_skipped']}")
+    app_globals.playback_lag_recorder.close()
+
     print("🔊 [PLAYBACK_WORKER] Worker: Stopped.")